@@ -0,0 +1,341 @@
+# Software/DataHarvester/services/scraper_service/application/services/ingestion/dataset_source.py
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from pydantic import BaseModel
+from infrastructure.logging.logger import get_logger
+from infrastructure.redis.producer import ScraperProducer
+from domain.exceptions.domain_exceptions import ConfigurationError
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import pyarrow.dataset as pads
+except ImportError:
+    pads = None
+
+logger = get_logger()
+
+# Files checked out without `git lfs pull` are small text pointers
+LFS_POINTER_PREFIX = b'version https://git-lfs.github.com/spec/'
+
+JSON_SEPARATORS = ' \t\r\n,'
+JSON_SUFFIXES = ('.json', '.jsonl', '.ndjson')
+JSON_NUMBER_CHARACTERS = '0123456789.eE+-'
+
+class DatasetSource(BaseModel):
+    """A JSON or Parquet dataset to ingest, and how to turn its rows into documents."""
+    name: str
+    path: str
+    format: Optional[str] = None
+    text_fields: Optional[List[str]] = None
+    columns: Optional[List[str]] = None
+    filter: Optional[Dict[str, Any]] = None
+    id_field: Optional[str] = None
+    # Fields kept in metadata only, never joined into the content
+    metadata_fields: Optional[List[str]] = None
+    clean: bool = False
+
+    @property
+    def projected_columns(self) -> Optional[List[str]]:
+        """Columns to read: the configured columns plus id_field, so record ids survive projection."""
+        if not self.columns:
+            return None
+        if self.id_field and self.id_field not in self.columns:
+            return [*self.columns, self.id_field]
+        return self.columns
+
+    @property
+    def non_text_fields(self) -> List[str]:
+        """Fields left out of the content when text_fields is unset: id_field and metadata_fields."""
+        fields = list(self.metadata_fields or [])
+        if self.id_field and self.id_field not in fields:
+            fields.append(self.id_field)
+        return fields
+
+    @property
+    def resolved_format(self) -> str:
+        """'parquet' or 'json', from the configured format or the path's suffix."""
+        if self.format:
+            return self.format
+        path = Path(self.path)
+        if path.suffix == '.parquet' or (path.is_dir() and any(path.rglob('*.parquet'))):
+            return 'parquet'
+        return 'json'
+
+def is_lfs_pointer(path: Union[str, Path]) -> bool:
+    """Whether a file is an unfetched Git LFS pointer rather than data."""
+    with open(path, 'rb') as f:
+        return f.read(len(LFS_POINTER_PREFIX)) == LFS_POINTER_PREFIX
+
+def _iter_json_fallback(f: TextIO, chunk_size: int) -> Iterator[Any]:
+    """Incrementally decode a top-level array, or concatenated/line-delimited values, with raw_decode."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    in_array = None
+
+    while True:
+        while position < len(buffer) and buffer[position] in JSON_SEPARATORS:
+            position += 1
+        if position == len(buffer):
+            if eof:
+                return
+            buffer, position = f.read(chunk_size), 0
+            eof = not buffer
+            continue
+
+        if in_array is None:
+            in_array = buffer[position] == '['
+            if in_array:
+                position += 1
+            continue
+        if in_array and buffer[position] == ']':
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+            # A number cut off by the end of the buffer may continue in the next chunk
+            complete = eof or not (
+                isinstance(value, (int, float)) and (end == len(buffer) or buffer[end] in JSON_NUMBER_CHARACTERS)
+            )
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        yield value
+        position = end
+        if position > chunk_size:
+            buffer, position = buffer[position:], 0
+
+def iter_json_records(path: Union[str, Path], chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Stream the records of a JSON array, JSON Lines or concatenated JSON file.
+
+    Uses ijson when installed; otherwise decodes one value at a time from a bounded
+    read buffer. Either way memory stays proportional to the largest record.
+    """
+    if ijson is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from _iter_json_fallback(f, chunk_size)
+        return
+
+    with open(path, 'rb') as f:
+        head = f.read(chunk_size).lstrip()
+        f.seek(0)
+        if head.startswith(b'['):
+            yield from ijson.items(f, 'item', use_float=True)
+        else:
+            yield from ijson.items(f, '', multiple_values=True, use_float=True)
+
+def filter_expression(conditions: Dict[str, Any]):
+    """Pushdown predicate from {column: value} (equality) or {column: [values]} (membership)."""
+    expression = None
+    for column, value in conditions.items():
+        condition = pads.field(column).isin(value) if isinstance(value, (list, tuple, set)) else pads.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+def iter_parquet_batches(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    filter: Optional[Dict[str, Any]] = None,
+    batch_size: int = 1000
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream a Parquet file or directory of shards as lists of row dicts.
+
+    Only the projected columns are read, and the filter is pushed down so row groups
+    whose statistics rule it out are skipped without decoding.
+    """
+    if pads is None:
+        raise ConfigurationError("Reading Parquet datasets requires pyarrow (pip install scraper-service[datasets])", "DST001")
+
+    path = Path(path)
+    files = sorted(path.rglob('*.parquet')) if path.is_dir() else [path]
+    pointers = [file for file in files if is_lfs_pointer(file)]
+    for pointer in pointers:
+        logger.warning(f"Skipping {pointer}: Git LFS pointer, run `git lfs pull` to fetch the data")
+    files = [str(file) for file in files if file not in pointers]
+    if not files:
+        return
+
+    dataset = pads.dataset(files, format='parquet')
+    for record_batch in dataset.to_batches(
+        columns=columns,
+        filter=filter_expression(filter) if filter else None,
+        batch_size=batch_size
+    ):
+        yield record_batch.to_pylist()
+
+def matches_filter(record: Dict[str, Any], conditions: Dict[str, Any]) -> bool:
+    """Python counterpart of filter_expression for rows that are already decoded."""
+    return all(
+        record.get(column) in value if isinstance(value, (list, tuple, set)) else record.get(column) == value
+        for column, value in conditions.items()
+    )
+
+def _json_safe(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return str(value)
+
+def normalize_record(record: Any, source: DatasetSource, position: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Raw queue content and metadata for one dataset row.
+
+    Content joins the configured text fields (when none are configured, every string
+    field except id_field and metadata_fields); the remaining fields are kept in
+    metadata. Rows without an id_field value are identified by their position in the
+    unfiltered dataset. Rows without text are dropped.
+    """
+    if not isinstance(record, dict):
+        record = {'text': record}
+    excluded = source.non_text_fields
+    text_fields = source.text_fields or [
+        key for key, value in record.items() if isinstance(value, str) and key not in excluded
+    ]
+    content = '\n\n'.join(str(record[field]) for field in text_fields if record.get(field))
+    if not content:
+        return None
+
+    record_id = record.get(source.id_field) if source.id_field else None
+    return content, {
+        'source': 'dataset',
+        'dataset': source.name,
+        'record_id': f"{source.name}:{record_id if record_id is not None else position}",
+        'text_fields': text_fields,
+        'fields': {key: _json_safe(value) for key, value in record.items() if key not in text_fields}
+    }
+
+class DatasetIngestor:
+    """
+    Constant-memory ingestion of JSON and Parquet datasets into the raw data queue.
+
+    JSON is decoded incrementally and Parquet is read batch by batch with column
+    projection and, for sources with an id_field, predicate pushdown; normalized
+    records are published in batches of at most batch_size, so memory is bounded by
+    one batch regardless of dump size. Sources with `clean` set are cleaned a batch
+    at a time with the cleaner's columnar mode before publishing.
+    """
+
+    def __init__(self, producer: Optional[ScraperProducer] = None, batch_size: int = 500, cleaner: Optional[Any] = None):
+        self.producer = producer
+        self.batch_size = batch_size
+        # A TranscriptCleaner, needed only for sources with clean set
+        self.cleaner = cleaner
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], cleaner: Optional[Any] = None) -> 'DatasetIngestor':
+        """Create an ingestor publishing through a new ScraperProducer."""
+        return cls(producer=ScraperProducer(), batch_size=settings.get('batch_size', 500), cleaner=cleaner)
+
+    def iter_records(self, source: DatasetSource) -> Iterator[Tuple[int, Any]]:
+        """
+        (position, row) pairs of a dataset, streamed.
+
+        Positions count rows of the unfiltered dataset, so fallback record IDs do not
+        shift when the filter changes. Rows are filtered before they are projected, so
+        a filter may use columns that are not read. Parquet filters are pushed down
+        when rows are identified by id_field; without one, the filter is applied after
+        reading so that row positions stay known.
+        """
+        columns = source.projected_columns
+        if source.resolved_format == 'parquet':
+            pushdown = source.filter if source.id_field else None
+            read_columns = columns
+            if source.filter and not pushdown and columns:
+                read_columns = [*columns, *(column for column in source.filter if column not in columns)]
+            records = (row for rows in iter_parquet_batches(source.path, read_columns, pushdown, self.batch_size) for row in rows)
+            if pushdown:
+                # Only matching rows are read; these positions are used just for rows whose id_field is empty
+                yield from enumerate(records)
+                return
+        else:
+            records = self._iter_json_files(Path(source.path))
+
+        for position, record in enumerate(records):
+            if isinstance(record, dict) and source.filter and not matches_filter(record, source.filter):
+                continue
+            if isinstance(record, dict) and columns:
+                record = {column: record.get(column) for column in columns}
+            yield position, record
+
+    @staticmethod
+    def _iter_json_files(path: Path) -> Iterator[Any]:
+        files = sorted(file for file in path.rglob('*') if file.suffix in JSON_SUFFIXES) if path.is_dir() else [path]
+        for file in files:
+            if is_lfs_pointer(file):
+                logger.warning(f"Skipping {file}: Git LFS pointer, run `git lfs pull` to fetch the data")
+                continue
+            yield from iter_json_records(file)
+
+    def ingest(self, source: DatasetSource) -> Dict[str, Any]:
+        """Publish a dataset's rows, returning ingestion stats."""
+        if source.clean and self.cleaner is None:
+            raise ConfigurationError(f"Dataset {source.name} is set to clean but the ingestor has no cleaner", "DST002")
+
+        started = time.perf_counter()
+        stats = {'dataset': source.name, 'records': 0, 'published': 0, 'empty': 0, 'failed': 0}
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+
+        def flush():
+            if batch and source.clean:
+                cleaned = self.cleaner.clean_column([content for content, _ in batch]).to_pylist()
+                kept = [(text, metadata) for text, (_, metadata) in zip(cleaned, batch) if text]
+                stats['empty'] += len(batch) - len(kept)
+                batch[:] = kept
+            if batch:
+                if self.producer is not None and self.producer.send_batch_to_queue(batch):
+                    stats['published'] += len(batch)
+                else:
+                    stats['failed'] += len(batch)
+                batch.clear()
+
+        try:
+            for position, record in self.iter_records(source):
+                stats['records'] += 1
+                event = normalize_record(record, source, position)
+                if event is None:
+                    stats['empty'] += 1
+                    continue
+                batch.append(event)
+                if len(batch) >= self.batch_size:
+                    flush()
+            flush()
+        except Exception as e:
+            logger.error(f"Error ingesting dataset {source.name} from {source.path}: {str(e)}")
+            stats['error'] = str(e)
+
+        stats['wall_time'] = time.perf_counter() - started
+        logger.info(
+            f"Ingested {stats['published']}/{stats['records']} records of dataset {source.name} "
+            f"in {stats['wall_time']:.2f}s"
+        )
+        return stats
+
+    def ingest_many(self, sources: Iterable[DatasetSource]) -> List[Dict[str, Any]]:
+        """Publish several datasets in turn."""
+        return [self.ingest(source) for source in sources]
+
+    def close(self) -> None:
+        """Close the producer's Redis connection."""
+        if self.producer is not None:
+            self.producer.close()
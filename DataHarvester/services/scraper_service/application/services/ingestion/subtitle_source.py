@@ -0,0 +1,271 @@
+# Software/DataHarvester/services/scraper_service/application/services/ingestion/subtitle_source.py
+
+import mmap
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from infrastructure.logging.logger import get_logger
+from infrastructure.redis.producer import ScraperProducer
+from infrastructure.cache.ingestion_manifest import IngestionManifest
+from domain.models.transcript import RawTranscript, TranscriptSegment
+
+logger = get_logger()
+
+# A cue's timing line and the non-blank text lines after it. Matching runs over the
+# memory-mapped file, so a file is never read into one Python string.
+SRT_CUE_PATTERN = re.compile(
+    rb'(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})[ \t]*-->[ \t]*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})[^\r\n]*\r?\n'
+    rb'((?:[^\r\n]*\S[^\r\n]*(?:\r?\n|$))*)'
+)
+
+# Inline SRT formatting such as <i>, <font color=...> and {\an8}
+SRT_MARKUP_PATTERN = re.compile(r'</?[a-zA-Z][^>]*>|\{\\[^}]*\}')
+
+# "<title>_<language>.srt" or "<title>.<language>.srt", e.g. "The Beach_en.srt" or "The Beach.pt-BR.srt"
+SUBTITLE_NAME_PATTERN = re.compile(r'^(?P<title>.+?)[_.](?P<language>(?P<primary>[a-z]{2})(?:-[A-Za-z]{2,4})?)$')
+
+# ISO 639-1 codes; a trailing "_web" or "_final" is part of the title, not a language
+ISO_639_1_CODES = frozenset(
+    'aa ab ae af ak am an ar as av ay az ba be bg bh bi bm bn bo br bs ca ce ch co cr cs cu cv cy '
+    'da de dv dz ee el en eo es et eu fa ff fi fj fo fr fy ga gd gl gn gu gv ha he hi ho hr ht hu '
+    'hy hz ia id ie ig ii ik io is it iu ja jv ka kg ki kj kk kl km kn ko kr ks ku kv kw ky la lb '
+    'lg li ln lo lt lu lv mg mh mi mk ml mn mr ms mt my na nb nd ne ng nl nn no nr nv ny oc oj om '
+    'or os pa pi pl ps pt qu rm rn ro ru rw sa sc sd se sg si sk sl sm sn so sq sr ss st su sv sw '
+    'ta te tg th ti tk tl tn to tr ts tt tw ty ug uk ur uz ve vi vo wa wo xh yi yo za zh zu'.split()
+)
+
+def split_subtitle_name(stem: str) -> Tuple[str, Optional[str]]:
+    """(title, language) of a subtitle file stem; language is None without a known language suffix."""
+    name = SUBTITLE_NAME_PATTERN.match(stem)
+    if name is None or name.group('primary') not in ISO_639_1_CODES:
+        return stem, None
+    return name.group('title'), name.group('language')
+
+def _seconds(hours: bytes, minutes: bytes, seconds: bytes, fraction: bytes) -> float:
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(fraction) / 10 ** len(fraction)
+
+def iter_srt_segments(path: Union[str, Path]) -> Iterator[TranscriptSegment]:
+    """Stream the cues of an SRT file as segments, in file order."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for match in SRT_CUE_PATTERN.finditer(mapped):
+                groups = match.groups()
+                # Release the match before yielding; it pins the mapping open
+                del match
+                start = _seconds(*groups[0:4])
+                end = _seconds(*groups[4:8])
+                lines = groups[8].decode('utf-8', errors='replace').splitlines()
+                text = ' '.join(SRT_MARKUP_PATTERN.sub('', line).strip() for line in lines)
+                yield TranscriptSegment(
+                    text=' '.join(text.split()),
+                    start=round(start, 3),
+                    duration=round(max(end - start, 0.0), 3)
+                )
+
+def parse_subtitle_file(path: Union[str, Path], root: Union[str, Path]) -> RawTranscript:
+    """
+    Parse a subtitle file under `root` into a RawTranscript.
+
+    The document ID is derived from the path relative to root, so re-ingesting a file
+    replaces its earlier document. Files laid out as <show>/<episode>/<title>_<lang>.srt
+    carry show and episode metadata.
+    """
+    path = Path(path)
+    relative = path.relative_to(root)
+    title, language = split_subtitle_name(path.stem)
+    metadata = {
+        'source': 'subtitle_file',
+        'path': relative.as_posix(),
+        'title': title
+    }
+    if len(relative.parts) >= 3:
+        metadata['show'] = relative.parts[0]
+        metadata['episode'] = relative.parts[-2]
+
+    return RawTranscript(
+        video_id=f"srt:{relative.with_suffix('').as_posix()}",
+        segments=list(iter_srt_segments(path)),
+        language=language or 'en',
+        created_at=datetime.fromtimestamp(path.stat().st_mtime, timezone.utc),
+        metadata=metadata
+    )
+
+def _parse_or_error(path: Path, root: Path) -> Tuple[Path, Optional[RawTranscript], Optional[str]]:
+    """Parse one file in a pool worker, returning the error instead of raising it."""
+    try:
+        return path, parse_subtitle_file(path, root), None
+    except Exception as e:
+        return path, None, str(e)
+
+def _scan_directory(directory: Path, extensions: Tuple[str, ...]) -> Tuple[List[Path], List[Path]]:
+    files, subdirectories = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(Path(entry.path))
+                elif entry.is_file() and entry.name.lower().endswith(extensions):
+                    files.append(Path(entry.path))
+    except OSError as e:
+        logger.error(f"Could not scan {directory}: {str(e)}")
+    return files, subdirectories
+
+def walk_subtitle_files(
+    root: Union[str, Path],
+    extensions: Iterable[str] = ('.srt',),
+    workers: int = 8
+) -> List[Path]:
+    """List subtitle files under root, scanning each level's directories concurrently."""
+    extensions = tuple(extension.lower() for extension in extensions)
+    found: List[Path] = []
+    pending = [Path(root)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending:
+            next_level = []
+            for files, subdirectories in executor.map(lambda directory: _scan_directory(directory, extensions), pending):
+                found.extend(files)
+                next_level.extend(subdirectories)
+            pending = next_level
+    return sorted(found)
+
+def transcript_event(transcript: RawTranscript) -> Tuple[str, Dict[str, Any]]:
+    """Raw queue content and metadata for a transcript, keeping segment timing."""
+    content = ' '.join(segment.text for segment in transcript.segments if segment.text)
+    metadata = {
+        'video_id': transcript.video_id,
+        'language': transcript.language,
+        'segments': [segment.model_dump() for segment in transcript.segments],
+        **transcript.metadata
+    }
+    return content, metadata
+
+class SubtitleIngestor:
+    """
+    Bulk ingestion of local subtitle archives into the raw data queue.
+
+    The tree is walked with concurrent directory scans, files are parsed across a
+    process pool, and transcripts are published in pipelined batches. With a
+    manifest, a run only parses files that are new or changed since the last one.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        producer: Optional[ScraperProducer] = None,
+        batch_size: int = 100,
+        workers: Optional[int] = None,
+        extensions: Iterable[str] = ('.srt',),
+        manifest: Optional[IngestionManifest] = None
+    ):
+        self.root = Path(root)
+        self.producer = producer
+        self.manifest = manifest
+        self.batch_size = batch_size
+        self.workers = workers or os.cpu_count() or 1
+        self.extensions = tuple(extensions)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], root: Optional[Union[str, Path]] = None) -> 'SubtitleIngestor':
+        """Create an ingestor publishing through a new ScraperProducer."""
+        manifest = None
+        if settings.get('incremental', True):
+            manifest = IngestionManifest(settings.get('manifest_path', 'data/cache/ingestion_manifest.sqlite3'))
+        return cls(
+            root or settings.get('root', 'Raw-Data/Subtitles'),
+            producer=ScraperProducer(),
+            batch_size=settings.get('batch_size', 100),
+            workers=settings.get('workers'),
+            extensions=settings.get('extensions', ('.srt',)),
+            manifest=manifest
+        )
+
+    def discover(self) -> List[Path]:
+        """Subtitle files under the root."""
+        return walk_subtitle_files(self.root, self.extensions, workers=min(self.workers * 2, 32))
+
+    def iter_transcripts(self, paths: Optional[Iterable[Path]] = None) -> Iterator[Tuple[Path, Optional[RawTranscript], Optional[str]]]:
+        """Yield (path, transcript, error) per file, parsing in parallel when workers > 1."""
+        paths = list(self.discover() if paths is None else paths)
+        roots = [self.root] * len(paths)
+        if self.workers == 1 or len(paths) <= 1:
+            yield from map(_parse_or_error, paths, roots)
+            return
+        chunksize = max(1, len(paths) // (self.workers * 4))
+        # Spawned, not forked: the parent may hold spaCy models, Redis connections and monitor threads
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            yield from executor.map(_parse_or_error, paths, roots, chunksize=chunksize)
+
+    def ingest(self, paths: Optional[Iterable[Path]] = None, full: bool = False) -> Dict[str, Any]:
+        """
+        Parse and publish subtitle files, returning ingestion stats.
+
+        Without explicit paths the root is discovered; with a manifest only new and
+        changed files are ingested unless `full` is set, and files no longer present
+        are dropped from the manifest and reported under 'deleted'.
+        """
+        started = time.perf_counter()
+        stats = {'files': 0, 'segments': 0, 'published': 0, 'failed': 0, 'skipped': 0, 'documents': {}, 'deleted': {}}
+
+        if paths is None:
+            paths = self.discover()
+            if self.manifest is not None:
+                changes = self.manifest.diff(self.root, paths)
+                stats['deleted'] = changes.deleted
+                if not full:
+                    paths = [self.root / path for path in changes.pending]
+                    stats['skipped'] = len(changes.unchanged)
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        batch_paths: List[Path] = []
+
+        def flush():
+            if batch:
+                if self.producer is not None and self.producer.send_batch_to_queue(batch):
+                    stats['published'] += len(batch)
+                    published = {path: metadata['video_id'] for path, (_, metadata) in zip(batch_paths, batch)}
+                    stats['documents'].update(published)
+                    # Record each batch as it lands, so an interrupted run resumes where it stopped
+                    if self.manifest is not None:
+                        self.manifest.record(self.root, {path: [document_id] for path, document_id in published.items()})
+                else:
+                    stats['failed'] += len(batch)
+                batch.clear()
+                batch_paths.clear()
+
+        for path, transcript, error in self.iter_transcripts(paths):
+            stats['files'] += 1
+            if transcript is None:
+                logger.error(f"Failed to parse subtitle file {path}: {error}")
+                stats['failed'] += 1
+                continue
+            stats['segments'] += len(transcript.segments)
+            batch.append(transcript_event(transcript))
+            batch_paths.append(path)
+            if len(batch) >= self.batch_size:
+                flush()
+        flush()
+
+        if stats['deleted']:
+            self.manifest.forget(self.root, stats['deleted'])
+            logger.info(f"{len(stats['deleted'])} subtitle files were removed from {self.root} since the last run")
+
+        stats['wall_time'] = time.perf_counter() - started
+        logger.info(
+            f"Ingested {stats['published']}/{stats['files']} subtitle files "
+            f"({stats['segments']} segments, {stats['skipped']} unchanged) from {self.root} in {stats['wall_time']:.2f}s"
+        )
+        return stats
+
+    def close(self) -> None:
+        """Close the producer's Redis connection and the manifest."""
+        if self.producer is not None:
+            self.producer.close()
+        if self.manifest is not None:
+            self.manifest.close()
@@ -0,0 +1,122 @@
+# Software/DataHarvester/services/scraper_service/application/services/text/cleaning_plan.py
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+from application.services.text.multi_pattern import MultiPatternReplacer
+
+URL_PATTERN = re.compile(r'http\S+|www.\S+')
+SPECIAL_CHARACTERS_PATTERN = re.compile(r'[^\w\s]')
+# URLs are removed before special characters would break them up; both are
+# deletions, so one alternation gives the same result as the two passes
+URLS_AND_SPECIAL_CHARACTERS_PATTERN = re.compile(r'http\S+|www.\S+|[^\w\s]')
+SPACE_BEFORE_PUNCTUATION_PATTERN = re.compile(r'\s+([.,!?;:])')
+MISSING_SPACE_AFTER_PUNCTUATION_PATTERN = re.compile(r'([.,!?;:])(\w)')
+
+Step = Tuple[str, Callable[[str], str]]
+
+def _remove_special_characters(text: str) -> str:
+    return SPECIAL_CHARACTERS_PATTERN.sub('', text)
+
+def _remove_urls(text: str) -> str:
+    return URL_PATTERN.sub('', text)
+
+def _remove_urls_and_special_characters(text: str) -> str:
+    return URLS_AND_SPECIAL_CHARACTERS_PATTERN.sub('', text)
+
+def _collapse_whitespace(text: str) -> str:
+    return ' '.join(text.split())
+
+def _remove_emojis(text: str) -> str:
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+REMOVE_STEPS: Dict[str, Callable[[str], str]] = {
+    'special_characters': _remove_special_characters,
+    'extra_whitespace': _collapse_whitespace,
+    'urls': _remove_urls,
+    'emojis': _remove_emojis,
+}
+
+def _canonical_json(settings: Dict[str, Any]) -> str:
+    return json.dumps(settings, sort_keys=True, default=str)
+
+def settings_fingerprint(settings: Dict[str, Any]) -> str:
+    """Stable hash of text_cleaning settings; a different fingerprint means a different plan."""
+    return hashlib.sha256(_canonical_json(settings).encode('utf-8')).hexdigest()
+
+def compile_remove_steps(remove: Iterable[str]) -> Tuple[Step, ...]:
+    """Ordered removal steps for the `remove` setting, fusing urls + special_characters when adjacent."""
+    names = list(remove)
+    steps = []
+    i = 0
+    while i < len(names):
+        if names[i:i + 2] == ['urls', 'special_characters']:
+            steps.append(('urls+special_characters', _remove_urls_and_special_characters))
+            i += 2
+            continue
+        if names[i] in REMOVE_STEPS:
+            steps.append((names[i], REMOVE_STEPS[names[i]]))
+        i += 1
+    return tuple(steps)
+
+class CleaningPlan(BaseModel):
+    """text_cleaning settings compiled once into fixed steps and frozen lookup sets."""
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+
+    fingerprint: str
+    lowercase: bool
+    lexicon: MultiPatternReplacer
+    steps: Tuple[Step, ...]
+    remove_stopwords: bool
+    stop_words: FrozenSet[str]
+    interjections: FrozenSet[str]
+    use_nlp: bool
+    anonymize: bool
+    perform_lemmatization: bool
+
+    def basic_clean(self, text: str) -> str:
+        """Lowercase, apply the artifact/word-fix/interjection lexicon, then the removal steps in configured order."""
+        if self.lowercase:
+            text = text.lower()
+        # Before removals, which would strip the brackets off artifacts like "[music]"
+        text = self.lexicon.replace(text)
+        for _, step in self.steps:
+            text = step(text)
+        return text.strip()
+
+    def drop_stop_words(self, text: str) -> str:
+        """Remove stopwords when configured."""
+        if not self.remove_stopwords:
+            return text
+        stop_words = self.stop_words
+        return ' '.join(w for w in text.split() if w.lower() not in stop_words)
+
+def build_cleaning_plan(settings: Dict[str, Any], stop_words: Iterable[str] = ()) -> 'CleaningPlan':
+    """Compile text_cleaning settings into a plan; identical settings share one plan."""
+    return _build_cleaning_plan(_canonical_json(settings), frozenset(stop_words))
+
+@lru_cache(maxsize=16)
+def _build_cleaning_plan(settings_json: str, stop_words: FrozenSet[str]) -> CleaningPlan:
+    settings = json.loads(settings_json)
+    return CleaningPlan(
+        fingerprint=hashlib.sha256(settings_json.encode('utf-8')).hexdigest(),
+        lowercase=settings.get('lowercase', True),
+        lexicon=MultiPatternReplacer.from_lexicons(
+            artifacts=settings.get('artifacts', []),
+            word_fixes=settings.get('word_fixes', {}),
+            interjections=settings.get('interjections', []),
+            lowercase=settings.get('lowercase', True)
+        ),
+        steps=compile_remove_steps(settings.get('remove', [])),
+        remove_stopwords=settings.get('remove_stopwords', True),
+        stop_words=stop_words,
+        interjections=frozenset(settings.get('interjections', [])),
+        use_nlp=settings.get('use_nlp', True),
+        anonymize=settings.get('anonymize', True),
+        perform_lemmatization=settings.get('perform_lemmatization', False)
+    )
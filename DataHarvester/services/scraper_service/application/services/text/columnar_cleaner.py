@@ -0,0 +1,126 @@
+# Software/DataHarvester/services/scraper_service/application/services/text/columnar_cleaner.py
+
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from application.services.text.cleaning_plan import CleaningPlan
+from domain.exceptions.domain_exceptions import ConfigurationError
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+# The ASCII characters Python's \s, str.split() and str.strip() treat as whitespace.
+# Arrow's RE2 kernels use their own definitions, so every class below is spelled out.
+ASCII_WHITESPACE = '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f '
+_WHITESPACE_CLASS = r'\t\n\x0b\x0c\r\x1c-\x1f '
+_NOT_WHITESPACE = f'[^{_WHITESPACE_CLASS}]'
+
+# RE2 equivalents of the cleaning_plan patterns on ASCII text. Removals match whole
+# runs, which deletes the same characters in fewer replacements.
+URL_RE2 = f'http{_NOT_WHITESPACE}+|www[^\\n]{_NOT_WHITESPACE}+'
+SPECIAL_CHARACTERS_RE2 = f'[^A-Za-z0-9_{_WHITESPACE_CLASS}]+'
+# Whitespace that ' '.join(text.split()) would change: runs, or a lone character other than a space
+WHITESPACE_RUN_RE2 = f'[{_WHITESPACE_CLASS}]{{2,}}|[\\t\\n\\x0b\\x0c\\r\\x1c-\\x1f]'
+
+_RE2_SPECIAL = set('\\.^$|?*+()[]{}-')
+
+def _re2_escape(literal: str) -> str:
+    return ''.join(f'\\{ch}' if ch in _RE2_SPECIAL else ch for ch in literal)
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+def _remove(pattern: str) -> Callable:
+    return lambda array: pc.replace_substring_regex(array, pattern, '')
+
+def _collapse_whitespace(array):
+    return pc.utf8_trim(pc.replace_substring_regex(array, WHITESPACE_RUN_RE2, ' '), characters=' ')
+
+# Kernels for each CleaningPlan step, exact on ASCII rows
+ARROW_STEPS: Dict[str, Callable] = {
+    'special_characters': _remove(SPECIAL_CHARACTERS_RE2),
+    'urls': _remove(URL_RE2),
+    'urls+special_characters': _remove(f'{URL_RE2}|{SPECIAL_CHARACTERS_RE2}'),
+    'extra_whitespace': _collapse_whitespace,
+    # ASCII rows have nothing to drop
+    'emojis': lambda array: array,
+}
+
+class ColumnarCleaner:
+    """
+    CleaningPlan.basic_clean over whole Arrow string columns.
+
+    ASCII rows that no lexicon entry can match are lowercased and run through the
+    removal steps as pyarrow.compute kernels. Every other row (non-ASCII text, or a
+    possible artifact, word fix or interjection) goes through the plan row by row,
+    so the column matches basic_clean exactly, null rows staying null.
+    """
+
+    def __init__(self, plan: CleaningPlan):
+        if pa is None:
+            raise ConfigurationError("Columnar cleaning requires pyarrow (pip install scraper-service[datasets])", "CLN002")
+        self.plan = plan
+        self.vectorized = all(name in ARROW_STEPS for name, _ in plan.steps)
+        self.lexicon_pattern = self._lexicon_pattern()
+
+    def _lexicon_pattern(self) -> Optional[str]:
+        """RE2 alternation matching wherever the plan's lexicon would replace something."""
+        alternatives = []
+        for pattern in self.plan.lexicon.patterns:
+            prefix = r'\b' if _is_word_char(pattern[0]) else ''
+            suffix = r'\b' if _is_word_char(pattern[-1]) else ''
+            alternatives.append(f'{prefix}{_re2_escape(pattern)}{suffix}')
+        return '|'.join(alternatives) or None
+
+    def basic_clean(self, column: Union['pa.Array', 'pa.ChunkedArray', List[Optional[str]]]) -> 'pa.Array':
+        """Basic-clean every row of a string column (or a list of strings)."""
+        if not isinstance(column, (pa.Array, pa.ChunkedArray)):
+            column = pa.array(column, pa.string())
+        if isinstance(column, pa.ChunkedArray):
+            column = column.combine_chunks()
+        if not pa.types.is_string(column.type):
+            column = column.cast(pa.string())
+        if not self.vectorized:
+            return pa.array([None if text is None else self.plan.basic_clean(text) for text in column.to_pylist()], pa.string())
+
+        cleaned = pc.ascii_lower(column) if self.plan.lowercase else column
+        row_by_row = pc.invert(pc.string_is_ascii(column))
+        if self.lexicon_pattern:
+            row_by_row = pc.or_(row_by_row, pc.match_substring_regex(cleaned, self.lexicon_pattern))
+        row_by_row = pc.fill_null(row_by_row, False)
+
+        for name, _ in self.plan.steps:
+            cleaned = ARROW_STEPS[name](cleaned)
+        cleaned = pc.utf8_trim(cleaned, characters=ASCII_WHITESPACE)
+
+        if pc.any(row_by_row).as_py():
+            texts = column.filter(row_by_row).to_pylist()
+            cleaned = pc.replace_with_mask(cleaned, row_by_row, pa.array([self.plan.basic_clean(text) for text in texts], pa.string()))
+        return cleaned
+
+    def clean(
+        self,
+        column: Union['pa.Array', 'pa.ChunkedArray', List[Optional[str]]],
+        process: Callable[..., List[str]],
+        flags: Optional[Sequence[bool]] = None
+    ) -> 'pa.Array':
+        """
+        Basic-clean a column, then run `process` once over its distinct cleaned values.
+
+        `process` maps a list of strings to a list of the same length; it is where the
+        per-row stages (stopwords, NLP, anonymization) go, so repeated rows cost nothing.
+        With per-row `flags`, rows are grouped by (value, flag) instead, and `process`
+        is called as process(values, value_flags), so a flag travels with its rows.
+        """
+        encoded = pc.dictionary_encode(self.basic_clean(column))
+        values = encoded.dictionary.to_pylist()
+        if flags is None:
+            return pc.take(pa.array(process(values) if values else [], pa.string()), encoded.indices)
+
+        keys = pc.add(pc.multiply(encoded.indices.cast(pa.int64()), 2), pa.array(flags, pa.bool_()).cast(pa.int64()))
+        distinct = pc.drop_null(pc.unique(keys)).to_pylist()
+        processed = process([values[key // 2] for key in distinct], [key % 2 == 1 for key in distinct]) if distinct else []
+        return pc.take(pa.array(processed, pa.string()), pc.index_in(keys, pa.array(distinct, pa.int64())))
@@ -0,0 +1,169 @@
+# Software/DataHarvester/services/scraper_service/application/services/text/model_registry.py
+
+import os
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+from presidio_analyzer.nlp_engine import NlpArtifacts, SpacyNlpEngine
+
+from infrastructure.logging.logger import get_logger
+from application.services.text.pipeline_profile import PIPELINE_COMPONENTS, PRESIDIO_FEATURES, components_for
+
+logger = get_logger()
+
+PRESIDIO_EXCLUDE = tuple(name for name in PIPELINE_COMPONENTS if name not in components_for(PRESIDIO_FEATURES))
+
+def resident_memory_bytes() -> int:
+    """Resident set size of this process, or 0 where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def doc_nlp_artifacts(doc: Doc, nlp_engine: SpacyNlpEngine, language: str = 'en') -> NlpArtifacts:
+    """
+    Presidio NlpArtifacts for an already parsed Doc, so the analyzer skips its own parse.
+
+    Built with the public NlpArtifacts constructor, applying the engine's NER model
+    configuration the way SpacyNlpEngine does for documents it parses: ignored
+    labels are dropped, the rest mapped to Presidio entities and scored.
+    """
+    ner_config = nlp_engine.ner_model_configuration
+    mapping = ner_config.model_to_presidio_entity_mapping
+    entities, scores = [], []
+    for ent in doc.ents:
+        label = mapping.get(ent.label_, ent.label_)
+        if ent.label_ in ner_config.labels_to_ignore or label in ner_config.labels_to_ignore:
+            continue
+        score = ner_config.default_score
+        if label in ner_config.low_score_entity_names:
+            score *= ner_config.low_confidence_score_multiplier
+        entities.append(Span(doc, ent.start, ent.end, label=label))
+        scores.append(score)
+
+    return NlpArtifacts(
+        entities=entities,
+        tokens=doc,
+        tokens_indices=[token.idx for token in doc],
+        lemmas=[token.lemma_ for token in doc],
+        nlp_engine=nlp_engine,
+        language=language,
+        scores=scores
+    )
+
+class NLPModelRegistry:
+    """
+    Process-wide registry of loaded NLP models.
+
+    Each spaCy model is loaded once per process and the same instance is handed to
+    the text cleaner, NLPEngine and Presidio's NLP engine. Callers list the
+    components they exclude; a later caller needing one of them reloads the model
+    once with the union of both requirements.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized'):
+            self.initialized = True
+            self._lock = threading.RLock()
+            self._models: Dict[str, Language] = {}
+            self._excluded: Dict[str, FrozenSet[str]] = {}
+            self._resident_bytes: Dict[str, int] = {}
+            self._nlp_engines: Dict[str, SpacyNlpEngine] = {}
+            self._recognizer_registries: Dict[Optional[FrozenSet[str]], RecognizerRegistry] = {}
+            self._analyzers: Dict[Tuple[str, float, Optional[FrozenSet[str]]], AnalyzerEngine] = {}
+
+    def get_spacy(self, model_name: str, exclude: Iterable[str] = ()) -> Language:
+        """Return the shared pipeline for a model, loading it on first use."""
+        exclude = frozenset(exclude)
+        with self._lock:
+            if model_name in self._models and self._excluded[model_name] <= exclude:
+                return self._models[model_name]
+
+            if model_name in self._models:
+                # Keep everything either caller needs
+                exclude = self._excluded[model_name] & exclude
+                logger.warning(f"Reloading spaCy model {model_name} with components {sorted(set(PIPELINE_COMPONENTS) - exclude)}")
+
+            before = resident_memory_bytes()
+            nlp = spacy.load(model_name, exclude=sorted(exclude))
+            self._resident_bytes[model_name] = max(resident_memory_bytes() - before, 0)
+            self._models[model_name] = nlp
+            self._excluded[model_name] = exclude
+            # Presidio engines wrap the previous instance; rebuild them on next use
+            self._nlp_engines.pop(model_name, None)
+            for key in [key for key in self._analyzers if key[0] == model_name]:
+                del self._analyzers[key]
+
+            logger.info(
+                f"Loaded spaCy model {model_name} with components {nlp.pipe_names} "
+                f"(+{self._resident_bytes[model_name] / 1024 ** 2:.1f} MB resident)"
+            )
+            return nlp
+
+    def get_presidio_nlp_engine(self, model_name: str) -> SpacyNlpEngine:
+        """Presidio NLP engine backed by the shared spaCy pipeline instead of its own copy."""
+        with self._lock:
+            nlp = self.get_spacy(model_name, PRESIDIO_EXCLUDE)
+            if model_name not in self._nlp_engines:
+                engine = SpacyNlpEngine(models=[{'lang_code': 'en', 'model_name': model_name}])
+                engine.nlp = {'en': nlp}
+                self._nlp_engines[model_name] = engine
+            return self._nlp_engines[model_name]
+
+    def get_recognizer_registry(self, entities: Optional[Iterable[str]] = None) -> RecognizerRegistry:
+        """
+        Predefined English recognizers limited to those detecting one of `entities`
+        (all of them when None), built once per entity set.
+        """
+        key = frozenset(entities) if entities else None
+        with self._lock:
+            if key not in self._recognizer_registries:
+                registry = RecognizerRegistry()
+                registry.load_predefined_recognizers(languages=['en'])
+                if key is not None:
+                    registry.recognizers = [
+                        recognizer for recognizer in registry.recognizers
+                        if key & set(recognizer.supported_entities)
+                    ]
+                    if not registry.recognizers:
+                        raise ValueError(f"No Presidio recognizer detects any of {sorted(key)}")
+                logger.info(f"Built Presidio registry with recognizers {[r.name for r in registry.recognizers]}")
+                self._recognizer_registries[key] = registry
+            return self._recognizer_registries[key]
+
+    def get_analyzer(
+        self,
+        model_name: str,
+        score_threshold: float = 0,
+        entities: Optional[Iterable[str]] = None
+    ) -> AnalyzerEngine:
+        """Presidio analyzer over the shared pipeline, one per model, score threshold and entity set."""
+        with self._lock:
+            nlp_engine = self.get_presidio_nlp_engine(model_name)
+            entity_set = frozenset(entities) if entities else None
+            key = (model_name, score_threshold, entity_set)
+            if key not in self._analyzers:
+                self._analyzers[key] = AnalyzerEngine(
+                    nlp_engine=nlp_engine,
+                    registry=self.get_recognizer_registry(entity_set),
+                    supported_languages=['en'],
+                    default_score_threshold=score_threshold
+                )
+            return self._analyzers[key]
+
+    def memory_report(self) -> Dict[str, int]:
+        """Resident memory each loaded model added to the process, in bytes."""
+        with self._lock:
+            return dict(self._resident_bytes)
@@ -0,0 +1,138 @@
+# Software/DataHarvester/services/scraper_service/application/services/text/multi_pattern.py
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+class _Automaton:
+    """Pure-Python Aho-Corasick automaton, used when pyahocorasick is not installed."""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(index)
+
+        # Breadth-first failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end index, pattern index) for every occurrence, like pyahocorasick."""
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for index in out[node]:
+                yield i, index
+
+class MultiPatternReplacer:
+    """
+    Replace or remove many literal phrases in one scan per segment.
+
+    All patterns go into a single Aho-Corasick automaton (pyahocorasick when
+    installed, a pure-Python one otherwise), so cost grows with the text rather
+    than the lexicon. Matches respect word boundaries at word-character edges and
+    are applied leftmost-longest without overlaps.
+    """
+
+    def __init__(self, replacements: Dict[str, str]):
+        self.patterns = [pattern for pattern in replacements if pattern]
+        self.replacements = [replacements[pattern] for pattern in self.patterns]
+        self.backend = 'none'
+        self._automaton = None
+        if not self.patterns:
+            return
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for index, pattern in enumerate(self.patterns):
+                automaton.add_word(pattern, index)
+            automaton.make_automaton()
+            self._automaton = automaton
+            self.backend = 'pyahocorasick'
+        else:
+            self._automaton = _Automaton(self.patterns)
+            self.backend = 'python'
+
+    @classmethod
+    def from_lexicons(
+        cls,
+        artifacts: Iterable[str] = (),
+        word_fixes: Dict[str, str] = None,
+        interjections: Iterable[str] = (),
+        lowercase: bool = True
+    ) -> 'MultiPatternReplacer':
+        """Remove artifacts and interjections, and apply word fixes. Word fixes win on conflicts."""
+        normalize = str.lower if lowercase else str
+        replacements = {normalize(artifact): '' for artifact in artifacts}
+        replacements.update({normalize(word): '' for word in interjections})
+        replacements.update({normalize(word): fix for word, fix in (word_fixes or {}).items()})
+        return cls(replacements)
+
+    def _is_bounded(self, text: str, start: int, end: int, pattern: str) -> bool:
+        if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if _is_word_char(pattern[-1]) and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def replace(self, text: str) -> str:
+        """Apply every replacement to one segment."""
+        if self._automaton is None or not text:
+            return text
+
+        matches = []
+        for last, index in self._automaton.iter(text):
+            pattern = self.patterns[index]
+            start = last - len(pattern) + 1
+            if self._is_bounded(text, start, last + 1, pattern):
+                matches.append((start, last + 1, index))
+        if not matches:
+            return text
+
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        parts = []
+        position = 0
+        for start, end, index in matches:
+            if start < position:
+                continue
+            parts.append(text[position:start])
+            parts.append(self.replacements[index])
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts)
+
+    def replace_batch(self, texts: Iterable[str]) -> List[str]:
+        """Apply every replacement to many segments."""
+        replace = self.replace
+        return [replace(text) for text in texts]
@@ -0,0 +1,94 @@
+# Software/DataHarvester/services/scraper_service/application/services/text/nlp_resources.py
+
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional
+
+import spacy
+from nltk.corpus import stopwords
+
+from infrastructure.logging.logger import get_logger
+from infrastructure.monitoring.health_checker import HealthChecker
+from infrastructure.config.config_manager import ConfigManager
+from domain.exceptions.domain_exceptions import ConfigurationError
+from application.services.text.pipeline_profile import PRESIDIO_FEATURES, build_pipeline_profile
+from application.services.text.model_registry import NLPModelRegistry
+
+logger = get_logger()
+
+# NLTK data and spaCy models are baked into the image (see Dockerfile.DI); nothing
+# here downloads, so air-gapped nodes fail fast with a clear message instead
+_verified = set()
+_verify_lock = threading.Lock()
+
+def ensure_nltk_data() -> None:
+    """Verify the baked-in NLTK data once per process."""
+    with _verify_lock:
+        if 'nltk' in _verified:
+            return
+        nltk_ok, missing_data = HealthChecker.refresh_nltk_state()
+        if not nltk_ok:
+            raise ConfigurationError(
+                f"Missing NLTK data: {', '.join(missing_data)}. "
+                f"Install it at image build with `python -m nltk.downloader {' '.join(missing_data)}`",
+                "RES001"
+            )
+        _verified.add('nltk')
+
+def ensure_spacy_model(model_name: str) -> None:
+    """Verify a spaCy model is installed (as a package or path) once per process."""
+    with _verify_lock:
+        if model_name in _verified:
+            return
+        if not (spacy.util.is_package(model_name) or Path(model_name).exists()):
+            raise ConfigurationError(
+                f"spaCy model {model_name} is not installed. "
+                f"Install it at image build with `python -m spacy download {model_name}`",
+                "RES002"
+            )
+        _verified.add(model_name)
+
+@lru_cache(maxsize=1)
+def get_stop_words() -> FrozenSet[str]:
+    """English stopwords, loaded once per process."""
+    ensure_nltk_data()
+    return frozenset(stopwords.words('english'))
+
+def warm_start(config: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    Verify and load everything TranscriptCleaner needs, once per process.
+
+    Call from worker start-up so the first task does not pay for model loading;
+    later calls are cache hits. Returns seconds spent per step.
+    """
+    config = config if config is not None else ConfigManager().get_config('cleaning')
+    settings = config.get('text_cleaning', {})
+    timings = {}
+
+    start = time.perf_counter()
+    get_stop_words()
+    timings['nltk'] = time.perf_counter() - start
+
+    shared_features = PRESIDIO_FEATURES if settings.get('anonymize', True) else ()
+    profile = build_pipeline_profile(settings, shared_features)
+    models = NLPModelRegistry()
+
+    start = time.perf_counter()
+    ensure_spacy_model(profile.model_name)
+    models.get_spacy(profile.model_name, profile.exclude)
+    timings['spacy'] = time.perf_counter() - start
+
+    if settings.get('anonymize', True):
+        pii_settings = config.get('pii', {})
+        start = time.perf_counter()
+        models.get_analyzer(
+            profile.model_name,
+            score_threshold=pii_settings.get('score_threshold', 0),
+            entities=pii_settings.get('entities') or None
+        )
+        timings['presidio'] = time.perf_counter() - start
+
+    logger.info("NLP resources ready: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
+    return timings
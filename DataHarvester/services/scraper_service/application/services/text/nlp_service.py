@@ -2,19 +2,24 @@
 
 from infrastructure.logging.logger import get_logger
 import nltk
-import spacy
-from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+from typing import Optional
 from presidio_anonymizer import AnonymizerEngine
 from infrastructure.monitoring.health_checker import HealthChecker
+from application.services.text.model_registry import NLPModelRegistry, PRESIDIO_EXCLUDE
+from application.services.text.pipeline_profile import model_name_for
+from infrastructure.config.config_manager import ConfigManager
 
 logger = get_logger()
 
 class NLPEngine:
-    def __init__(self):
+    def __init__(self, model_name: Optional[str] = None):
         self.nlp = None
         self.analyzer = None
         self.anonymizer = None
         self.nltk_data_path = '/usr/local/share/nltk_data'
+        # Same model as the text cleaner unless one is given
+        self.model_name = model_name or model_name_for(ConfigManager().get_config('cleaning').get('text_cleaning', {}))
+        self.models = NLPModelRegistry()
         
     def initialize(self) -> bool:
         """Initialize all NLP components."""
@@ -53,7 +58,7 @@ class NLPEngine:
     def _init_spacy(self) -> bool:
         """Initialize spaCy model."""
         try:
-            self.nlp = spacy.load('en_core_web_sm')
+            self.nlp = self.models.get_spacy(self.model_name, PRESIDIO_EXCLUDE)
             return True
         except Exception as e:
             logger.error(f"spaCy initialization failed: {str(e)}")
@@ -62,23 +67,13 @@ class NLPEngine:
     def _init_presidio(self) -> bool:
         """Initialize Presidio analyzers."""
         try:
-            # Create NLP engine configuration for Presidio
-            from presidio_analyzer.nlp_engine import NlpEngineProvider
-            configuration = {
-                "nlp_engine_name": "spacy",
-                "models": [{"lang_code": "en", "model_name": "en_core_web_sm"}]
-            }
-            provider = NlpEngineProvider(nlp_configuration=configuration)
-            
-            # Initialize registry with our configured engine
-            registry = RecognizerRegistry()
-            registry.load_predefined_recognizers(languages=['en'])
-            
-            self.analyzer = AnalyzerEngine(
-                nlp_engine=provider.create_engine(),
-                registry=registry,
-                supported_languages=['en'],
-                default_score_threshold=0.4
+            # Analyzer over the same spaCy instance as get_nlp(), with only the
+            # recognizers for the entity types configured in cleaning.yaml
+            pii_settings = ConfigManager().get_config('cleaning').get('pii', {})
+            self.analyzer = self.models.get_analyzer(
+                self.model_name,
+                score_threshold=pii_settings.get('score_threshold', 0.4),
+                entities=pii_settings.get('entities')
             )
             
             self.anonymizer = AnonymizerEngine()
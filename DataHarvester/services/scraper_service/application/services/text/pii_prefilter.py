@@ -0,0 +1,76 @@
+# Software/DataHarvester/services/scraper_service/application/services/text/pii_prefilter.py
+
+import re
+import threading
+from typing import Any, Dict, Optional
+
+# Signals that a segment may hold something Presidio recognizes: digits (phone,
+# card, SSN, dates), '@' (email), URLs, and capitalized words that do not start
+# a sentence (names and places). "I" and sentence-initial capitals do not count.
+CANDIDATE_PATTERN = re.compile(
+    r'\d'
+    r'|@'
+    r'|https?://|www\.'
+    r'|[^.!?\s]\s+[A-Z]\w'
+)
+
+class PIIPrefilter:
+    """
+    Cheap gate in front of Presidio's analyzer.
+
+    Segments without any candidate pattern, and without spaCy entities when a
+    parsed Doc is available, are passed through unanalyzed. Counters track how
+    many segments were checked and how many skipped Presidio.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.checked = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def is_candidate(self, text: str) -> bool:
+        """
+        Whether a segment has a candidate pattern, without touching the counters.
+
+        Check the original text: the capitalized-word signal is gone once cleaning
+        has lowercased it.
+        """
+        return not self.enabled or (bool(text) and CANDIDATE_PATTERN.search(text) is not None)
+
+    def needs_analysis(self, text: str, doc: Optional[Any] = None, candidate: Optional[bool] = None) -> bool:
+        """
+        Whether a segment should go through Presidio.
+
+        Pass the original text, or `candidate` as is_candidate found it on the
+        original text when only the cleaned text is at hand.
+        """
+        if not self.enabled:
+            return True
+        if candidate is None:
+            candidate = self.is_candidate(text)
+        candidate = candidate or (doc is not None and len(doc.ents) > 0)
+        with self._lock:
+            self.checked += 1
+            if not candidate:
+                self.skipped += 1
+        return candidate
+
+    @property
+    def skip_ratio(self) -> float:
+        """Fraction of checked segments that skipped Presidio."""
+        return self.skipped / self.checked if self.checked else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Prefilter counters."""
+        return {
+            'checked': self.checked,
+            'skipped': self.skipped,
+            'skip_ratio': self.skip_ratio
+        }
+
+    def reset(self) -> None:
+        """Zero the counters."""
+        with self._lock:
+            self.checked = 0
+            self.skipped = 0
@@ -0,0 +1,80 @@
+# Software/DataHarvester/services/scraper_service/application/services/text/pipeline_profile.py
+
+import os
+from typing import Any, Dict, FrozenSet, Iterable, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+# Components of the en_core_web_* pipelines
+PIPELINE_COMPONENTS = ('tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner', 'senter')
+
+# Token analyses and the components that produce them
+FEATURE_COMPONENTS = {
+    'pos': {'tok2vec', 'tagger', 'attribute_ruler'},
+    'dep': {'tok2vec', 'parser'},
+    'lemma': {'tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer'},
+    'ents': {'ner'},
+}
+
+# Token analyses Presidio reads from a spaCy Doc: entities for the SpacyRecognizer,
+# lemmas for context-word enhancement
+PRESIDIO_FEATURES = frozenset({'ents', 'lemma'})
+
+class PipelineProfile(BaseModel):
+    """Which spaCy components to load, and which to skip on cleaning calls."""
+    model_config = ConfigDict(frozen=True)
+
+    model_name: str
+    features: FrozenSet[str]
+    exclude: Tuple[str, ...]
+    disable: Tuple[str, ...]
+
+def model_name_for(settings: Dict[str, Any]) -> str:
+    """spaCy model for the given text_cleaning settings: spacy_model, else $SPACY_MODEL."""
+    return settings.get('spacy_model') or os.getenv('SPACY_MODEL', 'en_core_web_sm')
+
+def components_for(features: Iterable[str]) -> FrozenSet[str]:
+    """Pipeline components needed to compute the given token analyses."""
+    needed = set()
+    for feature in features:
+        needed |= FEATURE_COMPONENTS[feature]
+    return frozenset(needed)
+
+def cleaning_features(settings: Dict[str, Any]) -> FrozenSet[str]:
+    """
+    Token analyses that spaCy-based cleaning reads under the given settings.
+
+    POS tags and dependency labels only decide which tokens keep their surface form
+    instead of being lemmatized. Anonymization reuses the same Doc for Presidio, so
+    it adds the analyses Presidio's recognizers read.
+    """
+    if not settings.get('use_nlp', True):
+        return frozenset()
+    features = set()
+    if settings.get('perform_lemmatization', False):
+        features |= {'pos', 'dep', 'lemma'}
+    if settings.get('anonymize', True):
+        features |= PRESIDIO_FEATURES
+    return frozenset(features)
+
+def build_pipeline_profile(
+    settings: Dict[str, Any],
+    shared_features: Iterable[str] = ()
+) -> PipelineProfile:
+    """
+    Compile text_cleaning settings into a pipeline profile.
+
+    Components needed by neither cleaning nor `shared_features` (analyses other
+    consumers of the same model rely on) are excluded from loading; components
+    loaded only for those consumers are disabled on cleaning calls.
+    """
+    features = cleaning_features(settings)
+    cleaning_components = components_for(features)
+    loaded_components = cleaning_components | components_for(shared_features)
+
+    return PipelineProfile(
+        model_name=model_name_for(settings),
+        features=features,
+        exclude=tuple(name for name in PIPELINE_COMPONENTS if name not in loaded_components),
+        disable=tuple(name for name in PIPELINE_COMPONENTS if name in loaded_components - cleaning_components)
+    )
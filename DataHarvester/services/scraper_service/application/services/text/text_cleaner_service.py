@@ -2,30 +2,61 @@
 
 from infrastructure.logging.logger import get_logger
 import re
-from typing import List, Dict, Set, Any, Union
-import nltk
-from nltk.corpus import stopwords
+from typing import Iterable, List, Dict, Optional, Sequence, FrozenSet, Any, Union
 from infrastructure.monitoring.health_checker import HealthChecker
+from infrastructure.cache.segment_memo import SegmentMemo
 from application.services.text.nlp_service import NLPEngine
+from application.services.text.pipeline_profile import PRESIDIO_FEATURES, build_pipeline_profile
+from application.services.text.model_registry import NLPModelRegistry, doc_nlp_artifacts
+from application.services.text.pii_prefilter import PIIPrefilter
+from application.services.text.nlp_resources import get_stop_words, warm_start
+from application.services.text.columnar_cleaner import ColumnarCleaner
+from application.services.transcript.segment_windows import merge_segments
+from application.services.text.cleaning_plan import (
+    URL_PATTERN,
+    SPACE_BEFORE_PUNCTUATION_PATTERN,
+    MISSING_SPACE_AFTER_PUNCTUATION_PATTERN,
+    build_cleaning_plan,
+    settings_fingerprint
+)
 from validation.validators.config_validator import validate_settings
-from presidio_analyzer import AnalyzerEngine
 from pathlib import Path
 from infrastructure.config.config_manager import ConfigManager
+from domain.models.transcript import TranscriptSegment
 from domain.exceptions.domain_exceptions import ConfigurationError
-import spacy
+from presidio_analyzer import BatchAnalyzerEngine
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import RecognizerResult
 
 logger = get_logger()
 
+PLACEHOLDER_PATTERN = re.compile(r'\x00(\d+)\x00')
+
+def _resolve_entities(results: Sequence[Any]) -> List[RecognizerResult]:
+    """
+    Non-redundant PII spans, following Presidio's default anonymizer conflict resolution:
+    intersecting results of one entity type are merged, then results contained in
+    another (or on the same span with a lower score) are dropped.
+    """
+    merged: List[RecognizerResult] = []
+    for r in sorted(results, key=lambda r: (r.entity_type, r.start)):
+        last = merged[-1] if merged else None
+        if last and last.entity_type == r.entity_type and r.start < last.end:
+            last.end = max(last.end, r.end)
+            last.score = max(last.score, r.score)
+        else:
+            merged.append(RecognizerResult(start=r.start, end=r.end, score=r.score, entity_type=r.entity_type))
+
+    kept: List[RecognizerResult] = []
+    for r in sorted(merged, key=lambda r: (r.start - r.end, -r.score)):
+        if not any(k.start <= r.start and r.end <= k.end for k in kept):
+            kept.append(r)
+    return sorted(kept, key=lambda r: r.start)
+
 class TranscriptCleaner:
     def __init__(self):
         """Initialize the TranscriptCleaner with configuration."""
         try:
-            # Initialize NLTK components
-            nltk.download('popular', quiet=True)  # Download popular datasets including stopwords
-            self.stop_words = set(stopwords.words('english'))
-            
             # Initialize configuration
             self.config = ConfigManager().get_config('cleaning')
             validate_settings(self.config.get('text_cleaning', {}), {
@@ -35,72 +66,318 @@ class TranscriptCleaner:
             })
             self.settings = self.config.get('text_cleaning', {})
             
+            # Verify the baked-in NLTK and spaCy data and load models, once per process
+            warm_start(self.config)
+            self.stop_words = get_stop_words()
+            self.plan = build_cleaning_plan(self.settings, self.stop_words)
+            
             # Initialize NLP components
-            self.nlp_engine = NLPEngine()
-            self.analyzer = AnalyzerEngine()
+            self.models = NLPModelRegistry()
+            self._load_models()
+            self.nlp_engine = NLPEngine(self.pipeline_profile.model_name)
             
-            # Initialize health checker
+            # Initialize health checker; hot paths read its cached state
             self.health_checker = HealthChecker()
+            self.health_checker.start_monitoring()
             
             # Setup data paths
             self.data_path = Path('data/processed')
             self.data_path.mkdir(parents=True, exist_ok=True)
             
-            # Initialize spaCy
-            self.nlp = spacy.load('en_core_web_sm')
+            # Segments without candidate PII patterns skip Presidio
+            self.pii_prefilter = PIIPrefilter(enabled=self.settings.get('pii_prefilter', True))
             
-            # Initialize Anonymizer
-            self.anonymizer = AnonymizerEngine()
+            # Memo of cleaned segments, keyed by everything that determines the output
+            memo_settings = self.config.get('memo', {})
+            self.memo = SegmentMemo.from_settings(memo_settings) if memo_settings.get('enabled', True) else None
+            self.memo_fingerprint = self._cleaning_fingerprint()
+            
+            # Columnar cleaner for tabular datasets, built on first use
+            self.columnar = None
             
             logger.info("TranscriptCleaner initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize TranscriptCleaner: {str(e)}")
             raise ConfigurationError(f"TranscriptCleaner initialization failed: {str(e)}", "CLN001")
 
+    def _load_models(self) -> None:
+        """
+        Load spaCy, and Presidio when anonymizing, for the current settings.
+
+        spaCy comes from the model registry with only the components cleaning and
+        Presidio need, so when both run one parse per segment serves lemmatization
+        and PII analysis. Without anonymization no analyzer is built, since it would
+        ask the registry for a second, differently profiled copy of the model.
+        """
+        anonymize = self.settings.get('anonymize', True)
+        shared_features = PRESIDIO_FEATURES if anonymize else ()
+        self.pipeline_profile = build_pipeline_profile(self.settings, shared_features)
+        self.nlp = self.models.get_spacy(self.pipeline_profile.model_name, self.pipeline_profile.exclude)
+
+        # Only the recognizers for the configured entity types are built
+        pii_settings = self.config.get('pii', {})
+        self.pii_entities = pii_settings.get('entities') or None
+        self.analyzer = None
+        self.batch_analyzer = None
+        self.anonymizer = None
+        if anonymize:
+            self.analyzer = self.models.get_analyzer(
+                self.pipeline_profile.model_name,
+                score_threshold=pii_settings.get('score_threshold', 0),
+                entities=self.pii_entities
+            )
+            self.batch_analyzer = BatchAnalyzerEngine(analyzer_engine=self.analyzer)
+            self.anonymizer = AnonymizerEngine()
+
     def clean_text(self, text: str) -> str:
         """Clean the input text according to configuration settings."""
+        # Health check before processing, from the cached state
+        self.health_checker.require_nltk_data()
+
         try:
             if not text:
                 return ""
 
-            # Health check before processing
-            self.health_checker.check_nltk_data()
-
-            # Basic cleaning
-            text = self._basic_clean(text)
-            
-            # Remove stopwords if configured
-            if self.settings.get('remove_stopwords', True):
-                words = text.split()
-                words = [w for w in words if w.lower() not in self.stop_words]
-                text = ' '.join(words)
+            # Repeated segments are answered from the memo
+            memo_key = self._memo_key(text) if self.memo else None
+            if memo_key:
+                cached = self.memo.get(memo_key)
+                if cached is not None:
+                    return cached
 
-            # Process with NLP engine
-            if self.settings.get('use_nlp', True):
-                text = self._process_with_spacy(text)
+            # The PII prefilter reads the original casing, which basic cleaning may lower
+            pii_candidate = self.pii_prefilter.is_candidate(text)
 
-            # Anonymize sensitive information if configured
-            if self.settings.get('anonymize', True):
-                text = self._anonymize_text(text)
+            # Basic cleaning and stopword removal
+            text = self._prepare_text(text)
 
-            return text.strip()
+            # Process with NLP engine, anonymizing from the same parse if configured
+            text = self._process_text(text, pii_candidate)
+            if memo_key:
+                self.memo.put(memo_key, text)
+            return text
         except Exception as e:
             logger.error(f"Error cleaning text: {str(e)}")
             return text
 
+    def clean_batch(
+        self,
+        texts: Iterable[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None
+    ) -> List[str]:
+        """
+        Clean many segments at once, streaming them through spaCy's nlp.pipe.
+
+        Produces the same output as calling clean_text on each segment, in the
+        original order, while paying spaCy's per-call overhead once per batch.
+        Memoized segments are looked up, and each distinct miss is cleaned once.
+        """
+        # Health check before processing, from the cached state
+        self.health_checker.require_nltk_data()
+
+        texts = list(texts)
+        if not texts:
+            return []
+
+        ids = [self._memo_key(text) if self.memo else i for i, text in enumerate(texts)]
+        done = self.memo.get_many({id_ for id_, text in zip(ids, texts) if text}) if self.memo else {}
+        pending = {}
+        for id_, text in zip(ids, texts):
+            if text and id_ not in done:
+                pending.setdefault(id_, text)
+
+        if pending:
+            try:
+                fresh = dict(zip(pending, self._clean_batch(list(pending.values()), batch_size, n_process)))
+                if self.memo:
+                    self.memo.put_many(fresh)
+            except Exception as e:
+                logger.error(f"Error cleaning batch, falling back to per-segment cleaning: {str(e)}")
+                fresh = {id_: self.clean_text(text) for id_, text in pending.items()}
+            done.update(fresh)
+
+        return [done[id_] if text else "" for id_, text in zip(ids, texts)]
+
+    def _clean_batch(self, texts: List[str], batch_size: Optional[int], n_process: Optional[int]) -> List[str]:
+        """Clean non-empty segments through nlp.pipe; raises on failure."""
+        pii_candidates = [self.pii_prefilter.is_candidate(text) for text in texts]
+        return self._process_prepared([self._prepare_text(text) for text in texts], batch_size, n_process, pii_candidates)
+
+    def _process_prepared(
+        self,
+        cleaned: List[str],
+        batch_size: Optional[int],
+        n_process: Optional[int],
+        pii_candidates: List[bool]
+    ) -> List[str]:
+        """
+        Run the NLP and anonymization stages over already prepared texts; raises on failure.
+        pii_candidates holds the prefilter's verdict on each original text.
+        """
+        if self.plan.use_nlp:
+            docs = self.nlp.pipe(
+                cleaned,
+                batch_size=batch_size or self.settings.get('batch_size', 256),
+                n_process=n_process or self.settings.get('n_process', 1),
+                disable=list(self.pipeline_profile.disable)
+            )
+            cleaned = [
+                self._render_doc(doc, self._doc_entities(doc, pii_candidate))
+                for doc, pii_candidate in zip(docs, pii_candidates)
+            ]
+        elif self.plan.anonymize:
+            cleaned = [
+                result['text'] for result in self.anonymize_batch(cleaned, batch_size, n_process, pii_candidates)
+            ]
+
+        return [cleaned_text.strip() for cleaned_text in cleaned]
+
+    def clean_column(self, column, batch_size: Optional[int] = None, n_process: Optional[int] = None):
+        """
+        Clean a string column of a tabular dataset, matching clean_text on every row.
+
+        Basic cleaning runs as Arrow compute kernels over the whole column; stopword
+        removal and the NLP stages then run once per distinct value that is still
+        non-empty. Returns a pyarrow string array with nulls preserved.
+        """
+        # Health check before processing, from the cached state
+        self.health_checker.require_nltk_data()
+
+        if self.columnar is None or self.columnar.plan is not self.plan:
+            self.columnar = ColumnarCleaner(self.plan)
+
+        def process(values: List[str], pii_candidates: Optional[List[bool]] = None) -> List[str]:
+            pii_candidates = pii_candidates or [True] * len(values)
+            prepared = [self.plan.drop_stop_words(value) for value in values]
+            pending = [index for index, value in enumerate(prepared) if value]
+            try:
+                processed = self._process_prepared(
+                    [prepared[index] for index in pending],
+                    batch_size,
+                    n_process,
+                    [pii_candidates[index] for index in pending]
+                )
+            except Exception as e:
+                logger.error(f"Error cleaning column, falling back to per-value cleaning: {str(e)}")
+                processed = [self._process_text(prepared[index], pii_candidates[index]) for index in pending]
+            for index, text in zip(pending, processed):
+                prepared[index] = text
+            return prepared
+
+        if not (self.plan.anonymize and self.pii_prefilter.enabled):
+            return self.columnar.clean(column, process)
+
+        # The PII prefilter reads each row's original casing; rows are grouped by value and verdict
+        rows = column if isinstance(column, list) else column.to_pylist()
+        pii_candidates = [text is not None and self.pii_prefilter.is_candidate(text) for text in rows]
+        return self.columnar.clean(column, process, pii_candidates)
+
+    def anonymize_batch(
+        self,
+        texts: Iterable[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+        pii_candidates: Optional[List[bool]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Anonymize many segments at once with Presidio's batch analyzer over nlp.pipe.
+
+        Returns one {'text', 'entities'} dict per segment, in order. Each entity has
+        its entity_type and the start/end of its placeholder in the anonymized text.
+        Segments the PII prefilter rules out are returned unchanged without analysis;
+        when the texts are already cleaned, pass the prefilter's verdicts on the
+        originals as pii_candidates.
+        """
+        if self.analyzer is None:
+            raise ConfigurationError("Anonymization is disabled in the text_cleaning settings", "CLN003")
+        texts = list(texts)
+        if not texts:
+            return []
+
+        # Only segments with candidate patterns go through Presidio
+        candidates = [
+            i for i, text in enumerate(texts)
+            if self.pii_prefilter.needs_analysis(text, candidate=pii_candidates[i] if pii_candidates else None)
+        ]
+        results_batch = [[] for _ in texts]
+        if candidates:
+            analyzed = self.batch_analyzer.analyze_iterator(
+                [texts[i] for i in candidates],
+                language='en',
+                entities=self.pii_entities,
+                batch_size=batch_size or self.settings.get('batch_size', 256),
+                n_process=n_process or self.settings.get('n_process', 1)
+            )
+            for i, analyzer_results in zip(candidates, analyzed):
+                results_batch[i] = analyzer_results
+
+        anonymized = []
+        for text, analyzer_results in zip(texts, results_batch):
+            if not analyzer_results:
+                anonymized.append({'text': text, 'entities': []})
+                continue
+            engine_result = self.anonymizer.anonymize(text=text, analyzer_results=analyzer_results)
+            anonymized.append({
+                'text': engine_result.text,
+                'entities': [
+                    {'entity_type': item.entity_type, 'start': item.start, 'end': item.end}
+                    for item in sorted(engine_result.items, key=lambda item: item.start)
+                ]
+            })
+        return anonymized
+
     def clean_transcript(self, transcript: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Clean a full transcript while preserving structure."""
+        return self.clean_transcripts([transcript])[0]
+
+    def clean_transcripts(self, transcripts: List[List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+        """Clean several transcripts in one batch while preserving their structure."""
         try:
-            cleaned_transcript = []
-            for entry in transcript:
-                cleaned_entry = entry.copy()
-                if 'text' in entry:
-                    cleaned_entry['text'] = self.clean_text(entry['text'])
-                cleaned_transcript.append(cleaned_entry)
-            return cleaned_transcript
+            entries = [entry for transcript in transcripts for entry in transcript if 'text' in entry]
+            cleaned_texts = iter(self.clean_batch(entry['text'] for entry in entries))
+
+            cleaned_transcripts = []
+            for transcript in transcripts:
+                cleaned_transcript = []
+                for entry in transcript:
+                    cleaned_entry = entry.copy()
+                    if 'text' in entry:
+                        cleaned_entry['text'] = next(cleaned_texts)
+                    cleaned_transcript.append(cleaned_entry)
+                cleaned_transcripts.append(cleaned_transcript)
+            return cleaned_transcripts
         except Exception as e:
             logger.error(f"Error cleaning transcript: {str(e)}")
-            return transcript
+            return transcripts
+
+    def clean_windows(
+        self,
+        segments: Iterable[Union[TranscriptSegment, Dict[str, Any]]],
+        **overrides: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge adjacent segments into windows and clean each window as a unit.
+
+        Window limits come from the cleaning config's windows section, overridable
+        per call. Returns one entry per window with its cleaned text, start and duration.
+        """
+        window_settings = {**self.window_settings, **overrides}
+        windows = merge_segments(
+            segments,
+            max_duration=window_settings.get('max_duration', 30.0),
+            max_gap=window_settings.get('max_gap', 2.0),
+            max_chars=window_settings.get('max_chars', 500),
+            boundary=window_settings.get('boundary', 'sentence'),
+            min_chars=window_settings.get('min_chars', 80)
+        )
+        cleaned_texts = self.clean_batch([window.text for window in windows])
+        return [window.to_dict(cleaned) for window, cleaned in zip(windows, cleaned_texts)]
+
+    @property
+    def window_settings(self) -> Dict[str, Any]:
+        """Segment window settings from the cleaning config."""
+        return self.config.get('windows', {})
 
     @property
     def artifacts(self) -> List[str]:
@@ -113,55 +390,146 @@ class TranscriptCleaner:
         return self.settings['word_fixes']
 
     @property
-    def interjections(self) -> Set[str]:
-        """Lazy load interjections from settings."""
-        return set(self.settings['interjections'])
+    def interjections(self) -> FrozenSet[str]:
+        """Interjections from the compiled cleaning plan."""
+        return self.plan.interjections
+
+    def reload_settings(self) -> bool:
+        """
+        Re-read the cleaning config and rebuild everything derived from it if it changed:
+        the cleaning plan, pipeline profile, spaCy and Presidio models and memo fingerprint.
+        Returns whether anything was replaced.
+        """
+        config_manager = ConfigManager()
+        config = config_manager.read_config('cleaning')
+        if settings_fingerprint(config) == settings_fingerprint(self.config):
+            return False
+        validate_settings(config.get('text_cleaning', {}), {
+            'remove': list,
+            'preserve': list,
+            'normalize': list
+        })
+
+        # Verify and load the new models before publishing the config, so a bad one
+        # leaves both the cleaner and the process-wide config as they were
+        warm_start(config)
+        config_manager.update_config('cleaning', config)
+        self.config = config
+        self.settings = config.get('text_cleaning', {})
+        self.plan = build_cleaning_plan(self.settings, self.stop_words)
+        self._load_models()
+        self.nlp_engine = NLPEngine(self.pipeline_profile.model_name)
+        self.pii_prefilter.enabled = self.settings.get('pii_prefilter', True)
+        self.memo_fingerprint = self._cleaning_fingerprint()
+        logger.info(
+            f"Reloaded cleaning config: plan {self.plan.fingerprint[:12]}, model {self.pipeline_profile.model_name}"
+        )
+        return True
+
+    def _cleaning_fingerprint(self) -> str:
+        """Fingerprint of everything that determines cleaned output: the plan, PII settings and model."""
+        return settings_fingerprint({
+            'plan': self.plan.fingerprint,
+            'pii': self.config.get('pii', {}),
+            'model': self.pipeline_profile.model_name
+        })
+
+    def _memo_key(self, text: str) -> str:
+        return self.memo.make_key(self.memo_fingerprint, text)
+
+    def memo_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics of the segment memo."""
+        return self.memo.stats() if self.memo else {}
+
+    def close(self) -> None:
+        """Close the segment memo's Redis connection. Safe to call more than once."""
+        if self.memo is not None:
+            self.memo.close()
+            self.memo = None
 
     def _remove_urls(self, text: str) -> str:
         """Remove URLs from text."""
-        return re.sub(r'http\S+|www.\S+', '', text)
+        return URL_PATTERN.sub('', text)
+
+    def _doc_entities(self, doc, pii_candidate: bool) -> List[RecognizerResult]:
+        """PII spans in a parsed segment, analyzed from its Doc instead of a second parse."""
+        if not self.plan.anonymize or not self.pii_prefilter.needs_analysis(doc.text, doc, pii_candidate):
+            return []
+        nlp_artifacts = doc_nlp_artifacts(doc, self.analyzer.nlp_engine)
+        return _resolve_entities(self.analyzer.analyze(
+            text=doc.text,
+            language='en',
+            entities=self.pii_entities,
+            nlp_artifacts=nlp_artifacts
+        ))
 
-    def _anonymize_text(self, text: str) -> str:
+    def _anonymize_text(self, text: str, pii_candidate: Optional[bool] = None) -> str:
         """Remove personal information."""
-        analyzer_results = [RecognizerResult(start=r.start, end=r.end, score=r.score, entity_type=r.entity_type) 
-                          for r in self.analyzer.analyze(text=text, language='en')]
+        if not self.pii_prefilter.needs_analysis(text, candidate=pii_candidate):
+            return text
+        analyzer_results = self.analyzer.analyze(text=text, language='en', entities=self.pii_entities)
         return self.anonymizer.anonymize(text=text, analyzer_results=analyzer_results).text
 
+    def _prepare_text(self, text: str) -> str:
+        """Basic cleaning followed by stopword removal when configured."""
+        return self.plan.drop_stop_words(self._basic_clean(text))
+
     def _basic_clean(self, text: str) -> str:
         """Basic text cleaning while preserving content."""
         try:
-            # Apply cleaning based on settings
-            if self.settings.get('lowercase', True):
-                text = text.lower()
-
-            # Remove specified elements
-            for item in self.settings.get('remove', []):
-                if item == 'special_characters':
-                    text = re.sub(r'[^\w\s]', '', text)
-                elif item == 'extra_whitespace':
-                    text = ' '.join(text.split())
-                elif item == 'urls':
-                    text = re.sub(r'http\S+|www.\S+', '', text)
-                elif item == 'emojis':
-                    text = text.encode('ascii', 'ignore').decode('ascii')
-
-            return text.strip()
+            return self.plan.basic_clean(text)
         except Exception as e:
             logger.error(f"Error in basic cleaning: {str(e)}")
             return text
 
-    def _process_with_spacy(self, text: str) -> str:
+    def _process_text(self, text: str, pii_candidate: bool) -> str:
+        """NLP and anonymization stages for one prepared text, given the prefilter's verdict on the original."""
+        if self.plan.use_nlp:
+            text = self._process_with_spacy(text, pii_candidate)
+        elif self.plan.anonymize:
+            text = self._anonymize_text(text, pii_candidate)
+        return text.strip()
+
+    def _process_with_spacy(self, text: str, pii_candidate: bool) -> str:
         """
         Process text while preserving natural language structure.
         Maintains contractions, possessives, pronouns, and proper sentence structure.
         """
         try:
-            doc = self.nlp(text)
+            doc = self.nlp(text, disable=list(self.pipeline_profile.disable))
+        except Exception as e:
+            logger.error(f"Error in _process_with_spacy: {str(e)}")
+            return self._anonymize_text(text, pii_candidate) if self.plan.anonymize else text
+        return self._render_doc(doc, self._doc_entities(doc, pii_candidate))
+
+    def _render_doc(self, doc, entities: Sequence[RecognizerResult] = ()) -> str:
+        """
+        Rebuild cleaned text from a parsed spaCy Doc.
+        Tokens inside a PII span are replaced by one <ENTITY_TYPE> placeholder per span.
+        """
+        try:
             words = []
+            placeholders = []
+            previous_entity = None
+            interjections = self.plan.interjections
+            perform_lemmatization = self.plan.perform_lemmatization
             
             for token in doc:
+                # Replace PII spans; placeholders are restored after capitalization
+                entity = next(
+                    (e for e in entities if e.start < token.idx + len(token.text) and token.idx < e.end),
+                    None
+                )
+                if entity is not None:
+                    if entity is not previous_entity:
+                        words.append(f"\x00{len(placeholders)}\x00")
+                        placeholders.append(f"<{entity.entity_type}>")
+                    previous_entity = entity
+                    continue
+                previous_entity = None
+
                 # Skip only obvious noise
-                if (token.text.lower() in self.interjections or
+                if (token.text.lower() in interjections or
                     (len(token.text) == 1 and not token.text.lower() in {'a', 'i'})):
                     continue
                     
@@ -173,7 +541,7 @@ class TranscriptCleaner:
                     continue
                 
                 # Handle lemmatization smartly
-                if self.settings['perform_lemmatization']:
+                if perform_lemmatization:
                     # Don't lemmatize certain parts of speech
                     if token.pos_ in {'AUX', 'VERB'}:
                         # Preserve tense and form
@@ -185,17 +553,18 @@ class TranscriptCleaner:
             
             # Join words and fix spacing around punctuation
             text = ' '.join(words)
-            text = re.sub(r'\s+([.,!?;:])', r'\1', text)  # Remove space before punctuation
-            text = re.sub(r'([.,!?;:])(\w)', r'\1 \2', text)  # Add space after punctuation
+            text = SPACE_BEFORE_PUNCTUATION_PATTERN.sub(r'\1', text)  # Remove space before punctuation
+            text = MISSING_SPACE_AFTER_PUNCTUATION_PATTERN.sub(r'\1 \2', text)  # Add space after punctuation
             
             # Capitalize first letter of sentences
             text = '. '.join(s.capitalize() for s in text.split('. '))
+            text = PLACEHOLDER_PATTERN.sub(lambda m: placeholders[int(m.group(1))], text)
             
             return text.strip()
             
         except Exception as e:
-            logger.error(f"Error in _process_with_spacy: {str(e)}")
-            return text
+            logger.error(f"Error in _render_doc: {str(e)}")
+            return self._anonymize_text(doc.text, True) if entities else doc.text
 
     def _should_skip_token(self, token) -> bool:
         """Determine if a token should be skipped based on settings."""
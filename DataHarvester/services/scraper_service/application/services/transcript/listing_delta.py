@@ -0,0 +1,44 @@
+# Software/DataHarvester/services/scraper_service/application/services/transcript/listing_delta.py
+
+from typing import Iterable, List, Optional, Set, Tuple
+
+VIDEO_URL_TEMPLATE = 'https://www.youtube.com/watch?v={}'
+
+def select_listing_delta(
+    videos: Iterable[Tuple[str, str]],
+    head: Optional[str],
+    known: Set[str],
+    pending: Set[str],
+    newest_first: bool,
+    stop_after_known: int
+) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """
+    Return (new_videos, listing_head) from a lazily paged listing of (video_url, video_id).
+    New videos keep their (video_url, video_id) pairs, so callers never parse URLs again.
+
+    A newest-first walk stops at the previous head, or after a run of known videos
+    if the head was removed. Pending videos (ones that failed on an earlier run) are
+    always offered again, including those beyond where the walk stopped. Repeated
+    videos are offered once.
+    """
+    new_videos = []
+    seen = set()
+    listing_head = None
+    known_run = 0
+
+    for video_url, video_id in videos:
+        if listing_head is None:
+            listing_head = video_id
+        if video_id in seen:
+            continue
+        seen.add(video_id)
+        if video_id not in known:
+            known_run = 0
+            new_videos.append((video_url, video_id))
+            continue
+        known_run += 1
+        if newest_first and (video_id == head or known_run >= stop_after_known):
+            break
+
+    new_videos.extend((VIDEO_URL_TEMPLATE.format(video_id), video_id) for video_id in sorted(pending - seen - known))
+    return new_videos, listing_head
@@ -0,0 +1,93 @@
+# Software/DataHarvester/services/scraper_service/application/services/transcript/segment_windows.py
+
+import re
+from typing import Any, Dict, Iterable, List, Union
+
+from pydantic import BaseModel
+from domain.models.transcript import TranscriptSegment
+
+# A segment ending in sentence punctuation (optionally followed by a closing quote or bracket)
+SENTENCE_END_PATTERN = re.compile(r'[.!?]["\')\]]*$')
+
+class SegmentWindow(BaseModel):
+    """Adjacent caption segments merged into one unit of text for cleaning."""
+    text: str
+    start: float
+    duration: float
+    first_segment: int
+    segment_count: int
+
+    def to_dict(self, text: str = None) -> Dict[str, Any]:
+        """Transcript entry for the window, optionally with cleaned text."""
+        return {
+            'text': self.text if text is None else text,
+            'start': self.start,
+            'duration': self.duration
+        }
+
+def _as_segment(segment: Union[TranscriptSegment, Dict[str, Any]]) -> TranscriptSegment:
+    return segment if isinstance(segment, TranscriptSegment) else TranscriptSegment(**segment)
+
+def merge_segments(
+    segments: Iterable[Union[TranscriptSegment, Dict[str, Any]]],
+    max_duration: float = 30.0,
+    max_gap: float = 2.0,
+    max_chars: int = 500,
+    boundary: str = 'sentence',
+    min_chars: int = 80
+) -> List[SegmentWindow]:
+    """
+    Group adjacent segments into windows.
+
+    A window always closes before a segment that follows a pause longer than
+    max_gap seconds or would push it past max_duration seconds or max_chars
+    characters. With boundary='sentence' it also closes after a segment ending a
+    sentence once it holds min_chars characters; boundary='time' ignores sentences.
+    Each window spans from its first segment's start to its last segment's end.
+    """
+    if boundary not in ('sentence', 'time'):
+        raise ValueError(f"Unknown window boundary: {boundary}")
+
+    windows: List[SegmentWindow] = []
+    texts: List[str] = []
+    start = end = 0.0
+    first = chars = 0
+
+    def close():
+        nonlocal chars
+        if texts:
+            windows.append(SegmentWindow(
+                text=' '.join(t for t in texts if t),
+                start=start,
+                duration=round(end - start, 3),
+                first_segment=first,
+                segment_count=len(texts)
+            ))
+            texts.clear()
+            chars = 0
+
+    for index, segment in enumerate(segments):
+        segment = _as_segment(segment)
+        text = ' '.join(segment.text.split())
+        segment_end = segment.start + segment.duration
+
+        if texts and (
+            segment.start - end > max_gap or
+            segment_end - start > max_duration or
+            chars + len(text) > max_chars
+        ):
+            close()
+
+        if not texts:
+            start = segment.start
+            first = index
+            end = segment_end
+        texts.append(text)
+        chars += len(text) + 1
+        end = max(end, segment_end)
+
+        if boundary == 'sentence' and chars > min_chars and SENTENCE_END_PATTERN.search(text):
+            close()
+
+    close()
+    return windows
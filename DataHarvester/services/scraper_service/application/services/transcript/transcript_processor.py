@@ -1,12 +1,17 @@
 # Software/DataHarvester/services/scraper_service/application/services/transcript/transcript_processor.py
-from typing import List, Dict, Any
-from celery import Celery
+import os
+import threading
+import time
+from typing import List, Dict, Any, Optional
+from celery import Celery, chord, group
+from celery.signals import worker_process_init, worker_process_shutdown
 from infrastructure.config.config_manager import ConfigManager
 from infrastructure.logging.logger import get_logger
 from infrastructure.error_handling.middleware.error_middleware import ErrorMiddleware
 from .transcript_service import TranscriptFetcher
 from ..text.text_cleaner_service import TranscriptCleaner
 from infrastructure.redis.producer import ScraperProducer
+from infrastructure.redis.dedup_index import ProcessedVideoIndex
 from domain.models.transcript import ProcessedTranscript as TranscriptModel
 from datetime import datetime, timezone
 
@@ -17,22 +22,111 @@ celery_app = Celery('transcript_tasks',
 
 logger = get_logger()
 
-@celery_app.task(name='transcript.process_video')
-def process_video_task(video_url: str) -> Dict[str, Any]:
+# Schema of worker.store_transcript payloads whose transcripts are {text, start, duration} windows
+WINDOW_PAYLOAD_SCHEMA = 'windows/v1'
+
+# One VideoProcessor per worker process, shared by every task it runs
+_worker_processor: Optional['VideoProcessor'] = None
+_worker_processor_pid: Optional[int] = None
+_worker_processor_lock = threading.Lock()
+
+def get_processor() -> 'VideoProcessor':
+    """This process's VideoProcessor, created on first use (or on worker start-up)."""
+    global _worker_processor, _worker_processor_pid
+    if _worker_processor is None or _worker_processor_pid != os.getpid():
+        with _worker_processor_lock:
+            # A processor inherited across fork holds the parent's connections; build a fresh one
+            if _worker_processor is None or _worker_processor_pid != os.getpid():
+                _worker_processor = VideoProcessor()
+                _worker_processor_pid = os.getpid()
+    return _worker_processor
+
+def close_processor() -> None:
+    """Close this process's VideoProcessor: its Redis connections, the cleaner's memo and local stores."""
+    global _worker_processor, _worker_processor_pid
+    with _worker_processor_lock:
+        if _worker_processor is not None and _worker_processor_pid == os.getpid():
+            _worker_processor.close()
+        _worker_processor = None
+        _worker_processor_pid = None
+
+@worker_process_init.connect
+def init_worker_processor(**kwargs):
+    """Load models and open connections once when a worker process starts."""
+    try:
+        get_processor()
+        logger.info(f"VideoProcessor ready in worker process {os.getpid()}")
+    except Exception as e:
+        # The first task retries construction through get_processor()
+        logger.error(f"Failed to initialize VideoProcessor in worker process: {str(e)}")
+
+@worker_process_shutdown.connect
+def shutdown_worker_processor(**kwargs):
+    """Close the worker's connections and stores on shutdown."""
+    close_processor()
+
+@celery_app.task(name='transcript.process_video', bind=True)
+@ErrorMiddleware.celery_retry()
+def process_video_task(self, video_url: str, force_refresh: bool = False) -> Dict[str, Any]:
     """Process a single video transcript and queue for storage."""
-    processor = VideoProcessor()
-    result = processor.process_single_video(video_url)
+    processor = get_processor()
+    result = processor.process_single_video(video_url, defer_retries=True, force_refresh=force_refresh)
     return result
 
-@celery_app.task(name='transcript.process_batch')
-def process_batch_task(video_urls: List[str]) -> List[Dict[str, Any]]:
-    """Process a batch of video transcripts."""
+@celery_app.task(name='transcript.process_chunk')
+def process_chunk_task(video_urls: List[str], force_refresh: bool = False) -> List[Dict[str, Any]]:
+    """Process a chunk of videos in one task, so the broker carries one message per chunk."""
+    processor = get_processor()
+    max_retries = ConfigManager().get_config('harvesting')['scraping']['max_retries']
     results = []
-    for url in video_urls:
-        result = process_video_task.delay(url)
-        results.append(result)
+    for video_url in video_urls:
+        try:
+            results.append(processor.process_single_video(video_url, defer_retries=True, force_refresh=force_refresh))
+        except Exception as e:
+            if max_retries <= 1:
+                logger.error(f"Error processing video {video_url}: {str(e)}")
+                results.append({'success': False, 'video_url': video_url, 'error': str(e)})
+                continue
+            # Retry only this video, with backoff, instead of holding up the chunk. The chunk's
+            # attempt counts as the first, so process_video_task stops after max_retries attempts in all.
+            ErrorMiddleware.schedule_celery_retry(process_video_task, [video_url], {'force_refresh': force_refresh}, e)
+            results.append({'success': False, 'retrying': True, 'video_url': video_url, 'error': str(e)})
     return results
 
+@celery_app.task(name='transcript.summarize_batch')
+def summarize_batch_task(chunk_results: List[List[Dict[str, Any]]], started_at: float, video_count: int) -> Dict[str, Any]:
+    """Aggregate a batch's chunk results into one summary."""
+    results = [result for chunk in chunk_results for result in chunk]
+    succeeded = [r for r in results if r.get('success') and not r.get('skipped')]
+    wall_time = time.time() - started_at
+    summary = {
+        'videos': video_count,
+        'succeeded': len(succeeded),
+        'skipped': sum(1 for r in results if r.get('skipped')),
+        'retrying': sum(1 for r in results if r.get('retrying')),
+        'failed': sum(1 for r in results if not r.get('success') and not r.get('retrying')),
+        'segments_cleaned': sum(r.get('segment_count', 0) for r in succeeded),
+        'wall_time': round(wall_time, 3),
+        'videos_per_second': round(video_count / wall_time, 3) if wall_time > 0 else None
+    }
+    logger.info(f"Batch complete: {summary}")
+    return summary
+
+def dispatch_batch(video_urls: List[str], chunk_size: int, force_refresh: bool = False) -> Dict[str, Any]:
+    """Fan a batch out as a chord of chunk tasks that ends in a single summary task."""
+    chunks = [video_urls[i:i + chunk_size] for i in range(0, len(video_urls), chunk_size)]
+    if not chunks:
+        return {'batch_id': None, 'videos': 0, 'chunks': 0}
+    header = group(process_chunk_task.s(chunk, force_refresh) for chunk in chunks)
+    result = chord(header)(summarize_batch_task.s(started_at=time.time(), video_count=len(video_urls)))
+    return {'batch_id': result.id, 'videos': len(video_urls), 'chunks': len(chunks)}
+
+@celery_app.task(name='transcript.process_batch')
+def process_batch_task(video_urls: List[str], force_refresh: bool = False) -> Dict[str, Any]:
+    """Process a batch of video transcripts; returns the id of the batch summary result."""
+    chunk_size = ConfigManager().get_config('harvesting').get('batch_size', 10)
+    return dispatch_batch(video_urls, chunk_size, force_refresh)
+
 class VideoProcessor:
     def __init__(self):
         self.config = ConfigManager()
@@ -41,55 +135,127 @@ class VideoProcessor:
         self.extractor = TranscriptFetcher()
         self.cleaner = TranscriptCleaner()
         self.producer = ScraperProducer()
+        self.dedup_index = self._create_dedup_index(self.config.get_config('harvesting')['scraping'].get('dedup', {}))
+        self._closed = False
+
+    @staticmethod
+    def _create_dedup_index(settings: Dict[str, Any]) -> Optional[ProcessedVideoIndex]:
+        """Create the processed-video index unless disabled in the scraping config."""
+        if not settings.get('enabled', True):
+            return None
+        return ProcessedVideoIndex.from_settings(settings)
+
+    def is_processed(self, video_id: str) -> bool:
+        """Whether a video was already fetched, cleaned and queued."""
+        return self.dedup_index is not None and self.dedup_index.contains(video_id)
 
     @ErrorMiddleware.catch_async_errors
-    def process_single_video(self, video_url: str) -> Dict[str, Any]:
-        """Process a single video transcript."""
+    def process_single_video(self, video_url: str, defer_retries: bool = False, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Process a single video transcript.
+
+        Videos already in the dedup index are skipped unless force_refresh is set.
+        With defer_retries the fetch is attempted once and its error is raised,
+        so a Celery task can re-enqueue itself instead of sleeping between attempts.
+        """
+        video_id = None
+        transcripts = None
         try:
             video_id = self.extractor.extract_video_id(video_url)
             if not video_id:
                 logger.error(f"Could not extract video ID from {video_url}")
                 return {'success': False, 'video_url': video_url, 'error': 'Invalid video ID'}
 
-            transcripts = self.extractor.get_transcripts(video_id)
-            if not transcripts:
-                logger.warning(f"No transcripts found for video {video_id}")
-                return {'success': False, 'video_url': video_url, 'error': 'No transcripts found'}
-
-            # Clean transcripts
-            cleaned_transcripts = [
-                self.cleaner.clean_text(transcript['text'])
-                for transcript in transcripts
-            ]
-
-            # Queue for worker processing
-            celery_app.send_task(
-                'worker.store_transcript',
-                args=[{
-                    'video_id': video_id,
-                    'transcripts': cleaned_transcripts,
-                    'processed': False
-                }],
-                queue='storage'
-            )
-            logger.info(f"Successfully queued video {video_id} for storage")
-            return {
-                'success': True,
-                'video_id': video_id,
-                'transcript_count': len(cleaned_transcripts)
-            }
+            if not force_refresh and self.is_processed(video_id):
+                logger.info(f"Skipping already processed video {video_id}")
+                return {'success': True, 'skipped': True, 'video_id': video_id, 'transcript_count': 0}
+
+            if defer_retries:
+                transcripts = self.extractor.fetch_transcripts(video_id)
+            else:
+                transcripts = self.extractor.get_transcripts(video_id)
+            return self.handle_transcripts(video_url, video_id, transcripts)
 
         except Exception as e:
+            if defer_retries and video_id and transcripts is None:
+                # Surface fetch failures so the Celery task can re-enqueue itself
+                raise
             logger.error(f"Error processing video {video_url}: {str(e)}")
             return {'success': False, 'video_url': video_url, 'error': str(e)}
 
+    def handle_transcripts(self, video_url: str, video_id: str, transcripts: List[dict]) -> Dict[str, Any]:
+        """Clean fetched transcripts and queue them for storage."""
+        if not transcripts:
+            logger.warning(f"No transcripts found for video {video_id}")
+            return {'success': False, 'video_url': video_url, 'error': 'No transcripts found'}
+
+        # Clean all segments in one batch, or as merged windows with their timing if enabled.
+        # The default payload keeps its list of cleaned strings; window payloads are marked
+        # with a schema so the storage worker can tell them apart.
+        payload = {'video_id': video_id, 'processed': False}
+        if self.cleaner.window_settings.get('enabled', False):
+            cleaned_transcripts = self.cleaner.clean_windows(transcripts)
+            payload['schema'] = WINDOW_PAYLOAD_SCHEMA
+        else:
+            cleaned_transcripts = self.cleaner.clean_batch(transcript['text'] for transcript in transcripts)
+        payload['transcripts'] = cleaned_transcripts
+
+        # Queue for worker processing
+        celery_app.send_task('worker.store_transcript', args=[payload], queue='storage')
+        logger.info(f"Successfully queued video {video_id} for storage")
+        if self.dedup_index is not None:
+            self.dedup_index.add(video_id)
+        return {
+            'success': True,
+            'video_id': video_id,
+            'transcript_count': len(cleaned_transcripts),
+            'segment_count': len(transcripts)
+        }
+
     @ErrorMiddleware.catch_async_errors
-    def process_batch(self, video_urls: List[str]) -> None:
-        """Process a batch of videos."""
-        for i in range(0, len(video_urls), self.batch_size):
-            batch = video_urls[i:i + self.batch_size]
-            process_batch_task.delay(batch)
-            logger.info(f"Submitted batch {i//self.batch_size + 1} for processing")
+    async def process_videos_concurrently(self, video_urls: List[str], force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Fetch transcripts concurrently and process each video as its fetch completes."""
+        results = []
+        urls_by_id = {}
+        for video_url in video_urls:
+            try:
+                video_id = self.extractor.extract_video_id(video_url)
+            except Exception as e:
+                logger.error(f"Could not extract video ID from {video_url}: {str(e)}")
+                results.append({'success': False, 'video_url': video_url, 'error': 'Invalid video ID'})
+                continue
+            if video_id in urls_by_id:
+                continue
+            if not force_refresh and self.is_processed(video_id):
+                results.append({'success': True, 'skipped': True, 'video_id': video_id, 'transcript_count': 0})
+                continue
+            urls_by_id[video_id] = video_url
+
+        async for video_id, transcripts, error in self.extractor.fetch_transcripts_concurrently(list(urls_by_id)):
+            video_url = urls_by_id[video_id]
+            if error is not None:
+                logger.error(f"Error processing video {video_url}: {str(error)}")
+                results.append({'success': False, 'video_url': video_url, 'error': str(error)})
+                continue
+            try:
+                results.append(self.handle_transcripts(video_url, video_id, transcripts))
+            except Exception as e:
+                logger.error(f"Error processing video {video_url}: {str(e)}")
+                results.append({'success': False, 'video_url': video_url, 'error': str(e)})
+
+        succeeded = sum(1 for result in results if result.get('success'))
+        logger.info(f"Processed {len(results)} videos concurrently ({succeeded} succeeded)")
+        return results
+
+    @ErrorMiddleware.catch_async_errors
+    def process_batch(self, video_urls: List[str], force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Process a batch of videos as a Celery chord of batch_size chunks.
+        Returns the batch_id whose result is the aggregated summary.
+        """
+        batch = dispatch_batch(video_urls, self.batch_size, force_refresh)
+        logger.info(f"Submitted {batch['videos']} videos in {batch['chunks']} chunks (batch {batch['batch_id']})")
+        return batch
 
     def get_video_urls(self) -> List[str]:
         """Get list of video URLs to process."""
@@ -124,12 +290,8 @@ class VideoProcessor:
         
         logger.info(f"Found {len(videos)} videos, {len(playlists)} playlists, and {len(channels)} channels to process")
         
-        # Process in batches
-        batch_size = self.batch_size
-        for i in range(0, len(videos), batch_size):
-            batch = videos[i:i + batch_size]
-            process_batch_task.delay(batch)
-            logger.info(f"Submitted batch {i//batch_size + 1} for processing")
+        # Process as one chunked batch with an aggregated summary
+        return self.process_batch(videos)
 
     def process_video(self, video_url: str) -> bool:
         try:
@@ -226,6 +388,17 @@ class VideoProcessor:
             logger.error(f"Error processing transcript for {video_url}: {str(e)}")
             return False
             
+    def close(self) -> None:
+        """Close Redis connections, the cleaner's memo and the fetcher's local stores. Safe to call more than once."""
+        if getattr(self, '_closed', True):
+            return
+        self._closed = True
+        self.producer.close()
+        if self.dedup_index is not None:
+            self.dedup_index.close()
+        self.cleaner.close()
+        self.extractor.close()
+
     def __del__(self):
         """Cleanup Redis connection"""
-        self.producer.close() 
\ No newline at end of file
+        self.close()
\ No newline at end of file
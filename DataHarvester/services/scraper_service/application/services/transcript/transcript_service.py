@@ -1,12 +1,17 @@
 # Software/DataHarvester/services/scraper_service/application/services/transcript/transcript_fetcher.py
 
-from typing import List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Tuple
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
-from pytube import Playlist
+from pytube import Channel, Playlist
 
+from application.services.transcript.listing_delta import select_listing_delta
+from infrastructure.cache.listing_snapshot import ListingSnapshotStore
+from infrastructure.cache.transcript_cache import TranscriptCache
 from infrastructure.logging.logger import get_logger
 from infrastructure.config.config_manager import ConfigManager
-from infrastructure.error_handling.exceptions.base import ErrorCode, ErrorSeverity
+from infrastructure.error_handling.exceptions.base import ErrorSeverity
 from infrastructure.error_handling.exceptions.specific import ScrapingError
 from infrastructure.error_handling.handlers.error_handler import handle_errors
 from infrastructure.error_handling.middleware.error_middleware import ErrorMiddleware
@@ -19,8 +24,30 @@ class TranscriptFetcher:
         self.preferred_languages = config['scraping']['preferred_languages']
         self.fallback_to_auto_translate = config['scraping']['fallback_to_auto_translate']
         self.include_auto_generated = config['scraping']['include_auto_generated']
+        self.max_concurrent_requests = config['scraping']['max_concurrent_requests']
         self.config = ConfigManager().get_config('harvesting')
         self.transcript_api = YouTubeTranscriptApi()
+        self.cache = self._create_cache(config['scraping'].get('cache', {}))
+
+        snapshot_settings = config['scraping'].get('listing_snapshots', {})
+        self.snapshots = (
+            ListingSnapshotStore(snapshot_settings.get('path', 'data/cache/listings.sqlite3'))
+            if snapshot_settings.get('enabled', True) else None
+        )
+        self.stop_after_known = snapshot_settings.get('stop_after_known', 20)
+        self.playlists_newest_first = snapshot_settings.get('playlists_newest_first', False)
+
+    @staticmethod
+    def _create_cache(settings: dict) -> Optional[TranscriptCache]:
+        """Create the local transcript cache unless disabled in the scraping config."""
+        if not settings.get('enabled', True):
+            return None
+        return TranscriptCache(
+            path=settings.get('path', 'data/cache/transcripts.sqlite3'),
+            ttl_seconds=settings.get('ttl_seconds', 30 * 24 * 3600),
+            listing_ttl_seconds=settings.get('listing_ttl_seconds', 24 * 3600),
+            max_bytes=settings.get('max_bytes', 1024 ** 3)
+        )
 
     @staticmethod
     @handle_errors(
@@ -37,52 +64,122 @@ class TranscriptFetcher:
         raise ValueError(f"Invalid YouTube URL format: {url}")
 
     @ErrorMiddleware.retry()
+    def get_transcripts(self, video_id: str) -> List[dict]:
+        """Extract transcript from a YouTube video, retrying in-process with backoff."""
+        return self.fetch_transcripts(video_id)
+
     @handle_errors(
         (TranscriptsDisabled, NoTranscriptFound, VideoUnavailable),
         context="Transcript Processing",
         severity=ErrorSeverity.ERROR
     )
-    def get_transcripts(self, video_id: str) -> List[dict]:
-        """Extract transcript from a YouTube video."""
+    def fetch_transcripts(self, video_id: str) -> List[dict]:
+        """
+        Extract transcript from a YouTube video in a single attempt, leaving retries to the caller.
+
+        Reads through the local transcript cache: the language listing and the chosen
+        segment list are only requested from YouTube when they are not cached.
+        """
         try:
-            transcript_list = self.transcript_api.list_transcripts(video_id)
-            
+            transcript_list = None
+            languages = self.cache.get_listing(video_id) if self.cache else None
+            if languages is None:
+                transcript_list = self._list_transcripts(video_id)
+                languages = [
+                    {
+                        'language_code': transcript.language_code,
+                        'is_generated': transcript.is_generated,
+                        'is_translatable': transcript.is_translatable
+                    }
+                    for transcript in transcript_list
+                ]
+                if self.cache:
+                    self.cache.put_listing(video_id, languages)
+            available = {entry['language_code'] for entry in languages}
+
             # Try to get preferred language transcript
             for lang in self.preferred_languages:
-                try:
-                    transcript = transcript_list.find_transcript([lang])
-                    return transcript.fetch()
-                except NoTranscriptFound:
+                if lang not in available:
                     continue
+                cached = self.cache.get_segments(video_id, lang, False) if self.cache else None
+                if cached is not None:
+                    return cached
+                transcript_list = transcript_list or self._list_transcripts(video_id)
+                return self._download(video_id, lang, False, transcript_list.find_transcript([lang]))
 
             # Fallback to auto-translated if enabled
             if self.fallback_to_auto_translate:
+                target = self.preferred_languages[0]
+                cached = self.cache.get_segments(video_id, target, True) if self.cache else None
+                if cached is not None:
+                    return cached
+                translatable = [entry['language_code'] for entry in languages if entry['is_translatable']]
+                if translatable:
+                    try:
+                        transcript_list = transcript_list or self._list_transcripts(video_id)
+                        transcript = transcript_list.find_transcript(translatable).translate(target)
+                        return self._download(video_id, target, True, transcript)
+                    except Exception as e:
+                        raise ScrapingError("Failed to get auto-translated transcript", original_error=e)
+
+            raise ScrapingError(f"No transcript found in {self.preferred_languages} for video {video_id}")
+
+        except ScrapingError:
+            raise
+        except Exception as e:
+            raise ScrapingError("Failed to extract transcript", original_error=e)
+
+    @ErrorMiddleware.rate_limit(endpoint="list_transcripts")
+    def _list_transcripts(self, video_id: str):
+        """Request the available transcript listing from YouTube."""
+        return self.transcript_api.list_transcripts(video_id)
+
+    @ErrorMiddleware.rate_limit(endpoint="fetch_transcript")
+    def _download(self, video_id: str, language: str, translated: bool, transcript) -> List[dict]:
+        """Download one transcript's segments and store them in the cache."""
+        fetched = transcript.fetch()
+        segments = fetched.to_raw_data() if hasattr(fetched, 'to_raw_data') else list(fetched)
+        if self.cache:
+            self.cache.put_segments(video_id, language, translated, segments)
+        return segments
+
+    async def fetch_transcripts_concurrently(
+        self,
+        video_ids: List[str],
+        max_concurrent: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Optional[List[dict]], Optional[Exception]]]:
+        """
+        Fetch transcripts for many videos with up to N requests in flight.
+
+        Yields (video_id, transcripts, error) tuples in completion order so callers
+        can process each video as soon as its transcript arrives.
+        """
+        limit = max(1, max_concurrent or self.max_concurrent_requests)
+        semaphore = asyncio.Semaphore(limit)
+        loop = asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="transcript-fetch") as executor:
+            # Backoff waits happen outside the semaphore so a flaky video never holds a fetch slot
+            @ErrorMiddleware.retry_async()
+            async def fetch_with_retry(video_id: str) -> List[dict]:
+                async with semaphore:
+                    return await loop.run_in_executor(executor, self.fetch_transcripts, video_id)
+
+            async def fetch(video_id: str) -> Tuple[str, Optional[List[dict]], Optional[Exception]]:
                 try:
-                    transcript = transcript_list.find_transcript(
-                        self.preferred_languages
-                    ).translate(self.preferred_languages[0])
-                    return transcript.fetch()
+                    return video_id, await fetch_with_retry(video_id), None
                 except Exception as e:
-                    raise ScrapingError(
-                        "Failed to get auto-translated transcript",
-                        ErrorCode.SCRAPING_PARSE_ERROR,
-                        ErrorSeverity.ERROR, # type: ignore
-                        details={"video_id": video_id},
-                        original_error=e
-                    )
-
-            raise NoTranscriptFound(video_id=video_id, requested_language_codes=self.preferred_languages, transcript_data=transcript_list)
-            
-        except Exception as e:
-            raise ScrapingError(
-                "Failed to extract transcript",
-                ErrorCode.SCRAPING_PARSE_ERROR,
-                ErrorSeverity.ERROR, # type: ignore
-                details={"video_id": video_id},
-                original_error=e
-            )
+                    return video_id, None, e
 
-    @ErrorMiddleware.retry()
+            tasks = [asyncio.create_task(fetch(video_id)) for video_id in video_ids]
+            try:
+                for completed in asyncio.as_completed(tasks):
+                    yield await completed
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    @ErrorMiddleware.with_retry_and_rate_limit()
     @handle_errors(Exception, context="Playlist Extraction")
     def get_playlist_video_urls(self, playlist_url: str) -> List[str]:
         """Extract all video URLs from a playlist or channel."""
@@ -96,10 +193,89 @@ class TranscriptFetcher:
             return urls
             
         except Exception as e:
-            raise ScrapingError(
-                "Failed to extract videos from playlist",
-                ErrorCode.SCRAPING_PARSE_ERROR,
-                ErrorSeverity.ERROR, # type: ignore
-                details={"playlist_url": playlist_url},
-                original_error=e
-            ) 
\ No newline at end of file
+            raise ScrapingError("Failed to extract videos from playlist", original_error=e)
+
+    @ErrorMiddleware.with_retry_and_rate_limit()
+    @handle_errors(Exception, context="Playlist Extraction")
+    def get_new_playlist_video_urls(
+        self,
+        playlist_url: str,
+        newest_first: Optional[bool] = None
+    ) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """
+        Return (new_videos, head_video_id) for a playlist since its last committed snapshot,
+        with each new video as a (video_url, video_id) pair.
+
+        Playlists are usually appended to, so by default the whole listing is walked and
+        only the delta returned; set newest_first for playlists that prepend new videos.
+        """
+        try:
+            if newest_first is None:
+                newest_first = self.playlists_newest_first
+            return self._expand_listing(playlist_url, Playlist(playlist_url).video_urls, newest_first)
+        except Exception as e:
+            raise ScrapingError("Failed to extract videos from playlist", original_error=e)
+
+    @ErrorMiddleware.with_retry_and_rate_limit()
+    @handle_errors(Exception, context="Channel Extraction")
+    def get_new_channel_video_urls(self, channel_url: str) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """Return ((video_url, video_id) pairs, head_video_id) for a channel, paging only until known videos are reached."""
+        try:
+            return self._expand_listing(channel_url, Channel(channel_url).video_urls, newest_first=True)
+        except Exception as e:
+            raise ScrapingError("Failed to extract videos from channel", original_error=e)
+
+    def _expand_listing(
+        self,
+        listing_url: str,
+        video_urls: Iterable[str],
+        newest_first: bool
+    ) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """Walk a lazily paged listing and collect videos missing from its snapshot, plus earlier failures."""
+        head, known = self.snapshots.get_snapshot(listing_url) if self.snapshots else (None, set())
+        pending = self.snapshots.get_pending(listing_url) if self.snapshots else set()
+        new_videos, listing_head = select_listing_delta(
+            self._identify_videos(video_urls),
+            head,
+            known,
+            pending,
+            newest_first,
+            self.stop_after_known
+        )
+
+        if not new_videos:
+            logger.info(f"No new videos in listing: {listing_url}")
+        else:
+            logger.info(f"Found {len(new_videos)} new videos in listing: {listing_url}")
+        return new_videos, listing_head
+
+    def _identify_videos(self, video_urls: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """(video_url, video_id) for each listed URL, skipping malformed ones instead of failing the listing."""
+        for video_url in video_urls:
+            try:
+                yield video_url, self.extract_video_id(video_url)
+            except Exception as e:
+                logger.warning(f"Skipping listed video with an unrecognized URL {video_url}: {str(e)}")
+
+    def commit_listing(
+        self,
+        listing_url: str,
+        video_ids: List[str],
+        head_video_id: Optional[str] = None,
+        failed_video_ids: Iterable[str] = ()
+    ) -> None:
+        """
+        Record processed and failed videos in a listing's snapshot.
+
+        Pass head_video_id only once the whole delta succeeded. Failed videos stay
+        pending and are offered again on every run until they succeed.
+        """
+        if self.snapshots:
+            self.snapshots.commit(listing_url, video_ids, head_video_id, failed_video_ids)
+
+    def close(self) -> None:
+        """Close the transcript cache and listing snapshot stores."""
+        if self.cache:
+            self.cache.close()
+        if self.snapshots:
+            self.snapshots.close()
@@ -0,0 +1,141 @@
+# Software/DataHarvester/services/scraper_service/infrastructure/cache/ingestion_manifest.py
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from pydantic import BaseModel
+from .sqlite_store import SQLiteStore
+
+def content_hash(path: Union[str, Path]) -> str:
+    """Streaming digest of a file's bytes."""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+class ManifestDiff(BaseModel):
+    """Files under a source root relative to the last ingestion, by root-relative path."""
+    new: List[str] = []
+    changed: List[str] = []
+    unchanged: List[str] = []
+    deleted: Dict[str, List[str]] = {}
+
+    @property
+    def pending(self) -> List[str]:
+        """Paths that need ingesting."""
+        return self.new + self.changed
+
+class IngestionManifest(SQLiteStore):
+    """
+    Manifest of ingested local files, for incremental re-ingestion.
+
+    Each file is recorded with its size, mtime and content hash, and the document IDs
+    it produced. A file whose size and mtime are unchanged is not read again; one whose
+    stat changed is hashed, and only a different hash marks it changed.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS ingested_files (
+            source TEXT NOT NULL,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            document_ids TEXT NOT NULL,
+            ingested_at REAL NOT NULL,
+            PRIMARY KEY (source, path)
+        );
+    """
+
+    def __init__(self, path: Union[str, Path] = "data/cache/ingestion_manifest.sqlite3"):
+        super().__init__(path)
+
+    @staticmethod
+    def _source(root: Union[str, Path]) -> str:
+        return Path(root).resolve().as_posix()
+
+    @staticmethod
+    def _relative(root: Union[str, Path], path: Union[str, Path]) -> str:
+        path = Path(path)
+        try:
+            return path.relative_to(root).as_posix()
+        except ValueError:
+            # Already relative to root
+            return path.as_posix()
+
+    def diff(self, root: Union[str, Path], paths: Iterable[Union[str, Path]]) -> ManifestDiff:
+        """Compare the files currently under root with the manifest."""
+        with self._lock:
+            recorded = {
+                path: (size, mtime_ns, digest, document_ids)
+                for path, size, mtime_ns, digest, document_ids in self._conn.execute(
+                    "SELECT path, size, mtime_ns, content_hash, document_ids FROM ingested_files WHERE source = ?",
+                    (self._source(root),)
+                )
+            }
+
+        result = ManifestDiff()
+        touched = []
+        for path in paths:
+            relative = self._relative(root, path)
+            entry = recorded.pop(relative, None)
+            if entry is None:
+                result.new.append(relative)
+                continue
+            stat = os.stat(Path(root) / relative)
+            if (stat.st_size, stat.st_mtime_ns) == entry[:2]:
+                result.unchanged.append(relative)
+            elif stat.st_size == entry[0] and content_hash(Path(root) / relative) == entry[2]:
+                # Touched but identical; remember the new mtime so it is not hashed again
+                result.unchanged.append(relative)
+                touched.append((stat.st_mtime_ns, self._source(root), relative))
+            else:
+                result.changed.append(relative)
+
+        result.deleted = {path: json.loads(entry[3]) for path, entry in recorded.items()}
+        if touched:
+            with self.transaction() as conn:
+                conn.executemany("UPDATE ingested_files SET mtime_ns = ? WHERE source = ? AND path = ?", touched)
+        return result
+
+    def record(self, root: Union[str, Path], documents: Dict[Union[str, Path], List[str]]) -> None:
+        """Record files as ingested, with the document IDs each produced."""
+        rows = []
+        now = time.time()
+        for path, document_ids in documents.items():
+            relative = self._relative(root, path)
+            full_path = Path(root) / relative
+            stat = os.stat(full_path)
+            rows.append((
+                self._source(root), relative, stat.st_size, stat.st_mtime_ns,
+                content_hash(full_path), json.dumps(list(document_ids)), now
+            ))
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ingested_files "
+                "(source, path, size, mtime_ns, content_hash, document_ids, ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def forget(self, root: Union[str, Path], paths: Optional[Iterable[Union[str, Path]]] = None) -> None:
+        """Drop files (or a whole source root) from the manifest."""
+        source = self._source(root)
+        with self.transaction() as conn:
+            if paths is None:
+                conn.execute("DELETE FROM ingested_files WHERE source = ?", (source,))
+            else:
+                conn.executemany(
+                    "DELETE FROM ingested_files WHERE source = ? AND path = ?",
+                    [(source, self._relative(root, path)) for path in paths]
+                )
+
+    def document_ids(self, root: Union[str, Path], path: Union[str, Path]) -> List[str]:
+        """Document IDs recorded for a file; empty if it was never ingested."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT document_ids FROM ingested_files WHERE source = ? AND path = ?",
+                (self._source(root), self._relative(root, path))
+            ).fetchone()
+        return json.loads(row[0]) if row else []
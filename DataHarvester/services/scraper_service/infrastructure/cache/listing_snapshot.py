@@ -0,0 +1,98 @@
+# Software/DataHarvester/services/scraper_service/infrastructure/cache/listing_snapshot.py
+
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Set, Tuple, Union
+
+from .sqlite_store import SQLiteStore
+
+class ListingSnapshotStore(SQLiteStore):
+    """
+    Snapshots of playlist and channel listings for incremental re-crawls.
+
+    Each listing keeps the set of video IDs already handled and a head marker:
+    the newest video ID as of the last fully committed crawl. A newest-first
+    re-crawl can stop paging once it reaches the head marker. Videos that failed
+    are kept as pending until they succeed, so they are offered again even when
+    the re-crawl stops before reaching them.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS listing_snapshots (
+            listing_url TEXT PRIMARY KEY,
+            head_video_id TEXT,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS listing_videos (
+            listing_url TEXT NOT NULL,
+            video_id TEXT NOT NULL,
+            first_seen REAL NOT NULL,
+            PRIMARY KEY (listing_url, video_id)
+        );
+        CREATE TABLE IF NOT EXISTS listing_pending (
+            listing_url TEXT NOT NULL,
+            video_id TEXT NOT NULL,
+            first_failed REAL NOT NULL,
+            PRIMARY KEY (listing_url, video_id)
+        );
+    """
+
+    def __init__(self, path: Union[str, Path] = "data/cache/listings.sqlite3"):
+        super().__init__(path)
+
+    def get_snapshot(self, listing_url: str) -> Tuple[Optional[str], Set[str]]:
+        """Return (head_video_id, known_video_ids) for a listing; (None, empty set) if never crawled."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT head_video_id FROM listing_snapshots WHERE listing_url = ?", (listing_url,)
+            ).fetchone()
+            known = {
+                video_id for (video_id,) in self._conn.execute(
+                    "SELECT video_id FROM listing_videos WHERE listing_url = ?", (listing_url,)
+                )
+            }
+        return (row[0] if row else None), known
+
+    def get_pending(self, listing_url: str) -> Set[str]:
+        """Video IDs of a listing that failed and have not succeeded since."""
+        with self._lock:
+            return {
+                video_id for (video_id,) in self._conn.execute(
+                    "SELECT video_id FROM listing_pending WHERE listing_url = ?", (listing_url,)
+                )
+            }
+
+    def commit(
+        self,
+        listing_url: str,
+        video_ids: Iterable[str],
+        head_video_id: Optional[str] = None,
+        failed_video_ids: Iterable[str] = ()
+    ) -> None:
+        """Record handled and failed video IDs and, when given, advance the head marker."""
+        now = time.time()
+        handled = [(listing_url, video_id) for video_id in video_ids]
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO listing_videos (listing_url, video_id, first_seen) VALUES (?, ?, ?)",
+                [(url, video_id, now) for url, video_id in handled]
+            )
+            conn.executemany("DELETE FROM listing_pending WHERE listing_url = ? AND video_id = ?", handled)
+            conn.executemany(
+                "INSERT OR IGNORE INTO listing_pending (listing_url, video_id, first_failed) VALUES (?, ?, ?)",
+                [(listing_url, video_id, now) for video_id in failed_video_ids]
+            )
+            if head_video_id is not None:
+                conn.execute(
+                    "INSERT INTO listing_snapshots (listing_url, head_video_id, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(listing_url) DO UPDATE SET head_video_id = excluded.head_video_id, "
+                    "updated_at = excluded.updated_at",
+                    (listing_url, head_video_id, now)
+                )
+
+    def reset(self, listing_url: str) -> None:
+        """Forget a listing so the next crawl walks it in full."""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM listing_snapshots WHERE listing_url = ?", (listing_url,))
+            conn.execute("DELETE FROM listing_videos WHERE listing_url = ?", (listing_url,))
+            conn.execute("DELETE FROM listing_pending WHERE listing_url = ?", (listing_url,))
@@ -0,0 +1,152 @@
+# Software/DataHarvester/services/scraper_service/infrastructure/cache/segment_memo.py
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+import redis
+from infrastructure.redis.config import RedisSettings
+
+logger = logging.getLogger(__name__)
+
+class SegmentMemo:
+    """
+    Memo of cleaned segment text, keyed by a hash of the cleaning fingerprint and raw text.
+
+    A bounded in-process LRU answers repeats within a worker; an optional Redis tier
+    shares results across workers. Redis errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        redis_client: Optional[redis.Redis] = None,
+        key_prefix: str = 'scraper:segment_memo',
+        ttl_seconds: Optional[int] = 7 * 24 * 3600
+    ):
+        self.max_entries = max_entries
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'SegmentMemo':
+        """Create a memo, with a Redis tier when backend is 'redis'."""
+        redis_client = None
+        redis_settings = RedisSettings()
+        if settings.get('backend', 'local') == 'redis':
+            redis_client = redis.Redis(
+                host=redis_settings.REDIS_HOST,
+                port=redis_settings.REDIS_PORT,
+                db=redis_settings.REDIS_DB,
+                password=redis_settings.REDIS_PASSWORD,
+                decode_responses=True
+            )
+        return cls(
+            max_entries=settings.get('max_entries', 100_000),
+            redis_client=redis_client,
+            key_prefix=settings.get('key_prefix', f"{redis_settings.REDIS_PREFIX}:segment_memo"),
+            ttl_seconds=settings.get('ttl_seconds', 7 * 24 * 3600)
+        )
+
+    @staticmethod
+    def make_key(fingerprint: str, text: str) -> str:
+        """Memo key for a raw segment under a cleaning configuration."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(fingerprint.encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Cleaned text for the keys that are memoized, local tier first."""
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                    self.local_hits += 1
+                else:
+                    missing.append(key)
+
+        if missing and self.redis_client is not None:
+            try:
+                values = self.redis_client.mget([f"{self.key_prefix}:{key}" for key in missing])
+                shared = {key: value for key, value in zip(missing, values) if value is not None}
+            except Exception as e:
+                logger.warning(f"Segment memo lookup failed: {str(e)}")
+                shared = {}
+            if shared:
+                self._store_local(shared)
+                found.update(shared)
+                missing = [key for key in missing if key not in shared]
+                with self._lock:
+                    self.shared_hits += len(shared)
+
+        with self._lock:
+            self.misses += len(missing)
+        return found
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, entries: Dict[str, str]) -> None:
+        """Memoize cleaned text in both tiers."""
+        if not entries:
+            return
+        self._store_local(entries)
+        if self.redis_client is not None:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, value in entries.items():
+                    pipe.set(f"{self.key_prefix}:{key}", value, ex=self.ttl_seconds)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Segment memo write failed: {str(e)}")
+
+    def put(self, key: str, value: str) -> None:
+        self.put_many({key: value})
+
+    def _store_local(self, entries: Dict[str, str]) -> None:
+        with self._lock:
+            for key, value in entries.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered by either tier."""
+        lookups = self.local_hits + self.shared_hits + self.misses
+        return (self.local_hits + self.shared_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Memo counters and size."""
+        return {
+            'entries': len(self._entries),
+            'local_hits': self.local_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate
+        }
+
+    def clear(self) -> None:
+        """Drop the local tier and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.local_hits = self.shared_hits = self.misses = 0
+
+    def close(self):
+        """Close Redis connection"""
+        if self.redis_client is not None:
+            self.redis_client.close()
@@ -0,0 +1,168 @@
+# Software/DataHarvester/services/scraper_service/infrastructure/cache/transcript_cache.py
+
+import hashlib
+import json
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from infrastructure.logging.logger import get_logger
+from .sqlite_store import SQLiteStore
+
+logger = get_logger()
+
+# Least recently read entries considered per eviction query
+EVICTION_BATCH = 64
+
+class TranscriptCache(SQLiteStore):
+    """
+    On-disk read-through cache for fetched transcripts.
+
+    Segment lists are stored zlib-compressed under a content address derived from
+    (video_id, language, translated). Entries expire after `ttl_seconds`, and the
+    least recently read entries are evicted once the store grows past `max_bytes`.
+    The stored size is kept in a one-row table by triggers, so a put never sums
+    the whole table. Available-language listings are cached separately with their
+    own TTL.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS transcripts (
+            key TEXT PRIMARY KEY,
+            video_id TEXT NOT NULL,
+            language TEXT NOT NULL,
+            translated INTEGER NOT NULL,
+            payload BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_transcripts_accessed_at ON transcripts (accessed_at);
+        CREATE TABLE IF NOT EXISTS transcript_listings (
+            video_id TEXT PRIMARY KEY,
+            payload BLOB NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS transcripts_size (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            bytes INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO transcripts_size (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM transcripts;
+        CREATE TRIGGER IF NOT EXISTS transcripts_size_insert AFTER INSERT ON transcripts BEGIN
+            UPDATE transcripts_size SET bytes = bytes + NEW.size WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS transcripts_size_update AFTER UPDATE OF size ON transcripts BEGIN
+            UPDATE transcripts_size SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS transcripts_size_delete AFTER DELETE ON transcripts BEGIN
+            UPDATE transcripts_size SET bytes = bytes - OLD.size WHERE id = 0;
+        END;
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "data/cache/transcripts.sqlite3",
+        ttl_seconds: float = 30 * 24 * 3600,
+        listing_ttl_seconds: float = 24 * 3600,
+        max_bytes: int = 1024 ** 3
+    ):
+        super().__init__(path)
+        self.ttl_seconds = ttl_seconds
+        self.listing_ttl_seconds = listing_ttl_seconds
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(video_id: str, language: str, translated: bool) -> str:
+        """Content address for one transcript variant."""
+        return hashlib.sha256(f"{video_id}\x1f{language}\x1f{int(translated)}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decode(payload: bytes) -> Any:
+        return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+    def get_segments(self, video_id: str, language: str, translated: bool = False) -> Optional[List[dict]]:
+        """Return cached segments, or None on a miss or an expired entry."""
+        key = self.make_key(video_id, language, translated)
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute("SELECT payload, created_at FROM transcripts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE transcripts SET accessed_at = ? WHERE key = ?", (now, key))
+        return self._decode(row[0])
+
+    def put_segments(self, video_id: str, language: str, translated: bool, segments: List[dict]) -> None:
+        """Store segments and evict least recently used entries beyond the size budget."""
+        key = self.make_key(video_id, language, translated)
+        payload = self._encode(segments)
+        now = time.time()
+        with self.transaction() as conn:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete skips the size triggers
+            conn.execute(
+                "INSERT INTO transcripts "
+                "(key, video_id, language, translated, payload, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET payload = excluded.payload, size = excluded.size, "
+                "created_at = excluded.created_at, accessed_at = excluded.accessed_at",
+                (key, video_id, language, int(translated), payload, len(payload), now, now)
+            )
+            self._evict(conn)
+
+    @staticmethod
+    def _stored_bytes(conn) -> int:
+        return conn.execute("SELECT bytes FROM transcripts_size WHERE id = 0").fetchone()[0]
+
+    def _evict(self, conn) -> None:
+        total = self._stored_bytes(conn)
+        evicted = 0
+        while total > self.max_bytes:
+            oldest = conn.execute(
+                "SELECT key, size FROM transcripts ORDER BY accessed_at ASC LIMIT ?", (EVICTION_BATCH,)
+            ).fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+        if evicted:
+            logger.info(f"Evicted {evicted} transcript cache entries to stay within {self.max_bytes} bytes")
+
+    def get_listing(self, video_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached available-language listing for a video."""
+        with self.transaction() as conn:
+            row = conn.execute(
+                "SELECT payload, created_at FROM transcript_listings WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[1] > self.listing_ttl_seconds:
+                conn.execute("DELETE FROM transcript_listings WHERE video_id = ?", (video_id,))
+                return None
+        return self._decode(row[0])
+
+    def put_listing(self, video_id: str, languages: List[Dict[str, Any]]) -> None:
+        """Store the available-language listing for a video."""
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO transcript_listings (video_id, payload, created_at) VALUES (?, ?, ?)",
+                (video_id, self._encode(languages), time.time())
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Entry counts and stored bytes."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+            size = self._stored_bytes(self._conn)
+            listings = self._conn.execute("SELECT COUNT(*) FROM transcript_listings").fetchone()[0]
+        return {"entries": entries, "bytes": size, "listings": listings}
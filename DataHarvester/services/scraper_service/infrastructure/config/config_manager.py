@@ -12,6 +12,13 @@ logger = get_logger()
 
 class ConfigManager:
     _instance = None
+    _config_dir = Path("/app/config")
+    _config_files = {
+        'database': 'database.yaml',
+        'cleaning': 'cleaning.yaml',
+        'harvesting': 'harvesting.yaml',
+        'sources': 'sources.yaml'
+    }
     _validators = {
         'database': DatabaseValidator(),
         'harvesting': ScrapingValidator()
@@ -31,26 +38,23 @@ class ConfigManager:
         
     def _load_configs(self):
         """Load all configuration files."""
-        config_dir = Path("/app/config")
-        config_files = {
-            'database': 'database.yaml',
-            'cleaning': 'cleaning.yaml',
-            'harvesting': 'harvesting.yaml',
-            'sources': 'sources.yaml'
-        }
-        
-        for config_type, filename in config_files.items():
-            file_path = config_dir / filename
-            try:
-                with open(file_path, 'r') as f:
-                    self.configs[config_type] = yaml.safe_load(f)
-                logger.info(f"Loaded configuration: {config_type}")
-            except Exception as e:
-                logger.error(f"Failed to load {config_type} configuration: {str(e)}")
-                raise ConfigurationError(
-                    f"Failed to load configuration file {filename}",
-                    "CFG001"
-                )
+        for config_type in self._config_files:
+            self.configs[config_type] = self._read_config(config_type)
+
+    def _read_config(self, config_type: str) -> Dict[str, Any]:
+        """Read one configuration file from disk."""
+        filename = self._config_files[config_type]
+        try:
+            with open(self._config_dir / filename, 'r') as f:
+                config = yaml.safe_load(f)
+            logger.info(f"Loaded configuration: {config_type}")
+            return config
+        except Exception as e:
+            logger.error(f"Failed to load {config_type} configuration: {str(e)}")
+            raise ConfigurationError(
+                f"Failed to load configuration file {filename}",
+                "CFG001"
+            )
             
     def validate_configs(self):
         """Validate loaded configurations."""
@@ -69,6 +73,36 @@ class ConfigManager:
                     "CFG004"
                 )
             
+    def read_config(self, config_type: str) -> Dict[str, Any]:
+        """
+        Read and validate one configuration file from disk without caching it.
+
+        Pair with update_config once everything depending on the new config has
+        been checked, so a rejected config never reaches other get_config callers.
+        """
+        config_type = self._resolve_type(config_type)
+        config = self._read_config(config_type)
+        if config_type in self._validators:
+            try:
+                self._validators[config_type].validate(config)
+            except Exception as e:
+                raise ConfigurationError(
+                    f"Configuration validation failed for {config_type}: {str(e)}",
+                    "CFG004"
+                )
+        return config
+
+    def update_config(self, config_type: str, config: Dict[str, Any]) -> None:
+        """Replace the cached config. Callers holding the previous dict keep it."""
+        self.configs[self._resolve_type(config_type)] = config
+
+    def _resolve_type(self, config_type: str) -> str:
+        if config_type == 'scraping':
+            config_type = 'harvesting'
+        if config_type not in self._config_files:
+            raise ValueError(f"Configuration type not found: {config_type}")
+        return config_type
+
     def get_config(self, config_type: str) -> Dict[str, Any]:
         """Get configuration by type."""
         if config_type == 'scraping':
@@ -85,7 +85,7 @@ class ErrorHandler:
             ErrorSeverity.CRITICAL: logging.CRITICAL
         }[error.severity]
         
-        logger.log(log_level, str(error), extra=error.to_dict())
+        logger.log(log_level, str(error), extra={"error": error.to_dict()})
 
 def handle_errors(error_types: Union[Type[Exception], Tuple[Type[Exception], ...]], 
                  context: Optional[str] = None,
@@ -1,36 +1,58 @@
 # Software/DataHarvester/services/scraper_service/infrastructure/error_handling/middleware/error_middleware.py
 
+import asyncio
 from functools import wraps
+import inspect
+import threading
 import time
 from typing import Callable, Optional, Dict, Any
 from infrastructure.logging.logger import get_logger
 from infrastructure.config.config_manager import ConfigManager
 from infrastructure.error_handling.exceptions.base import BaseError, ErrorSeverity, ErrorCode
-from infrastructure.error_handling.utils.time_utils import get_error_timestamp, format_error_duration
+from infrastructure.error_handling.utils.time_utils import get_error_timestamp, format_error_duration, full_jitter_backoff
 from infrastructure.error_handling.utils.text_utils import format_error_message
 import logging
+import redis
 from infrastructure.error_handling.error_registry import ErrorRegistry
+from infrastructure.rate_limiting.token_bucket import RateLimiter, create_rate_limiter
+from infrastructure.redis.config import RedisSettings
 
 logger = get_logger()
 config = ConfigManager().get_config('harvesting')
 
+# Task header carrying backoff state between Celery re-deliveries
+RETRY_STATE_HEADER = 'retry_state'
+
 class ErrorMiddleware:
     """Centralized error handling and middleware system."""
     
     _error_mappings = ErrorRegistry.get_error_mappings()
 
-    class RateLimiter:
-        def __init__(self):
-            self.last_request_time = 0
-            self.delay = config['scraping']['delay_between_requests']
+    _rate_limiter: Optional[RateLimiter] = None
+    _rate_limiter_lock = threading.Lock()
 
-        def wait(self):
-            """Wait appropriate time between requests."""
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.delay:
-                time.sleep(self.delay - time_since_last)
-            self.last_request_time = time.time()
+    @classmethod
+    def get_rate_limiter(cls) -> RateLimiter:
+        """Get the process-wide rate limiter, shared through Redis when configured."""
+        if cls._rate_limiter is None:
+            with cls._rate_limiter_lock:
+                if cls._rate_limiter is None:
+                    settings = config['scraping'].get('rate_limit', {})
+                    redis_client = None
+                    if settings.get('backend') == 'redis':
+                        redis_settings = RedisSettings()
+                        redis_client = redis.Redis(
+                            host=redis_settings.REDIS_HOST,
+                            port=redis_settings.REDIS_PORT,
+                            db=redis_settings.REDIS_DB,
+                            password=redis_settings.REDIS_PASSWORD
+                        )
+                    cls._rate_limiter = create_rate_limiter(
+                        config['scraping']['delay_between_requests'],
+                        settings,
+                        redis_client
+                    )
+        return cls._rate_limiter
 
     @classmethod
     def handle_error(
@@ -75,18 +97,42 @@ class ErrorMiddleware:
             ErrorSeverity.CRITICAL: logging.CRITICAL
         }[error.severity]
         
-        logger.log(log_level, str(error), extra=error.to_dict())
+        logger.log(log_level, str(error), extra={"error": error.to_dict()})
 
-    @staticmethod
-    def rate_limit(func: Callable) -> Callable:
-        """Decorator to apply rate limiting with error handling."""
-        limiter = ErrorMiddleware.RateLimiter()
-        
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            limiter.wait()
-            return func(*args, **kwargs)
-        return wrapper
+    @classmethod
+    def rate_limit(
+        cls,
+        func: Optional[Callable] = None,
+        *,
+        host: Optional[str] = None,
+        endpoint: Optional[str] = None
+    ) -> Callable:
+        """
+        Decorator to throttle calls through the shared token-bucket limiter.
+
+        Usable bare (`@rate_limit`) or with a host/endpoint (`@rate_limit(endpoint="list_transcripts")`).
+        The endpoint defaults to the wrapped function's name.
+        """
+        def decorator(func: Callable) -> Callable:
+            bucket_host = host or config['scraping'].get('rate_limit', {}).get('default_host', 'www.youtube.com')
+            bucket_endpoint = endpoint or func.__name__
+
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs) -> Any:
+                    await cls.get_rate_limiter().acquire_async(bucket_host, bucket_endpoint)
+                    return await func(*args, **kwargs)
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                cls.get_rate_limiter().acquire(bucket_host, bucket_endpoint)
+                return func(*args, **kwargs)
+            return wrapper
+
+        if func is not None:
+            return decorator(func)
+        return decorator
     
     @classmethod
     def catch_errors(
@@ -198,12 +244,164 @@ class ErrorMiddleware:
         return decorator
 
     @classmethod
-    def with_retry_and_rate_limit(
+    def retry_async(
+        cls,
+        retries: Optional[int] = None,
+        delay: Optional[float] = None,
+        exceptions: tuple = (Exception,),
+        max_delay: int = 300,
+        context: Optional[str] = None
+    ) -> Callable:
+        """Decorator for retrying coroutines with full-jitter backoff, awaiting instead of sleeping."""
+        if retries is None:
+            retries = config['scraping']['max_retries']
+        if delay is None:
+            delay = config['scraping']['retry_delay']
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            async def wrapper(*args, **kwargs) -> Any:
+                for attempt in range(retries):
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        if attempt == retries - 1:
+                            logger.error(
+                                f"Operation failed after {retries} attempts: {str(e)}",
+                                extra={"function": func.__name__, "attempt": attempt + 1}
+                            )
+                            raise cls.handle_error(
+                                error=e,
+                                context=f"{context or func.__name__} (Retry Exhausted)",
+                                details={
+                                    "attempts": retries,
+                                    "last_error": str(e)
+                                }
+                            )
+
+                        wait_time = full_jitter_backoff(attempt, delay, max_delay)
+                        logger.warning(
+                            f"Attempt {attempt + 1}/{retries} failed: {str(e)}, "
+                            f"retrying in {format_error_duration(wait_time)}...",
+                            extra={"function": func.__name__, "attempt": attempt + 1}
+                        )
+                        await asyncio.sleep(wait_time)
+                return None
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def get_retry_state(request: Any) -> Dict[str, Any]:
+        """Read the backoff state carried in a Celery task request's headers."""
+        headers = getattr(request, 'headers', None) or {}
+        state = headers.get(RETRY_STATE_HEADER) or getattr(request, RETRY_STATE_HEADER, None)
+        return dict(state) if isinstance(state, dict) else {}
+
+    @classmethod
+    def celery_retry(
         cls,
         retries: Optional[int] = None,
         delay: Optional[float] = None,
         exceptions: tuple = (Exception,),
+        max_delay: int = 300,
         context: Optional[str] = None
+    ) -> Callable:
+        """
+        Decorator for bound Celery tasks (bind=True) that re-enqueues failures instead of sleeping.
+
+        Failures are retried through task.retry with a full-jitter countdown, so the
+        worker slot is freed at once and Celery tracks the attempt count (including
+        eager mode). The first failure time and last error travel in the task headers.
+        """
+        if retries is None:
+            retries = config['scraping']['max_retries']
+        if delay is None:
+            delay = config['scraping']['retry_delay']
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(task, *args, **kwargs) -> Any:
+                try:
+                    return func(task, *args, **kwargs)
+                except exceptions as e:
+                    state = cls.get_retry_state(task.request)
+                    attempt = task.request.retries or 0
+                    if attempt + 1 >= retries:
+                        logger.error(
+                            f"Task {task.name} failed after {retries} attempts: {str(e)}",
+                            extra={"function": func.__name__, "attempt": attempt + 1}
+                        )
+                        raise cls.handle_error(
+                            error=e,
+                            context=f"{context or func.__name__} (Retry Exhausted)",
+                            details={
+                                "attempts": retries,
+                                "last_error": str(e),
+                                "first_failure": state.get('first_failure')
+                            }
+                        )
+
+                    countdown = full_jitter_backoff(attempt, delay, max_delay)
+                    logger.warning(
+                        f"Task {task.name} attempt {attempt + 1}/{retries} failed: {str(e)}, "
+                        f"retrying in {format_error_duration(countdown)}",
+                        extra={"function": func.__name__, "attempt": attempt + 1}
+                    )
+                    raise task.retry(
+                        exc=e,
+                        countdown=countdown,
+                        max_retries=retries - 1,
+                        headers={RETRY_STATE_HEADER: cls._next_retry_state(state, e)}
+                    )
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _next_retry_state(state: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        return {
+            'first_failure': state.get('first_failure', get_error_timestamp()),
+            'last_error': str(error)
+        }
+
+    @classmethod
+    def schedule_celery_retry(
+        cls,
+        task: Any,
+        args: tuple,
+        kwargs: Dict[str, Any],
+        error: Exception,
+        delay: Optional[float] = None,
+        max_delay: int = 300
+    ) -> float:
+        """
+        Hand a failed attempt made outside `task` to it as its first retry.
+
+        The task is sent with a full-jitter countdown and a retry count of one, so a
+        celery_retry-decorated task counts the failed attempt toward its limit.
+        Returns the countdown.
+        """
+        if delay is None:
+            delay = config['scraping']['retry_delay']
+        countdown = full_jitter_backoff(0, delay, max_delay)
+        task.apply_async(
+            args=args,
+            kwargs=kwargs,
+            countdown=countdown,
+            retries=1,
+            headers={RETRY_STATE_HEADER: cls._next_retry_state({}, error)}
+        )
+        logger.info(f"Task {task.name} re-enqueued with countdown {format_error_duration(countdown)}")
+        return countdown
+
+    @classmethod
+    def with_retry_and_rate_limit(
+        cls,
+        retries: Optional[int] = None,
+        delay: Optional[float] = None,
+        exceptions: tuple = (Exception,),
+        context: Optional[str] = None,
+        host: Optional[str] = None,
+        endpoint: Optional[str] = None
     ) -> Callable:
         """Convenience decorator combining retry and rate limiting."""
         def decorator(func: Callable) -> Callable:
@@ -213,7 +411,7 @@ class ErrorMiddleware:
                 exceptions=exceptions,
                 context=context
             )
-            @cls.rate_limit
+            @cls.rate_limit(host=host, endpoint=endpoint or func.__name__)
             @wraps(func)
             def wrapper(*args, **kwargs) -> Any:
                 return func(*args, **kwargs)
@@ -222,6 +420,17 @@ class ErrorMiddleware:
 
     @staticmethod
     def catch_async_errors(func):
+        if not inspect.iscoroutinefunction(func):
+            @wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    logger.error(f"Error in {func.__name__}: {str(e)}")
+                    raise
+            return sync_wrapper
+
+        @wraps(func)
         async def wrapper(*args, **kwargs):
             try:
                 return await func(*args, **kwargs)
@@ -1,5 +1,6 @@
 # Software/DataHarvester/services/scraper_service/infrastructure/error_handling/utils/time_utils.py
 
+import random
 from datetime import datetime, timezone
 from typing import Union
 
@@ -20,4 +21,8 @@ def format_error_duration(seconds: Union[int, float]) -> str:
     if seconds > 0 or not parts:
         parts.append(f"{seconds}s")
     
-    return " ".join(parts) 
\ No newline at end of file
+    return " ".join(parts)
+
+def full_jitter_backoff(attempt: int, base_delay: Union[int, float], max_delay: Union[int, float]) -> float:
+    """Exponential backoff with full jitter: a random wait between 0 and min(max_delay, base * 2^attempt)."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
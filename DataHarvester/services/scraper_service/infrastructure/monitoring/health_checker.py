@@ -1,20 +1,95 @@
 # Software/DataHarvester/services/scraper_service/infrastructure/monitoring/health_checker.py
 
 import nltk
-from typing import Tuple, List, Dict
+import threading
+import time
+from typing import Tuple, List, Dict, Optional
 import pymongo
 from infrastructure.logging.logger import get_logger
 from infrastructure.config.config_manager import ConfigManager
+from domain.exceptions.domain_exceptions import ProcessingError
 
 logger = get_logger()
 
 class HealthChecker:
     """System health monitoring."""
     
+    # Process-wide cached NLTK health as (ok, missing, checked_at), replaced atomically
+    # so hot paths read it without locks or filesystem access
+    _nltk_state: Optional[Tuple[bool, List[str], float]] = None
+    _monitor_thread: Optional[threading.Thread] = None
+    _monitor_stop: Optional[threading.Event] = None
+    _monitor_lock = threading.Lock()
+    
     def __init__(self):
         self.config = ConfigManager()
         self.db_config = self.config.get_config('database')
         
+    @classmethod
+    def refresh_nltk_state(cls) -> Tuple[bool, List[str]]:
+        """Re-run the NLTK data check and update the cached state."""
+        nltk_ok, missing_data = cls.check_nltk_data()
+        if not nltk_ok:
+            logger.error(f"Missing NLTK data: {', '.join(missing_data)}")
+        cls._nltk_state = (nltk_ok, missing_data, time.time())
+        return nltk_ok, missing_data
+    
+    @classmethod
+    def nltk_state(cls) -> Tuple[bool, List[str]]:
+        """Cached NLTK health; checked synchronously only if never checked in this process."""
+        state = cls._nltk_state
+        if state is None:
+            return cls.refresh_nltk_state()
+        return state[0], state[1]
+    
+    @classmethod
+    def require_nltk_data(cls) -> None:
+        """Raise if the cached state says NLTK data is missing. No I/O once the state exists."""
+        nltk_ok, missing_data = cls.nltk_state()
+        if not nltk_ok:
+            raise ProcessingError(f"Missing NLTK data: {', '.join(missing_data)}", "HLT001")
+    
+    def start_monitoring(self, interval: Optional[float] = None) -> None:
+        """
+        Compute the cached health state now and refresh it from a daemon thread.
+        Idempotent per process; forked workers start their own thread.
+        """
+        if interval is None:
+            interval = self.config.get_config('scraping').get('scraping', {}).get('health_check_interval', 300)
+        
+        cls = type(self)
+        with cls._monitor_lock:
+            if cls._monitor_thread is not None and cls._monitor_thread.is_alive():
+                return
+            cls.refresh_nltk_state()
+            cls._monitor_stop = threading.Event()
+            cls._monitor_thread = threading.Thread(
+                target=cls._monitor,
+                args=(interval, cls._monitor_stop),
+                name='health-monitor',
+                daemon=True
+            )
+            cls._monitor_thread.start()
+            logger.info(f"Health monitoring started (every {interval}s)")
+    
+    @classmethod
+    def stop_monitoring(cls) -> None:
+        """Stop the background refresh thread."""
+        with cls._monitor_lock:
+            if cls._monitor_stop is not None:
+                cls._monitor_stop.set()
+            if cls._monitor_thread is not None and cls._monitor_thread is not threading.current_thread():
+                cls._monitor_thread.join(timeout=5)
+            cls._monitor_thread = None
+    
+    @classmethod
+    def _monitor(cls, interval: float, stop: threading.Event) -> None:
+        while not stop.wait(interval):
+            try:
+                cls.refresh_nltk_state()
+            except Exception as e:
+                logger.error(f"Health state refresh failed: {str(e)}")
+        
     @staticmethod
     def check_nltk_data() -> Tuple[bool, List[str]]:
         """Check if all required NLTK data is available."""
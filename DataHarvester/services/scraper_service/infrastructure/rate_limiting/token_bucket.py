@@ -0,0 +1,166 @@
+# Software/DataHarvester/services/scraper_service/infrastructure/rate_limiting/token_bucket.py
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from infrastructure.logging.logger import get_logger
+
+logger = get_logger()
+
+# Refill and consume atomically on the Redis server so every scraper process shares one budget.
+# Uses the server clock so workers with skewed clocks still agree on the refill rate.
+_REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) * 2 + 1)
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """Thread-safe in-process token bucket."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available. Returns 0 on success, otherwise seconds until they would be."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+
+class RedisTokenBucket:
+    """Token bucket whose state lives in Redis and is shared by every process using the same key."""
+
+    def __init__(self, redis_client: Any, key: str, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.key = key
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self._script = redis_client.register_script(_REDIS_TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available. Returns 0 on success, otherwise seconds until they would be."""
+        return float(self._script(keys=[self.key], args=[self.rate, self.capacity, tokens]))
+
+
+class RateLimiter:
+    """
+    Per-host and per-endpoint token buckets with a blocking and an asyncio API.
+
+    A call is admitted once it holds a token from its host bucket and, when the
+    endpoint has its own limit, from the endpoint bucket as well. Passing a Redis
+    client makes every bucket cluster-wide instead of per-process.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        host_limits: Optional[Dict[str, float]] = None,
+        endpoint_limits: Optional[Dict[str, float]] = None,
+        redis_client: Any = None,
+        key_prefix: str = "scraper:ratelimit"
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.host_limits = dict(host_limits or {})
+        self.endpoint_limits = dict(endpoint_limits or {})
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self._buckets: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, scope: str, name: str, rate: float) -> Any:
+        key = (scope, name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    if self.redis_client is not None:
+                        bucket = RedisTokenBucket(self.redis_client, f"{self.key_prefix}:{scope}:{name}", rate, self.capacity)
+                    else:
+                        bucket = TokenBucket(rate, self.capacity)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def _buckets_for(self, host: str, endpoint: Optional[str]) -> Iterable[Any]:
+        yield self._bucket("host", host, self.host_limits.get(host, self.rate))
+        if endpoint and endpoint in self.endpoint_limits:
+            yield self._bucket("endpoint", endpoint, self.endpoint_limits[endpoint])
+
+    def acquire(self, host: str, endpoint: Optional[str] = None) -> float:
+        """Block until the call is admitted. Returns the total time spent waiting."""
+        waited = 0.0
+        for bucket in self._buckets_for(host, endpoint):
+            while (wait := bucket.try_acquire()) > 0:
+                time.sleep(wait)
+                waited += wait
+        return waited
+
+    async def acquire_async(self, host: str, endpoint: Optional[str] = None) -> float:
+        """Wait without blocking the event loop until the call is admitted."""
+        waited = 0.0
+        for bucket in self._buckets_for(host, endpoint):
+            while (wait := bucket.try_acquire()) > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+        return waited
+
+
+def create_rate_limiter(
+    delay_between_requests: float,
+    settings: Optional[Dict[str, Any]] = None,
+    redis_client: Any = None
+) -> RateLimiter:
+    """
+    Build a RateLimiter from the scraping config.
+
+    `delay_between_requests` sets the default per-host rate; the optional
+    `rate_limit` settings may override it per host or endpoint and raise the burst size.
+    """
+    settings = settings or {}
+    default_rate = settings.get('requests_per_second') or (1.0 / delay_between_requests if delay_between_requests > 0 else 1000.0)
+    use_redis = settings.get('backend', 'local') == 'redis' and redis_client is not None
+    if settings.get('backend') == 'redis' and redis_client is None:
+        logger.warning("Redis rate limiting requested without a Redis client, falling back to per-process buckets")
+
+    return RateLimiter(
+        rate=default_rate,
+        capacity=settings.get('burst', 1),
+        host_limits=settings.get('hosts'),
+        endpoint_limits=settings.get('endpoints'),
+        redis_client=redis_client if use_redis else None,
+        key_prefix=settings.get('key_prefix', "scraper:ratelimit")
+    )
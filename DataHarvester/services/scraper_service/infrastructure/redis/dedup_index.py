@@ -0,0 +1,103 @@
+# Software/DataHarvester/services/scraper_service/infrastructure/redis/dedup_index.py
+
+import hashlib
+import logging
+import math
+from typing import List, Tuple
+
+import redis
+from .config import RedisSettings
+
+logger = logging.getLogger(__name__)
+
+# A Redis string holds at most 512MB, i.e. 2^32 bits
+MAX_BLOOM_BITS = 2 ** 32
+
+def bloom_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """Optimal (bit count, hash count) for a Bloom filter holding `capacity` items at `error_rate`."""
+    num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    num_bits = min(max(num_bits, 8), MAX_BLOOM_BITS)
+    num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+    return num_bits, num_hashes
+
+class ProcessedVideoIndex:
+    """
+    Idempotency index of videos that were already fetched, cleaned and queued.
+
+    'set' mode keeps exact IDs in a Redis set. 'bloom' mode keeps a Bloom filter in a
+    Redis bitmap, bounded to a few bits per ID for tens of millions of videos; a false
+    positive skips a video, which `force_refresh` on the processor can override.
+    """
+
+    MODES = ('set', 'bloom')
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        mode: str = 'set',
+        key: str = 'scraper:processed_videos',
+        capacity: int = 50_000_000,
+        error_rate: float = 0.001
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown dedup index mode: {mode}")
+        self.redis_client = redis_client
+        self.mode = mode
+        self.key = key
+        self.num_bits, self.num_hashes = bloom_parameters(capacity, error_rate)
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> 'ProcessedVideoIndex':
+        """Create an index connected to the service's Redis instance."""
+        redis_settings = RedisSettings()
+        client = redis.Redis(
+            host=redis_settings.REDIS_HOST,
+            port=redis_settings.REDIS_PORT,
+            db=redis_settings.REDIS_DB,
+            password=redis_settings.REDIS_PASSWORD,
+            decode_responses=True
+        )
+        return cls(
+            client,
+            mode=settings.get('mode', 'set'),
+            key=settings.get('key', f"{redis_settings.REDIS_PREFIX}:processed_videos"),
+            capacity=settings.get('capacity', 50_000_000),
+            error_rate=settings.get('error_rate', 0.001)
+        )
+
+    def _bit_positions(self, video_id: str) -> List[int]:
+        """Bloom filter bit offsets for an ID, by double hashing one 128-bit digest."""
+        digest = hashlib.blake2b(video_id.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def contains(self, video_id: str) -> bool:
+        """Whether the video was already processed. Errors are logged and treated as unseen."""
+        try:
+            if self.mode == 'set':
+                return bool(self.redis_client.sismember(self.key, video_id))
+            pipe = self.redis_client.pipeline(transaction=False)
+            for offset in self._bit_positions(video_id):
+                pipe.getbit(self.key, offset)
+            return all(pipe.execute())
+        except Exception as e:
+            logger.warning(f"Dedup index lookup failed for {video_id}: {str(e)}")
+            return False
+
+    def add(self, video_id: str) -> None:
+        """Mark a video as processed."""
+        try:
+            if self.mode == 'set':
+                self.redis_client.sadd(self.key, video_id)
+                return
+            pipe = self.redis_client.pipeline(transaction=False)
+            for offset in self._bit_positions(video_id):
+                pipe.setbit(self.key, offset, 1)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record {video_id} in dedup index: {str(e)}")
+
+    def close(self):
+        """Close Redis connection"""
+        self.redis_client.close()
@@ -3,7 +3,7 @@
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Tuple
 from uuid import uuid4
 
 import redis
@@ -49,6 +49,22 @@ class ScraperProducer:
         except Exception as e:
             logger.error(f"Failed to queue event: {str(e)}")
             return False
+
+    def send_batch_to_queue(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> bool:
+        """Send many (content, metadata) items to the Redis queue in one round trip"""
+        try:
+            events = [json.dumps(self.create_event(content, metadata)) for content, metadata in items]
+            if not events:
+                return True
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.lpush(self.settings.RAW_DATA_QUEUE, *events)
+            pipe.execute()
+            logger.info(f"Successfully queued {len(events)} events")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to queue batch of events: {str(e)}")
+            return False
             
     def close(self):
         """Close Redis connection"""
@@ -1,72 +1,91 @@
 # Software/DataHarvester/services/scraper_service/presentation/cli/cli_handler.py
 
+import asyncio
 import logging
-import yaml
-import time
+from typing import List, Optional, Tuple
 from application.services.transcript.transcript_processor import VideoProcessor
+from application.services.ingestion.subtitle_source import SubtitleIngestor
+from application.services.ingestion.dataset_source import DatasetIngestor, DatasetSource
+from application.services.text.text_cleaner_service import TranscriptCleaner
 from infrastructure.monitoring.health_checker import HealthChecker
 from infrastructure.logging.logger import get_logger
 from infrastructure.config.config_manager import ConfigManager
 
 logger = get_logger()
 
-def load_urls(config_file: str = "config/urls.yaml") -> dict:
-    """Load URLs from configuration file with proper error handling."""
-    default_config = {
-        "urls": {
-            "videos": [],
-            "playlists": [],
-            "channels": []
-        },
-        "config": {
-            "delay_between_videos": 2
-        }
-    }
-    
-    try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-            if not config:
-                return default_config
-            # Ensure all required keys exist
-            config["urls"] = config.get("urls", default_config["urls"])
-            config["config"] = config.get("config", default_config["config"])
-            return config
-    except Exception as e:
-        logger.error(f"Error loading URLs config: {e}")
-        return default_config
+def process_listing_delta(
+    processor: VideoProcessor,
+    listing_url: str,
+    videos: List[Tuple[str, str]],
+    head_video_id: Optional[str]
+) -> None:
+    """Process the new (video_url, video_id) pairs of a playlist or channel and commit them to its snapshot."""
+    if not videos:
+        return
+
+    results = asyncio.run(processor.process_videos_concurrently([video_url for video_url, _ in videos]))
+    processed_ids = {result['video_id'] for result in results if result.get('success')}
+    # Listings can repeat a video; it is processed once, so compare against unique IDs
+    video_ids = {video_id for _, video_id in videos}
+    failed_ids = video_ids - processed_ids
 
-def process_playlist_videos(processor: VideoProcessor, playlist_url: str, delay: int) -> None:
-    """Process all videos in a playlist with error handling."""
+    # Advance the head marker only when the whole delta went through; failures stay pending for the next run
+    processor.extractor.commit_listing(
+        listing_url,
+        sorted(processed_ids),
+        head_video_id if not failed_ids else None,
+        sorted(failed_ids)
+    )
+    logger.info(f"Processed {len(processed_ids)}/{len(video_ids)} new videos from {listing_url}")
+
+def process_playlist_videos(processor: VideoProcessor, playlist_url: str) -> None:
+    """Process the videos added to a playlist since its last crawl."""
     try:
-        video_urls = processor.extractor.get_playlist_video_urls(playlist_url)
-        
-        for video_url in video_urls:
-            try:
-                logger.info(f"Processing video from playlist: {video_url}")
-                processor.process_single_video(video_url)
-                time.sleep(delay)
-            except Exception as e:
-                logger.error(f"Error processing playlist video {video_url}: {str(e)}")
+        videos, head_video_id = processor.extractor.get_new_playlist_video_urls(playlist_url)
+        process_listing_delta(processor, playlist_url, videos, head_video_id)
     except Exception as e:
         logger.error(f"Error processing playlist {playlist_url}: {str(e)}")
 
-def process_channel_videos(processor: VideoProcessor, channel_url: str, delay: int) -> None:
-    """Process all videos in a channel with error handling."""
+def process_channel_videos(processor: VideoProcessor, channel_url: str) -> None:
+    """Process the videos published on a channel since its last crawl."""
     try:
-        channel_playlist_url = f"{channel_url}/videos"
-        video_urls = processor.extractor.get_playlist_video_urls(channel_playlist_url)
-        
-        for video_url in video_urls:
-            try:
-                logger.info(f"Processing video from channel: {video_url}")
-                processor.process_single_video(video_url)
-                time.sleep(delay)
-            except Exception as e:
-                logger.error(f"Error processing channel video {video_url}: {str(e)}")
+        videos, head_video_id = processor.extractor.get_new_channel_video_urls(channel_url)
+        process_listing_delta(processor, channel_url, videos, head_video_id)
     except Exception as e:
         logger.error(f"Error processing channel {channel_url}: {str(e)}")
 
+def ingest_subtitle_archive(root: str, settings: dict) -> None:
+    """Publish the subtitle files under a local directory to the raw data queue."""
+    ingestor = None
+    try:
+        ingestor = SubtitleIngestor.from_settings(settings, root)
+        stats = ingestor.ingest()
+        if stats['failed']:
+            logger.warning(f"{stats['failed']} subtitle files under {root} were not ingested")
+    except Exception as e:
+        logger.error(f"Error ingesting subtitles from {root}: {str(e)}")
+    finally:
+        if ingestor is not None:
+            ingestor.close()
+
+def ingest_datasets(sources: List[dict], settings: dict) -> None:
+    """Publish the rows of JSON and Parquet datasets to the raw data queue."""
+    ingestor = None
+    cleaner = None
+    try:
+        # Cleaning is opt-in per dataset; only load the NLP models when a source asks for it
+        cleaner = TranscriptCleaner() if any(source.get('clean') for source in sources) else None
+        ingestor = DatasetIngestor.from_settings(settings, cleaner=cleaner)
+        for source in sources:
+            ingestor.ingest(DatasetSource(**source))
+    except Exception as e:
+        logger.error(f"Error ingesting datasets: {str(e)}")
+    finally:
+        if ingestor is not None:
+            ingestor.close()
+        if cleaner is not None:
+            cleaner.close()
+
 def setup_logging():
     """Configure logging settings with third-party library adjustments."""
     global logger
@@ -82,26 +101,31 @@ def main():
     try:
         config = ConfigManager()
         sources_config = config.get_config('sources')
-        processing_config = load_urls().get('config', {})
-        delay = processing_config.get('delay_between_videos', 2)
         
         logger.info("Starting system health checks...")
         HealthChecker().check_all()
         
         processor = VideoProcessor()
         
-        # Process individual videos
-        for video_url in sources_config.get('videos', []):
-            processor.process_single_video(video_url)
-            time.sleep(delay)
+        # Process individual videos, fetching up to max_concurrent_requests at a time
+        asyncio.run(processor.process_videos_concurrently(sources_config.get('videos', [])))
         
         # Process playlists
         for playlist_url in sources_config.get('playlists', []):
-            process_playlist_videos(processor, playlist_url, delay)
+            process_playlist_videos(processor, playlist_url)
         
         # Process channels
         for channel_url in sources_config.get('channels', []):
-            process_channel_videos(processor, channel_url, delay)
+            process_channel_videos(processor, channel_url)
+        
+        # Ingest local subtitle archives
+        subtitle_settings = config.get_config('harvesting').get('subtitles', {})
+        for subtitle_root in sources_config.get('subtitle_dirs', []):
+            ingest_subtitle_archive(subtitle_root, subtitle_settings)
+        
+        # Ingest JSON and Parquet datasets
+        if sources_config.get('datasets'):
+            ingest_datasets(sources_config['datasets'], config.get_config('harvesting').get('datasets', {}))
             
     except Exception as e:
         logger.error(f"Application error: {str(e)}")
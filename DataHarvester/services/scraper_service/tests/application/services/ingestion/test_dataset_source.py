@@ -0,0 +1,131 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/ingestion/test_dataset_source.py
+
+# pytest tests/application/services/ingestion/test_dataset_source.py -v
+
+import io
+import json
+import pytest
+from application.services.ingestion import dataset_source
+from application.services.ingestion.dataset_source import (
+    DatasetIngestor,
+    DatasetSource,
+    iter_json_records,
+    iter_parquet_batches,
+    normalize_record
+)
+
+RECORDS = [
+    {"instruction": "Assess waste", "input": "How is waste managed?", "output": "It is sorted.", "score": 2.5e3},
+    {"instruction": "Assess energy", "input": "", "output": "Solar [panels] \"only\"", "score": -1},
+    {"instruction": "Assess water", "input": "Any leaks?", "output": "None.", "score": None},
+]
+
+class FakeProducer:
+    def __init__(self):
+        self.batches = []
+
+    def send_batch_to_queue(self, items):
+        self.batches.append(list(items))
+        return True
+
+    def close(self):
+        pass
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_fallback_decoder_matches_json(chunk_size):
+    """Test that the raw_decode fallback streams arrays and line-delimited values at any chunk size"""
+    array = json.dumps(RECORDS, indent=2)
+    lines = "\n".join(json.dumps(record) for record in RECORDS)
+    assert list(dataset_source._iter_json_fallback(io.StringIO(array), chunk_size)) == RECORDS
+    assert list(dataset_source._iter_json_fallback(io.StringIO(lines), chunk_size)) == RECORDS
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_json_records_stream_from_file(tmp_path, monkeypatch, use_ijson):
+    """Test that JSON arrays and JSON Lines files stream the same records with and without ijson"""
+    if use_ijson and dataset_source.ijson is None:
+        pytest.skip("ijson is not installed")
+    if not use_ijson:
+        monkeypatch.setattr(dataset_source, "ijson", None)
+    (tmp_path / "data.json").write_text(json.dumps(RECORDS))
+    (tmp_path / "data.jsonl").write_text("\n".join(json.dumps(record) for record in RECORDS))
+    assert list(iter_json_records(tmp_path / "data.json")) == RECORDS
+    assert list(iter_json_records(tmp_path / "data.jsonl")) == RECORDS
+
+def test_normalize_record_joins_text_fields():
+    """Test that text fields become content and the rest is kept as metadata"""
+    source = DatasetSource(name="sme", path="data.json", text_fields=["input", "output"])
+    content, metadata = normalize_record(RECORDS[0], source, 7)
+    assert content == "How is waste managed?\n\nIt is sorted."
+    assert metadata["record_id"] == "sme:7"
+    assert metadata["fields"] == {"instruction": "Assess waste", "score": 2.5e3}
+    assert normalize_record({"input": "", "output": None}, source, 8) is None
+
+def test_default_text_fields_skip_id_and_metadata():
+    """Test that without text_fields the id field and metadata fields stay out of the content"""
+    source = DatasetSource(name="sme", path="data.json", id_field="uid", metadata_fields=["lang"])
+    content, metadata = normalize_record({"uid": "a-1", "lang": "en", "title": "Waste", "body": "Sorted."}, source, 0)
+    assert content == "Waste\n\nSorted."
+    assert metadata["text_fields"] == ["title", "body"]
+    assert metadata["record_id"] == "sme:a-1"
+    assert metadata["fields"] == {"uid": "a-1", "lang": "en"}
+
+def test_ingest_publishes_bounded_batches(tmp_path):
+    """Test that JSON rows are filtered, projected and published batch_size at a time"""
+    (tmp_path / "data.json").write_text(json.dumps(RECORDS * 3))
+    ingestor = DatasetIngestor(producer=FakeProducer(), batch_size=4)
+    stats = ingestor.ingest(DatasetSource(
+        name="sme",
+        path=str(tmp_path / "data.json"),
+        columns=["instruction", "output"],
+        filter={"instruction": ["Assess waste", "Assess water"]}
+    ))
+    assert stats["published"] == 6
+    assert [len(batch) for batch in ingestor.producer.batches] == [4, 2]
+    assert ingestor.producer.batches[0][0][0] == "Assess waste\n\nIt is sorted."
+
+def test_parquet_projection_and_pushdown(tmp_path):
+    """Test that Parquet rows are read with only the projected columns and matching rows"""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table({"id": list(range(100)), "split": ["train", "test"] * 50, "text": [f"row {i}" for i in range(100)]})
+    pq.write_table(table, tmp_path / "train.parquet", row_group_size=10)
+    (tmp_path / "pointer.parquet").write_text("version https://git-lfs.github.com/spec/v1\noid sha256:0\nsize 1\n")
+
+    rows = [row for batch in iter_parquet_batches(tmp_path, ["id", "text"], {"split": "test", "id": [1, 2, 3]}, 2) for row in batch]
+    assert rows == [{"id": 1, "text": "row 1"}, {"id": 3, "text": "row 3"}]
+
+def test_json_and_parquet_sources_agree(tmp_path):
+    """Test that the same source yields the same records from JSON and from Parquet"""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = [{"id": i, "split": ["train", "test"][i % 2], "text": f"row {i}"} for i in range(8)]
+    (tmp_path / "data.jsonl").write_text("\n".join(json.dumps(row) for row in rows))
+    pq.write_table(pa.Table.from_pylist(rows), tmp_path / "data.parquet")
+
+    options = dict(name="sme", columns=["text"], filter={"split": "test"}, id_field="id")
+    json_ingestor = DatasetIngestor(producer=FakeProducer())
+    parquet_ingestor = DatasetIngestor(producer=FakeProducer())
+    json_ingestor.ingest(DatasetSource(path=str(tmp_path / "data.jsonl"), **options))
+    parquet_ingestor.ingest(DatasetSource(path=str(tmp_path / "data.parquet"), **options))
+
+    published = json_ingestor.producer.batches[0]
+    assert published == parquet_ingestor.producer.batches[0]
+    assert [metadata["record_id"] for _, metadata in published] == ["sme:1", "sme:3", "sme:5", "sme:7"]
+
+@pytest.mark.parametrize("suffix", ["jsonl", "parquet"])
+def test_fallback_ids_count_unfiltered_rows(tmp_path, suffix):
+    """Test that rows without an id are numbered by their position before filtering"""
+    rows = [{"split": ["train", "test"][i % 2], "text": f"row {i}"} for i in range(6)]
+    if suffix == "parquet":
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        pq.write_table(pa.Table.from_pylist(rows), tmp_path / "data.parquet", row_group_size=2)
+    else:
+        (tmp_path / "data.jsonl").write_text("\n".join(json.dumps(row) for row in rows))
+
+    ingestor = DatasetIngestor(producer=FakeProducer())
+    ingestor.ingest(DatasetSource(name="sme", path=str(tmp_path / f"data.{suffix}"), columns=["text"], filter={"split": "test"}))
+    published = ingestor.producer.batches[0]
+    assert [metadata["record_id"] for _, metadata in published] == ["sme:1", "sme:3", "sme:5"]
+    assert [content for content, _ in published] == ["row 1", "row 3", "row 5"]
+    assert all(metadata["fields"] == {} for _, metadata in published)
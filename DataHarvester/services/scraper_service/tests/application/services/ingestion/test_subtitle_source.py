@@ -0,0 +1,152 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/ingestion/test_subtitle_source.py
+
+# pytest tests/application/services/ingestion/test_subtitle_source.py -v
+
+import os
+import pytest
+from infrastructure.cache.ingestion_manifest import IngestionManifest
+from application.services.ingestion.subtitle_source import (
+    SubtitleIngestor,
+    iter_srt_segments,
+    parse_subtitle_file,
+    split_subtitle_name,
+    walk_subtitle_files
+)
+
+SRT = (
+    "1\r\n00:00:00,709 --> 00:00:03,333\r\n[up-tempo music plays]\r\n\r\n"
+    "2\r\n00:00:05,375 --> 00:00:07,000\r\n<i>This episode of </i>Bluey\r\n{\\an8}is called The Beach.\r\n\r\n"
+    "3\r\n00:00:08,000 --> 00:00:09,500\r\n\r\n"
+    "4\r\n01:00:10,250 --> 01:00:11,000\r\nBye!"
+)
+
+class FakeProducer:
+    def __init__(self, failing_batches=()):
+        self.batches = []
+        self.failing_batches = set(failing_batches)
+        self.sent = 0
+
+    def send_batch_to_queue(self, items):
+        self.sent += 1
+        if self.sent in self.failing_batches:
+            return False
+        self.batches.append(list(items))
+        return True
+
+    def close(self):
+        pass
+
+def write_episode(root, show, episode, content=SRT):
+    path = root / show / episode / f"{episode}_en.srt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content.encode('utf-8'))
+    return path
+
+def test_segments_keep_timing_and_drop_markup(tmp_path):
+    """Test that cues parse with CRLF endings, markup, empty cues and hour timestamps"""
+    segments = list(iter_srt_segments(write_episode(tmp_path, "Bluey", "The Beach")))
+    assert [(s.text, s.start, s.duration) for s in segments] == [
+        ("[up-tempo music plays]", 0.709, 2.624),
+        ("This episode of Bluey is called The Beach.", 5.375, 1.625),
+        ("", 8.0, 1.5),
+        ("Bye!", 3610.25, 0.75),
+    ]
+
+def test_empty_file_has_no_segments(tmp_path):
+    """Test that an empty file parses without mapping it"""
+    assert list(iter_srt_segments(write_episode(tmp_path, "Bluey", "Empty", ""))) == []
+
+def test_transcript_identity_from_path(tmp_path):
+    """Test that the document ID, language and show metadata come from the file's location"""
+    transcript = parse_subtitle_file(write_episode(tmp_path, "Bluey", "The Beach"), tmp_path)
+    assert transcript.video_id == "srt:Bluey/The Beach/The Beach_en"
+    assert transcript.language == "en"
+    assert transcript.metadata['show'] == "Bluey"
+    assert transcript.metadata['episode'] == "The Beach"
+
+def test_ingest_publishes_in_batches(tmp_path):
+    """Test that every discovered file is published, batch_size at a time"""
+    for episode in ("Bike", "Hotel", "Taxi"):
+        write_episode(tmp_path, "Bluey", episode)
+    (tmp_path / "notes.txt").write_text("not a subtitle")
+    assert len(walk_subtitle_files(tmp_path)) == 3
+
+    ingestor = SubtitleIngestor(tmp_path, producer=FakeProducer(), batch_size=2, workers=1)
+    stats = ingestor.ingest()
+    assert [len(batch) for batch in ingestor.producer.batches] == [2, 1]
+    assert stats['published'] == 3 and stats['segments'] == 12
+    content, metadata = ingestor.producer.batches[0][0]
+    assert content.startswith("[up-tempo music plays] This episode")
+    assert metadata['segments'][0] == {'text': "[up-tempo music plays]", 'start': 0.709, 'duration': 2.624}
+
+@pytest.mark.parametrize("stem, expected", [
+    ("The Beach_en", ("The Beach", "en")),
+    ("The Beach.pt-BR", ("The Beach", "pt-BR")),
+    ("my_talk_web", ("my_talk_web", None)),
+    ("my_talk_final", ("my_talk_final", None)),
+    ("notes", ("notes", None)),
+])
+def test_language_only_from_known_codes(stem, expected):
+    """Test that only ISO 639-1 suffixes are read as the file's language"""
+    assert split_subtitle_name(stem) == expected
+
+def test_parallel_parse_matches_serial(tmp_path):
+    """Test that parsing in a spawned worker pool yields the same transcripts as in-process"""
+    paths = [write_episode(tmp_path, "Bluey", episode) for episode in ("Bike", "Hotel", "Taxi")]
+    serial = list(SubtitleIngestor(tmp_path, workers=1).iter_transcripts(paths))
+    parallel = list(SubtitleIngestor(tmp_path, workers=2).iter_transcripts(paths))
+    assert [transcript for _, transcript, _ in parallel] == [transcript for _, transcript, _ in serial]
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = IngestionManifest(tmp_path / "manifest.sqlite3")
+    yield manifest
+    manifest.close()
+
+def published_episodes(producer):
+    return sorted(metadata['episode'] for batch in producer.batches for _, metadata in batch)
+
+def test_reingest_skips_unchanged_files(tmp_path, manifest):
+    """Test that a second run parses only new and changed files, and reports deleted ones"""
+    root = tmp_path / "subtitles"
+    paths = {episode: write_episode(root, "Bluey", episode) for episode in ("Bike", "Hotel", "Taxi")}
+    first = SubtitleIngestor(root, producer=FakeProducer(), workers=1, manifest=manifest).ingest()
+    assert first['published'] == 3 and first['skipped'] == 0
+
+    ingestor = SubtitleIngestor(root, producer=FakeProducer(), workers=1, manifest=manifest)
+    unchanged = ingestor.ingest()
+    assert (unchanged['files'], unchanged['skipped']) == (0, 3)
+    assert ingestor.producer.batches == []
+
+    # A touched but identical file is still skipped
+    stat = paths["Bike"].stat()
+    os.utime(paths["Bike"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    paths["Hotel"].write_bytes(SRT.replace("Bye!", "See ya!").encode('utf-8'))
+    write_episode(root, "Bluey", "Camping")
+    paths["Taxi"].unlink()
+
+    ingestor = SubtitleIngestor(root, producer=FakeProducer(), workers=1, manifest=manifest)
+    changed = ingestor.ingest()
+    assert published_episodes(ingestor.producer) == ["Camping", "Hotel"]
+    assert changed['skipped'] == 1
+    assert list(changed['deleted']) == ["Bluey/Taxi/Taxi_en.srt"]
+    content, _ = [event for event in ingestor.producer.batches[0] if event[1]['episode'] == "Hotel"][0]
+    assert content.endswith("See ya!")
+
+    ingestor = SubtitleIngestor(root, producer=FakeProducer(), workers=1, manifest=manifest)
+    assert ingestor.ingest(full=True)['published'] == 3
+
+def test_interrupted_run_resumes(tmp_path, manifest):
+    """Test that files from a failed batch are ingested on the next run, and published ones are not"""
+    for episode in ("Bike", "Camping", "Hotel", "Taxi"):
+        write_episode(tmp_path, "Bluey", episode)
+    ingestor = SubtitleIngestor(tmp_path, producer=FakeProducer(failing_batches={2}), batch_size=2, workers=1, manifest=manifest)
+    first = ingestor.ingest()
+    assert (first['published'], first['failed']) == (2, 2)
+
+    retry = SubtitleIngestor(tmp_path, producer=FakeProducer(), batch_size=2, workers=1, manifest=manifest)
+    second = retry.ingest()
+    assert (second['published'], second['skipped']) == (2, 2)
+    assert published_episodes(retry.producer) == sorted(
+        {"Bike", "Camping", "Hotel", "Taxi"} - set(published_episodes(ingestor.producer))
+    )
@@ -0,0 +1,46 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/text/test_cleaning_plan.py
+
+# pytest tests/application/services/text/test_cleaning_plan.py -v
+
+import pytest
+from application.services.text.cleaning_plan import build_cleaning_plan, settings_fingerprint
+
+SETTINGS = {
+    "remove": ["urls", "special_characters", "extra_whitespace", "emojis"],
+    "lowercase": True,
+    "remove_stopwords": True,
+    "interjections": ["um", "uh"],
+}
+
+def test_urls_then_special_characters_are_fused():
+    """Test that adjacent urls + special_characters compile to a single step"""
+    plan = build_cleaning_plan(SETTINGS)
+    assert [name for name, _ in plan.steps] == ["urls+special_characters", "extra_whitespace", "emojis"]
+
+def test_reverse_order_is_not_fused():
+    """Test that special_characters before urls keeps two passes, which differ from one"""
+    plan = build_cleaning_plan({"remove": ["special_characters", "urls"]})
+    assert [name for name, _ in plan.steps] == ["special_characters", "urls"]
+    assert plan.basic_clean("go www.x") == "go wwwx"
+
+@pytest.mark.parametrize("text, expected", [
+    ("[Music] Visit www.abc.com/xyz NOW!!", "music visit now"),
+    ("Bingo's   going 😀 http://a.b/c?d=1 home.", "bingos going home"),
+    ("", ""),
+])
+def test_basic_clean(text, expected):
+    assert build_cleaning_plan(SETTINGS).basic_clean(text) == expected
+
+def test_stop_words_and_frozen_lookups():
+    plan = build_cleaning_plan(SETTINGS, stop_words={"the", "a"})
+    assert plan.drop_stop_words("The dog ate a bone") == "dog ate bone"
+    assert plan.interjections == frozenset({"um", "uh"})
+    with pytest.raises(Exception):
+        plan.lowercase = False
+
+def test_fingerprint_tracks_settings():
+    """Test that equal settings share a plan and changed settings get a new fingerprint"""
+    assert build_cleaning_plan(dict(SETTINGS)) is build_cleaning_plan(dict(SETTINGS))
+    changed = dict(SETTINGS, lowercase=False)
+    assert settings_fingerprint(changed) != settings_fingerprint(SETTINGS)
+    assert build_cleaning_plan(changed).fingerprint == settings_fingerprint(changed)
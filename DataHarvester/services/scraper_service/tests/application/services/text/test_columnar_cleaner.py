@@ -0,0 +1,75 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/text/test_columnar_cleaner.py
+
+# pytest tests/application/services/text/test_columnar_cleaner.py -v
+
+import pytest
+from application.services.text.cleaning_plan import build_cleaning_plan
+
+pa = pytest.importorskip("pyarrow")
+from application.services.text.columnar_cleaner import ColumnarCleaner
+
+SETTINGS = {
+    "remove": ["urls", "special_characters", "extra_whitespace", "emojis"],
+    "lowercase": True,
+    "artifacts": ["[music]", "[applause]"],
+    "word_fixes": {"gonna": "going to"},
+    "interjections": ["um", "uh"],
+}
+
+TEXTS = [
+    "[Music] Um, we're GONNA go to www.beach.com!",
+    "Visit http://example.com/a?b=1 today,  John",
+    "  tabs\tand\x1cfile\x1fseparators\x0b ",
+    "humble number",
+    "Crème brûlée 😀 for Müller",
+    "!!!",
+    "",
+    None,
+]
+
+@pytest.mark.parametrize("remove", [
+    SETTINGS["remove"],
+    ["special_characters", "urls"],
+    ["extra_whitespace"],
+    ["emojis", "urls"],
+    [],
+])
+@pytest.mark.parametrize("lowercase", [True, False])
+def test_matches_row_by_row_cleaning(remove, lowercase):
+    """Test that the columnar result equals CleaningPlan.basic_clean on every row"""
+    plan = build_cleaning_plan({**SETTINGS, "remove": remove, "lowercase": lowercase})
+    column = pa.chunked_array([TEXTS[:3], TEXTS[3:]])
+    expected = [None if text is None else plan.basic_clean(text) for text in TEXTS]
+    assert ColumnarCleaner(plan).basic_clean(column).to_pylist() == expected
+
+def test_lexicon_candidates_respect_word_bounds():
+    """Test that only whole-word lexicon hits are sent row by row"""
+    cleaner = ColumnarCleaner(build_cleaning_plan(SETTINGS))
+    assert cleaner.lexicon_pattern is not None
+    assert cleaner.basic_clean(["humble drum", "um ok"]).to_pylist() == ["humble drum", "ok"]
+
+def test_clean_processes_each_distinct_value_once():
+    """Test that the per-row stage sees distinct basic-cleaned values only"""
+    seen = []
+
+    def process(values):
+        seen.append(list(values))
+        return [value.upper() for value in values]
+
+    cleaner = ColumnarCleaner(build_cleaning_plan(SETTINGS))
+    result = cleaner.clean(["Hi!", "hi", None, "Bye."], process)
+    assert result.to_pylist() == ["HI", "HI", None, "BYE"]
+    assert sorted(seen[0]) == ["bye", "hi"]
+
+def test_clean_groups_rows_by_value_and_flag():
+    """Test that rows with the same cleaned value but different flags are processed apart"""
+    seen = []
+
+    def process(values, flags):
+        seen.append(sorted(zip(values, flags)))
+        return [f"{value}!" if flag else value for value, flag in zip(values, flags)]
+
+    cleaner = ColumnarCleaner(build_cleaning_plan(SETTINGS))
+    result = cleaner.clean(["Hi John", "hi john", None, "HI JOHN"], process, [True, False, False, True])
+    assert result.to_pylist() == ["hi john!", "hi john", None, "hi john!"]
+    assert seen == [[("hi john", False), ("hi john", True)]]
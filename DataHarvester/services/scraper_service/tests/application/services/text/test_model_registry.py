@@ -0,0 +1,57 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/text/test_model_registry.py
+
+# pytest tests/application/services/text/test_model_registry.py -v
+
+import pytest
+import spacy
+from spacy.tokens import Span
+from presidio_analyzer.nlp_engine import NerModelConfiguration, SpacyNlpEngine
+from application.services.text.model_registry import doc_nlp_artifacts
+
+@pytest.fixture
+def nlp():
+    return spacy.blank("en")
+
+@pytest.fixture
+def engine(nlp):
+    # Backed by an existing pipeline, as NLPModelRegistry builds it
+    engine = SpacyNlpEngine(ner_model_configuration=NerModelConfiguration(
+        labels_to_ignore=["CARDINAL"],
+        low_score_entity_names=["ORGANIZATION"]
+    ))
+    engine.nlp = {"en": nlp}
+    return engine
+
+@pytest.fixture
+def doc(nlp):
+    doc = nlp("John Smith moved to Paris with 3 dogs from Acme")
+    doc.ents = [
+        Span(doc, 0, 2, label="PERSON"),
+        Span(doc, 4, 5, label="GPE"),
+        Span(doc, 6, 7, label="CARDINAL"),
+        Span(doc, 9, 10, label="ORG"),
+    ]
+    return doc
+
+def summary(artifacts):
+    return (
+        [(ent.start_char, ent.end_char, ent.label_) for ent in artifacts.entities],
+        artifacts.scores,
+        artifacts.tokens_indices,
+        artifacts.lemmas,
+    )
+
+def test_doc_artifacts_map_and_filter_entities(doc, engine):
+    """Test that model labels are mapped to Presidio entities and ignored labels dropped"""
+    entities, scores, tokens_indices, _ = summary(doc_nlp_artifacts(doc, engine))
+    assert entities == [(0, 10, "PERSON"), (20, 25, "LOCATION"), (43, 47, "ORGANIZATION")]
+    assert scores == pytest.approx([0.85, 0.85, 0.34])
+    assert tokens_indices == [token.idx for token in doc]
+    # The Doc's own entities are left as they were
+    assert [ent.label_ for ent in doc.ents] == ["PERSON", "GPE", "CARDINAL", "ORG"]
+
+def test_doc_artifacts_match_presidio_parse(doc, engine):
+    """Test that the artifacts equal those Presidio's engine builds for the same Doc"""
+    if not hasattr(engine, "_doc_to_nlp_artifact"):
+        pytest.skip("this Presidio version has no _doc_to_nlp_artifact to compare with")
+    assert summary(doc_nlp_artifacts(doc, engine)) == summary(engine._doc_to_nlp_artifact(doc, "en"))
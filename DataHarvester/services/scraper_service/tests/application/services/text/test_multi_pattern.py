@@ -0,0 +1,38 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/text/test_multi_pattern.py
+
+# pytest tests/application/services/text/test_multi_pattern.py -v
+
+import pytest
+import application.services.text.multi_pattern as multi_pattern
+from application.services.text.multi_pattern import MultiPatternReplacer
+
+LEXICONS = dict(
+    artifacts=["[Music]", "[applause]"],
+    word_fixes={"gonna": "going to", "wanna": "want to"},
+    interjections=["um", "uh"],
+)
+
+@pytest.fixture(params=["native", "python"])
+def replacer(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(multi_pattern, "ahocorasick", None)
+    elif multi_pattern.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    return MultiPatternReplacer.from_lexicons(**LEXICONS)
+
+def test_removes_and_replaces(replacer):
+    """Test artifact and interjection removal and word fixes in one pass"""
+    assert replacer.replace("[music] um we gonna dance [applause]") == "  we going to dance "
+
+def test_respects_word_boundaries(replacer):
+    """Test that lexicon words inside longer words are left alone"""
+    assert replacer.replace("umbrella gonnadoit yum") == "umbrella gonnadoit yum"
+    assert replacer.replace("uh, wanna.") == ", want to."
+
+def test_prefers_longest_match():
+    replacer = MultiPatternReplacer({"ice": "X", "ice cream": "Y"})
+    assert replacer.replace("ice cream and ice") == "Y and X"
+
+def test_batch_and_empty_lexicon(replacer):
+    assert replacer.replace_batch(["um hi", "", "gonna"]) == [" hi", "", "going to"]
+    assert MultiPatternReplacer({}).replace("um hi") == "um hi"
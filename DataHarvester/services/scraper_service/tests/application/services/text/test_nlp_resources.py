@@ -0,0 +1,69 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/text/test_nlp_resources.py
+
+# pytest tests/application/services/text/test_nlp_resources.py -v
+
+import nltk
+import pytest
+import spacy
+from domain.exceptions.domain_exceptions import ConfigurationError
+from application.services.text import nlp_resources
+from application.services.text.model_registry import NLPModelRegistry
+from infrastructure.monitoring.health_checker import HealthChecker
+
+CONFIG = {'text_cleaning': {'use_nlp': True, 'anonymize': True, 'perform_lemmatization': True, 'spacy_model': "en_core_web_sm"}}
+
+@pytest.fixture
+def fresh(monkeypatch):
+    """Start from an unverified process, failing the test on any download or model load"""
+    def forbidden(name):
+        def fail(*args, **kwargs):
+            pytest.fail(f"{name} called")
+        return fail
+
+    monkeypatch.setattr(nlp_resources, "_verified", set())
+    monkeypatch.setattr(HealthChecker, "_nltk_state", None)
+    monkeypatch.setattr(nltk, "download", forbidden("nltk.download"))
+    monkeypatch.setattr(nltk.downloader.Downloader, "download", forbidden("nltk Downloader.download"))
+    monkeypatch.setattr(spacy.cli, "download", forbidden("spacy.cli.download"))
+    monkeypatch.setattr(NLPModelRegistry, "get_spacy", forbidden("NLPModelRegistry.get_spacy"))
+    monkeypatch.setattr(NLPModelRegistry, "get_analyzer", forbidden("NLPModelRegistry.get_analyzer"))
+    nlp_resources.get_stop_words.cache_clear()
+    yield
+    nlp_resources.get_stop_words.cache_clear()
+
+def test_missing_nltk_data_fails_fast(fresh, monkeypatch):
+    """Test that missing corpora raise RES001 with the install command before any model loads"""
+    def find(resource):
+        if resource.endswith("stopwords"):
+            raise LookupError(resource)
+        return resource
+
+    monkeypatch.setattr(nltk.data, "find", find)
+    with pytest.raises(ConfigurationError) as excinfo:
+        nlp_resources.warm_start(CONFIG)
+    assert excinfo.value.error_code == "RES001"
+    assert "stopwords" in excinfo.value.message
+    assert "python -m nltk.downloader stopwords" in excinfo.value.message
+    assert 'nltk' not in nlp_resources._verified
+
+def test_missing_spacy_model_fails_fast(fresh, monkeypatch):
+    """Test that a model that is neither a package nor a path raises RES002 without loading anything"""
+    monkeypatch.setattr(spacy.util, "is_package", lambda name: False)
+    config = {'text_cleaning': {**CONFIG['text_cleaning'], 'spacy_model': "en_core_web_missing"}}
+    with pytest.raises(ConfigurationError) as excinfo:
+        nlp_resources.warm_start(config)
+    assert excinfo.value.error_code == "RES002"
+    assert "python -m spacy download en_core_web_missing" in excinfo.value.message
+    assert nlp_resources._verified == {'nltk'}
+
+def test_checks_run_once_per_process(fresh, monkeypatch):
+    """Test that verified resources are not looked up again"""
+    lookups = []
+    monkeypatch.setattr(nltk.data, "find", lambda resource: lookups.append(resource) or resource)
+    monkeypatch.setattr(spacy.util, "is_package", lambda name: lookups.append(name) or True)
+    nlp_resources.ensure_nltk_data()
+    nlp_resources.ensure_spacy_model("en_core_web_sm")
+    count = len(lookups)
+    nlp_resources.ensure_nltk_data()
+    nlp_resources.ensure_spacy_model("en_core_web_sm")
+    assert len(lookups) == count
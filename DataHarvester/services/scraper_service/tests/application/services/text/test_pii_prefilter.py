@@ -0,0 +1,53 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/text/test_pii_prefilter.py
+
+# pytest tests/application/services/text/test_pii_prefilter.py -v
+
+import pytest
+from application.services.text.pii_prefilter import PIIPrefilter
+
+class FakeDoc:
+    def __init__(self, ents=()):
+        self.ents = tuple(ents)
+
+@pytest.mark.parametrize("text", [
+    "call me on 555 123 4567",
+    "write to bandit@example.com",
+    "see www.example.com",
+    "we went to see Bluey today",
+])
+def test_candidates_need_analysis(text):
+    """Test that digits, emails, URLs and mid-sentence capitals go to Presidio"""
+    assert PIIPrefilter().needs_analysis(text) is True
+
+@pytest.mark.parametrize("text", [
+    "[music resumes]",
+    "Mum is here. Dad is not",
+    "I think so",
+    "",
+])
+def test_plain_segments_are_skipped(text):
+    """Test that segments without candidate patterns skip Presidio"""
+    assert PIIPrefilter().needs_analysis(text) is False
+
+def test_doc_entities_force_analysis():
+    """Test that spaCy entities count even when the text has no candidate pattern"""
+    prefilter = PIIPrefilter()
+    assert prefilter.needs_analysis("bluey and bingo", FakeDoc(ents=["bluey"])) is True
+    assert prefilter.needs_analysis("bluey and bingo", FakeDoc()) is False
+
+def test_counters_and_disable():
+    """Test skip counters, and that a disabled prefilter sends everything through"""
+    prefilter = PIIPrefilter()
+    for text in ["[music]", "[applause]", "call 555 0100", "[laughs]"]:
+        prefilter.needs_analysis(text)
+    assert prefilter.stats() == {'checked': 4, 'skipped': 3, 'skip_ratio': 0.75}
+
+    assert PIIPrefilter(enabled=False).needs_analysis("[music]") is True
+
+def test_candidate_from_original_text():
+    """Test that a verdict taken on the original casing carries over to the lowercased text"""
+    prefilter = PIIPrefilter()
+    assert prefilter.is_candidate("we saw John there") is True
+    assert prefilter.checked == 0
+    assert prefilter.needs_analysis("we saw john there") is False
+    assert prefilter.needs_analysis("we saw john there", candidate=True) is True
@@ -0,0 +1,56 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/text/test_pipeline_profile.py
+
+# pytest tests/application/services/text/test_pipeline_profile.py -v
+
+import pytest
+from application.services.text.pipeline_profile import PIPELINE_COMPONENTS, PRESIDIO_FEATURES, build_pipeline_profile
+
+def profile(anonymize, lemmatize, use_nlp=True):
+    settings = {'use_nlp': use_nlp, 'anonymize': anonymize, 'perform_lemmatization': lemmatize}
+    # TranscriptCleaner shares the model with Presidio only when anonymizing
+    return build_pipeline_profile(settings, PRESIDIO_FEATURES if anonymize else ())
+
+def loaded(profile):
+    return {name for name in PIPELINE_COMPONENTS if name not in profile.exclude}
+
+@pytest.mark.parametrize("anonymize, lemmatize, components", [
+    (True, True, {'tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner'}),
+    (True, False, {'tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer', 'ner'}),
+    (False, True, {'tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer'}),
+    (False, False, set()),
+])
+def test_loaded_components(anonymize, lemmatize, components):
+    """Test that each cleaning config loads exactly the components it reads"""
+    assert loaded(profile(anonymize, lemmatize)) == components
+
+def test_no_ner_without_pii():
+    """Test that NER is excluded when anonymization is off"""
+    assert 'ner' in profile(False, True).exclude
+
+def test_no_lemmatizer_without_lemmas():
+    """Test that neither lemmatization nor Presidio means no lemmatizer, tagger or parser"""
+    assert {'lemmatizer', 'tagger', 'parser'} <= set(profile(False, False).exclude)
+
+def test_senter_is_never_loaded():
+    assert all('senter' in profile(*flags).exclude for flags in [(True, True), (True, False), (False, True), (False, False)])
+
+def test_use_nlp_off_loads_nothing():
+    """Test that with use_nlp off cleaning reads no analyses"""
+    result = profile(False, True, use_nlp=False)
+    assert result.features == frozenset()
+    assert result.exclude == PIPELINE_COMPONENTS
+
+def test_shared_components_are_disabled_for_cleaning():
+    """Test that components loaded only for another consumer are disabled on cleaning calls"""
+    settings = {'use_nlp': True, 'anonymize': False, 'perform_lemmatization': True}
+    shared = build_pipeline_profile(settings, {'ents'})
+    assert 'ner' not in shared.exclude
+    assert shared.disable == ('ner',)
+    # When cleaning reads everything it loads, nothing is disabled
+    assert profile(True, True).disable == ()
+    assert profile(False, True).disable == ()
+
+def test_model_name(monkeypatch):
+    monkeypatch.setenv('SPACY_MODEL', "en_core_web_md")
+    assert build_pipeline_profile({}).model_name == "en_core_web_md"
+    assert build_pipeline_profile({'spacy_model': "en_core_web_lg"}).model_name == "en_core_web_lg"
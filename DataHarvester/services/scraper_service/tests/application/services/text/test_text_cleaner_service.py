@@ -0,0 +1,83 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/text/test_text_cleaner_service.py
+
+# pytest tests/application/services/text/test_text_cleaner_service.py -v
+
+import pytest
+import yaml
+from domain.exceptions.domain_exceptions import ConfigurationError
+from infrastructure.config.config_manager import ConfigManager
+from application.services.text.text_cleaner_service import TranscriptCleaner
+
+@pytest.fixture(scope="module")
+def cleaner():
+    cleaner = TranscriptCleaner()
+    # Keep cleaning in-process; the memo would need Redis
+    cleaner.close()
+    return cleaner
+
+def test_reload_rejects_missing_model(cleaner, tmp_path, monkeypatch):
+    """Test that a config naming a missing model leaves the cleaner and the shared config as they were"""
+    manager = ConfigManager()
+    cached = manager.get_config("cleaning")
+    broken = {**cached, "text_cleaning": {**cached["text_cleaning"], "spacy_model": "missing_model"}}
+    (tmp_path / "cleaning.yaml").write_text(yaml.safe_dump(broken))
+    monkeypatch.setattr(ConfigManager, "_config_dir", tmp_path)
+    fingerprint = cleaner.memo_fingerprint
+
+    with pytest.raises(ConfigurationError):
+        cleaner.reload_settings()
+    assert manager.get_config("cleaning") is cached
+    assert cleaner.config is cached
+    assert cleaner.memo_fingerprint == fingerprint
+
+SEGMENTS = [
+    "Um, we went to the beach [music] and it was gonna rain!",
+    "",
+    "   ",
+    "Call John Smith at 212-555-0143 or john.smith@example.com",
+    "Check https://example.com/watch?v=abc for more 😀",
+    "Um, we went to the beach [music] and it was gonna rain!",
+    "\t\n",
+    "The running dogs were barking loudly in Paris.",
+]
+
+def test_clean_batch_matches_clean_text(cleaner):
+    """Test that batch cleaning gives clean_text's output for every segment, blanks included"""
+    assert cleaner.clean_batch(SEGMENTS) == [cleaner.clean_text(text) for text in SEGMENTS]
+
+def test_clean_batch_of_nothing(cleaner):
+    assert cleaner.clean_batch([]) == []
+    assert cleaner.clean_batch(iter(["", "   "])) == [cleaner.clean_text(""), cleaner.clean_text("   ")]
+
+def test_clean_transcripts_keeps_structure(cleaner):
+    """Test that transcripts are cleaned in one batch with their entries and timings intact"""
+    transcripts = [
+        [{'text': SEGMENTS[0], 'start': 0.0, 'duration': 1.0}, {'start': 1.0, 'duration': 0.5}],
+        [],
+        [{'text': SEGMENTS[3], 'start': 2.0, 'duration': 2.0}, {'text': "", 'start': 4.0, 'duration': 1.0}],
+    ]
+    cleaned = cleaner.clean_transcripts(transcripts)
+    assert [len(transcript) for transcript in cleaned] == [2, 0, 2]
+    assert cleaned[0][0] == {'text': cleaner.clean_text(SEGMENTS[0]), 'start': 0.0, 'duration': 1.0}
+    assert cleaned[0][1] == {'start': 1.0, 'duration': 0.5}
+    assert cleaned[2][0]['text'] == cleaner.clean_text(SEGMENTS[3])
+    assert cleaned[2][1]['text'] == ""
+    assert cleaner.clean_transcript(transcripts[0]) == cleaned[0]
+    # The input is left untouched
+    assert transcripts[0][0]['text'] == SEGMENTS[0]
+
+def test_anonymize_batch(cleaner):
+    """Test that PII is replaced with placeholders whose spans are reported, and other text is left alone"""
+    texts = ["Call John Smith at 212-555-0143", "", "the weather is nice today"]
+    anonymized = cleaner.anonymize_batch(texts)
+    assert len(anonymized) == 3
+    assert anonymized[1] == {'text': "", 'entities': []}
+    assert anonymized[2] == {'text': texts[2], 'entities': []}
+
+    first = anonymized[0]
+    assert "John Smith" not in first['text'] and "212-555-0143" not in first['text']
+    assert {entity['entity_type'] for entity in first['entities']} == {"PERSON", "PHONE_NUMBER"}
+    for entity in first['entities']:
+        assert first['text'][entity['start']:entity['end']] == f"<{entity['entity_type']}>"
+    # Segments are analyzed independently of their batch
+    assert cleaner.anonymize_batch(texts[:1]) == [first]
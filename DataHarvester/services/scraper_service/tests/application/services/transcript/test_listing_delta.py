@@ -0,0 +1,66 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/transcript/test_listing_delta.py
+
+# pytest tests/application/services/transcript/test_listing_delta.py -v
+
+import pytest
+from application.services.transcript.listing_delta import VIDEO_URL_TEMPLATE, select_listing_delta
+from infrastructure.cache.listing_snapshot import ListingSnapshotStore
+
+LISTING = "https://www.youtube.com/@beach/videos"
+
+def listing(video_ids):
+    """Newest-first (video_url, video_id) pairs"""
+    return [(VIDEO_URL_TEMPLATE.format(video_id), video_id) for video_id in video_ids]
+
+@pytest.fixture
+def store(tmp_path):
+    store = ListingSnapshotStore(tmp_path / "listings.sqlite3")
+    yield store
+    store.close()
+
+def crawl(store, video_ids, failing=(), stop_after_known=20):
+    """One run: select the delta, 'process' it with the failing IDs failing, and commit"""
+    head, known = store.get_snapshot(LISTING)
+    videos, listing_head = select_listing_delta(
+        listing(video_ids), head, known, store.get_pending(LISTING), True, stop_after_known
+    )
+    offered = [video_id for _, video_id in videos]
+    failed = [video_id for video_id in offered if video_id in failing]
+    store.commit(
+        LISTING,
+        [video_id for video_id in offered if video_id not in failing],
+        None if failed else listing_head,
+        failed
+    )
+    return offered
+
+def test_walk_stops_at_previous_head(store):
+    """Test that a newest-first re-crawl offers only videos above the committed head"""
+    assert crawl(store, ["v2", "v1", "v0"]) == ["v2", "v1", "v0"]
+    assert crawl(store, ["v4", "v3", "v2", "v1", "v0"]) == ["v4", "v3"]
+    assert store.get_snapshot(LISTING)[0] == "v4"
+
+def test_walk_stops_after_run_of_known_videos():
+    """Test that paging stops after stop_after_known known videos when the head is gone"""
+    pages = iter(listing(["v9", "v8", "v7", "v6", "v5"]))
+    videos, head = select_listing_delta(pages, "v0", {"v8", "v7", "v6", "v5"}, set(), True, 2)
+    assert videos == listing(["v9"])
+    assert head == "v9"
+    # The rest of the listing was never paged
+    assert next(pages) == (VIDEO_URL_TEMPLATE.format("v6"), "v6")
+
+def test_failed_video_is_offered_again_after_stopping_early(store):
+    """Test that a failure beyond the stop point is re-offered until it succeeds"""
+    video_ids = [f"v{i}" for i in range(49, -1, -1)]
+    assert len(crawl(store, video_ids, failing={"v0"})) == 50
+    assert store.get_snapshot(LISTING)[0] is None
+    assert crawl(store, video_ids, failing={"v0"}) == ["v0"]
+    assert crawl(store, video_ids) == ["v0"]
+    assert store.get_pending(LISTING) == set()
+    assert crawl(store, ["v50"] + video_ids) == ["v50"]
+
+def test_repeated_videos_are_offered_once():
+    """Test that a listing repeating a video offers it once"""
+    videos, head = select_listing_delta(listing(["v2", "v1", "v2", "v1"]), None, set(), set(), False, 20)
+    assert videos == listing(["v2", "v1"])
+    assert head == "v2"
@@ -0,0 +1,53 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/transcript/test_segment_windows.py
+
+# pytest tests/application/services/transcript/test_segment_windows.py -v
+
+import pytest
+from domain.models.transcript import TranscriptSegment
+from application.services.transcript.segment_windows import merge_segments
+
+def segment(text, start, duration=1.0):
+    return {'text': text, 'start': start, 'duration': duration}
+
+def test_windows_span_merged_segments():
+    """Test that a window covers its first segment's start to its last segment's end"""
+    windows = merge_segments([
+        segment("we went", 0.0),
+        segment("to the", 1.0),
+        segment("beach", 2.0, 1.5),
+    ], boundary='time')
+    assert len(windows) == 1
+    assert windows[0].text == "we went to the beach"
+    assert windows[0].start == 0.0
+    assert windows[0].duration == 3.5
+    assert windows[0].segment_count == 3
+
+def test_sentence_end_closes_window_after_min_chars():
+    """Test that sentence ends only close windows holding at least min_chars"""
+    segments = [segment("Hi.", 0.0), segment("Bye.", 1.0), segment("Hi again.", 2.0)]
+    assert len(merge_segments(segments, min_chars=0)) == 3
+    windows = merge_segments(segments, min_chars=6)
+    assert [window.text for window in windows] == ["Hi. Bye.", "Hi again."]
+    assert windows[1].first_segment == 2
+
+@pytest.mark.parametrize("limits,expected", [
+    ({'max_gap': 0.5}, 2),
+    ({'max_duration': 2.5}, 2),
+    ({'max_chars': 6}, 3),
+])
+def test_limits_close_windows(limits, expected):
+    """Test that gaps, duration and length each start a new window"""
+    segments = [segment("one", 0.0), segment("two", 2.0), segment("six", 3.0)]
+    defaults = {'max_gap': 5.0, 'max_duration': 30.0, 'max_chars': 500}
+    assert len(merge_segments(segments, boundary='time', **{**defaults, **limits})) == expected
+
+def test_accepts_transcript_segments():
+    """Test that domain TranscriptSegments merge like dicts"""
+    windows = merge_segments([TranscriptSegment(text="  hello  there ", start=1.0, duration=2.0)])
+    assert windows[0].to_dict("hello") == {'text': "hello", 'start': 1.0, 'duration': 2.0}
+    assert windows[0].text == "hello there"
+
+def test_unknown_boundary_rejected():
+    """Test that an unknown boundary mode is an error"""
+    with pytest.raises(ValueError):
+        merge_segments([], boundary='paragraph')
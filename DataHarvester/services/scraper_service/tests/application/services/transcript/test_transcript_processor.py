@@ -0,0 +1,198 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/transcript/test_transcript_processor.py
+
+# pytest tests/application/services/transcript/test_transcript_processor.py -v
+
+import sqlite3
+import pytest
+from application.services.transcript import transcript_processor
+from application.services.transcript.transcript_processor import WINDOW_PAYLOAD_SCHEMA, VideoProcessor
+from application.services.transcript.transcript_service import TranscriptFetcher
+from infrastructure.cache.listing_snapshot import ListingSnapshotStore
+from infrastructure.cache.transcript_cache import TranscriptCache
+
+SEGMENTS = [
+    {'text': "We went", 'start': 0.0, 'duration': 1.0},
+    {'text': "to the beach.", 'start': 1.0, 'duration': 1.5},
+]
+
+class FakeProcessor:
+    """Succeeds with three segments per video, except for the URLs in `failing`"""
+
+    def __init__(self, failing=(), skipped=()):
+        self.failing = set(failing)
+        self.skipped = set(skipped)
+        self.calls = []
+
+    def process_single_video(self, video_url, defer_retries=False, force_refresh=False):
+        self.calls.append(video_url)
+        if video_url in self.failing:
+            raise RuntimeError("fetch failed")
+        if video_url in self.skipped:
+            return {'success': True, 'skipped': True, 'video_id': video_url, 'transcript_count': 0}
+        return {'success': True, 'video_id': video_url, 'transcript_count': 1, 'segment_count': 3}
+
+class FakeCleaner:
+    def __init__(self, windows=False):
+        self.window_settings = {'enabled': windows}
+
+    def clean_batch(self, texts):
+        return [text.lower() for text in texts]
+
+    def clean_windows(self, segments):
+        return [{'text': " ".join(s['text'].lower() for s in segments), 'start': 0.0, 'duration': 2.5}]
+
+@pytest.fixture
+def sent(monkeypatch):
+    sent = []
+    monkeypatch.setattr(transcript_processor.celery_app, "send_task", lambda name, args, queue: sent.append(args[0]))
+    return sent
+
+def make_processor(cleaner):
+    processor = VideoProcessor.__new__(VideoProcessor)
+    processor.cleaner = cleaner
+    processor.dedup_index = None
+    processor._closed = True
+    return processor
+
+class TestStoragePayload:
+    def test_default_payload_is_cleaned_strings(self, sent):
+        """Test that without windows the payload keeps its unversioned list of strings"""
+        result = make_processor(FakeCleaner()).handle_transcripts("url", "vid", SEGMENTS)
+        assert sent == [{'video_id': "vid", 'processed': False, 'transcripts': ["we went", "to the beach."]}]
+        assert result['transcript_count'] == 2 and result['segment_count'] == 2
+
+    def test_window_payload_is_marked(self, sent):
+        """Test that window payloads carry timed entries under an explicit schema"""
+        result = make_processor(FakeCleaner(windows=True)).handle_transcripts("url", "vid", SEGMENTS)
+        assert sent[0]['schema'] == WINDOW_PAYLOAD_SCHEMA
+        assert sent[0]['transcripts'] == [{'text': "we went to the beach.", 'start': 0.0, 'duration': 2.5}]
+        assert result['transcript_count'] == 1 and result['segment_count'] == 2
+
+@pytest.fixture
+def eager(monkeypatch):
+    """Run chords in-process and capture each batch summary"""
+    monkeypatch.setattr(transcript_processor.celery_app.conf, "task_always_eager", True)
+    summaries = []
+    run = transcript_processor.summarize_batch_task.run
+
+    def summarize(*args, **kwargs):
+        summaries.append(run(*args, **kwargs))
+        return summaries[-1]
+
+    monkeypatch.setattr(transcript_processor.summarize_batch_task, "run", summarize)
+    return summaries
+
+@pytest.fixture
+def retried(monkeypatch):
+    retried = []
+    monkeypatch.setattr(
+        transcript_processor.process_video_task,
+        "apply_async",
+        lambda args, kwargs, **options: retried.append((args, options))
+    )
+    return retried
+
+class TestBatchFanOut:
+    def test_batch_is_chunked(self, eager, monkeypatch):
+        """Test that a batch becomes one chunk task per chunk_size videos, in order"""
+        chunks = []
+        run = transcript_processor.process_chunk_task.run
+        monkeypatch.setattr(transcript_processor, "get_processor", FakeProcessor)
+        monkeypatch.setattr(
+            transcript_processor.process_chunk_task,
+            "run",
+            lambda video_urls, force_refresh=False: chunks.append(video_urls) or run(video_urls, force_refresh)
+        )
+        batch = transcript_processor.dispatch_batch(["a", "b", "c", "d", "e"], chunk_size=2)
+        assert batch['videos'] == 5 and batch['chunks'] == 3
+        assert chunks == [["a", "b"], ["c", "d"], ["e"]]
+        assert eager[0]['succeeded'] == 5
+
+    def test_empty_batch_dispatches_nothing(self, eager):
+        """Test that an empty batch sends no chord"""
+        assert transcript_processor.dispatch_batch([], chunk_size=2) == {'batch_id': None, 'videos': 0, 'chunks': 0}
+        assert eager == []
+
+    def test_summary_counts(self, eager, retried, monkeypatch):
+        """Test that the callback counts outcomes and sums real segments, not stored entries"""
+        processor = FakeProcessor(failing={"b"}, skipped={"c"})
+        monkeypatch.setattr(transcript_processor, "get_processor", lambda: processor)
+        transcript_processor.dispatch_batch(["a", "b", "c", "d"], chunk_size=3)
+        summary = eager[0]
+        assert summary['videos'] == 4
+        assert (summary['succeeded'], summary['skipped'], summary['retrying'], summary['failed']) == (2, 1, 1, 0)
+        assert summary['segments_cleaned'] == 6
+        assert [args for args, _ in retried] == [["b"]]
+
+class Closable:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def singleton(monkeypatch, tmp_path):
+    """Build processors from local stores only, under a controllable pid"""
+    pid = [100]
+    built = []
+
+    def build():
+        processor = make_processor(Closable())
+        processor.producer = Closable()
+        processor.extractor = TranscriptFetcher.__new__(TranscriptFetcher)
+        processor.extractor.cache = TranscriptCache(tmp_path / f"transcripts-{len(built)}.sqlite3")
+        processor.extractor.snapshots = ListingSnapshotStore(tmp_path / f"listings-{len(built)}.sqlite3")
+        processor._closed = False
+        built.append(processor)
+        return processor
+
+    monkeypatch.setattr(transcript_processor, "VideoProcessor", build)
+    monkeypatch.setattr(transcript_processor.os, "getpid", lambda: pid[0])
+    monkeypatch.setattr(transcript_processor, "_worker_processor", None)
+    monkeypatch.setattr(transcript_processor, "_worker_processor_pid", None)
+    return pid, built
+
+def is_closed(store):
+    try:
+        store._conn.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+class TestWorkerProcessor:
+    def test_repeated_calls_reuse_the_processor(self, singleton):
+        """Test that a process builds its VideoProcessor once"""
+        _, built = singleton
+        assert transcript_processor.get_processor() is transcript_processor.get_processor()
+        assert len(built) == 1
+
+    def test_forked_process_builds_its_own(self, singleton):
+        """Test that a processor inherited from another pid is replaced, not reused"""
+        pid, built = singleton
+        parent = transcript_processor.get_processor()
+        pid[0] = 200
+        child = transcript_processor.get_processor()
+        assert child is not parent
+        assert len(built) == 2
+        assert transcript_processor.get_processor() is child
+
+    def test_close_processor_closes_stores(self, singleton):
+        """Test that closing releases the cache, snapshot store, producer and cleaner"""
+        _, built = singleton
+        processor = transcript_processor.get_processor()
+        transcript_processor.init_worker_processor()
+        transcript_processor.shutdown_worker_processor()
+        assert len(built) == 1
+        assert is_closed(processor.extractor.cache) and is_closed(processor.extractor.snapshots)
+        assert processor.producer.closed and processor.cleaner.closed
+        assert transcript_processor.get_processor() is not processor
+
+    def test_close_processor_leaves_inherited_processor(self, singleton):
+        """Test that a forked process does not close connections owned by its parent"""
+        pid, _ = singleton
+        parent = transcript_processor.get_processor()
+        pid[0] = 200
+        transcript_processor.close_processor()
+        assert not is_closed(parent.extractor.cache)
+        assert not parent.producer.closed
@@ -0,0 +1,98 @@
+# Software/DataHarvester/services/scraper_service/tests/application/services/transcript/test_transcript_service.py
+
+# pytest tests/application/services/transcript/test_transcript_service.py -v
+
+import asyncio
+import threading
+import time
+from application.services.transcript.transcript_service import TranscriptFetcher
+from infrastructure.cache.listing_snapshot import ListingSnapshotStore
+from infrastructure.error_handling.exceptions.base import BaseError
+
+class StubFetch:
+    """Thread-safe fetch_transcripts stub that records calls and the peak number in flight"""
+
+    def __init__(self, delays=None, failing=(), default_delay=0.02):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.default_delay = default_delay
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, video_id):
+        with self.lock:
+            self.calls.append(video_id)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delays.get(video_id, self.default_delay))
+            if video_id in self.failing:
+                raise RuntimeError(f"{video_id} unavailable")
+            return [{'text': video_id, 'start': 0.0, 'duration': 1.0}]
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+def make_fetcher(stub, max_concurrent=4):
+    fetcher = TranscriptFetcher.__new__(TranscriptFetcher)
+    fetcher.max_concurrent_requests = max_concurrent
+    fetcher.fetch_transcripts = stub
+    return fetcher
+
+def collect(fetcher, video_ids, **options):
+    async def run():
+        return [result async for result in fetcher.fetch_transcripts_concurrently(video_ids, **options)]
+    return asyncio.run(run())
+
+def test_in_flight_calls_are_bounded():
+    """Test that no more than max_concurrent fetches run at once"""
+    stub = StubFetch()
+    results = collect(make_fetcher(stub), [f"v{i}" for i in range(10)], max_concurrent=3)
+    assert len(results) == 10
+    assert stub.peak == 3
+
+def test_results_arrive_in_completion_order():
+    """Test that a fast video is yielded before a slow one requested earlier"""
+    stub = StubFetch(delays={"slow": 0.3, "fast": 0.0})
+    results = collect(make_fetcher(stub), ["slow", "fast"], max_concurrent=2)
+    assert [video_id for video_id, _, _ in results] == ["fast", "slow"]
+
+def test_per_video_error_is_returned():
+    """Test that a failing video comes back as the tuple's error after its retries"""
+    stub = StubFetch(failing={"bad"})
+    results = {video_id: (transcripts, error) for video_id, transcripts, error in collect(make_fetcher(stub), ["good", "bad"])}
+    assert results["good"][0] == [{'text': "good", 'start': 0.0, 'duration': 1.0}]
+    assert results["good"][1] is None
+    transcripts, error = results["bad"]
+    assert transcripts is None
+    assert isinstance(error, BaseError)
+    assert error.details['last_error'] == "bad unavailable"
+    assert stub.calls.count("bad") > 1
+
+def test_stopping_early_cancels_remaining_fetches():
+    """Test that closing the iterator after one result never starts the queued fetches"""
+    stub = StubFetch(default_delay=0.05)
+    fetcher = make_fetcher(stub, max_concurrent=1)
+
+    async def first():
+        results = fetcher.fetch_transcripts_concurrently([f"v{i}" for i in range(6)])
+        result = await results.__anext__()
+        await results.aclose()
+        return result
+
+    assert asyncio.run(first())[2] is None
+    time.sleep(0.2)
+    assert len(stub.calls) <= 2
+
+def test_listing_skips_malformed_urls(tmp_path):
+    """Test that an unparseable listed URL is skipped and the rest of the listing still returned with IDs"""
+    fetcher = TranscriptFetcher.__new__(TranscriptFetcher)
+    fetcher.snapshots = ListingSnapshotStore(tmp_path / "listings.sqlite3")
+    fetcher.stop_after_known = 20
+    urls = ["https://www.youtube.com/watch?v=v2", "https://example.com/not-a-video", "https://youtu.be/v1?t=3"]
+    videos, head = fetcher._expand_listing("https://www.youtube.com/@beach/videos", iter(urls), newest_first=True)
+    assert videos == [(urls[0], "v2"), (urls[2], "v1")]
+    assert head == "v2"
+    fetcher.snapshots.close()
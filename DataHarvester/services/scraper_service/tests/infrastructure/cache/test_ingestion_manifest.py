@@ -0,0 +1,60 @@
+# Software/DataHarvester/services/scraper_service/tests/infrastructure/cache/test_ingestion_manifest.py
+
+# pytest tests/infrastructure/cache/test_ingestion_manifest.py -v
+
+import os
+import pytest
+from infrastructure.cache.ingestion_manifest import IngestionManifest
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = IngestionManifest(path=tmp_path / "manifest.sqlite3")
+    yield manifest
+    manifest.close()
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "Subtitles"
+    for name in ("bike.srt", "hotel.srt", "taxi.srt"):
+        (root / "Bluey").mkdir(parents=True, exist_ok=True)
+        (root / "Bluey" / name).write_text(f"1\n00:00:00,000 --> 00:00:01,000\n{name}\n")
+    return root
+
+def files(root):
+    return sorted(root.rglob("*.srt"))
+
+class TestIngestionManifest:
+    def test_unrecorded_files_are_new(self, manifest, root):
+        """Test that every file is new before the first ingestion"""
+        changes = manifest.diff(root, files(root))
+        assert changes.new == ["Bluey/bike.srt", "Bluey/hotel.srt", "Bluey/taxi.srt"]
+        assert changes.pending == changes.new
+
+    def test_recorded_files_are_unchanged(self, manifest, root):
+        """Test that recorded files with the same stat are skipped"""
+        manifest.record(root, {path: [path.stem] for path in files(root)})
+        changes = manifest.diff(root, files(root))
+        assert changes.pending == []
+        assert len(changes.unchanged) == 3
+        assert manifest.document_ids(root, root / "Bluey" / "bike.srt") == ["bike"]
+
+    def test_content_changes_are_detected(self, manifest, root):
+        """Test that an edited file is changed while a touched one is not"""
+        manifest.record(root, {path: [path.stem] for path in files(root)})
+        (root / "Bluey" / "bike.srt").write_text("1\n00:00:00,000 --> 00:00:01,000\nedited\n")
+        stat = os.stat(root / "Bluey" / "hotel.srt")
+        os.utime(root / "Bluey" / "hotel.srt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        changes = manifest.diff(root, files(root))
+        assert changes.changed == ["Bluey/bike.srt"]
+        assert "Bluey/hotel.srt" in changes.unchanged
+
+    def test_missing_files_are_deleted(self, manifest, root):
+        """Test that recorded files no longer present are reported with their documents"""
+        manifest.record(root, {path: [path.stem] for path in files(root)})
+        (root / "Bluey" / "taxi.srt").unlink()
+
+        changes = manifest.diff(root, files(root))
+        assert changes.deleted == {"Bluey/taxi.srt": ["taxi"]}
+        manifest.forget(root, changes.deleted)
+        assert manifest.document_ids(root, "Bluey/taxi.srt") == []
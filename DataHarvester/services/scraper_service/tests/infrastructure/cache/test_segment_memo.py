@@ -0,0 +1,57 @@
+# Software/DataHarvester/services/scraper_service/tests/infrastructure/cache/test_segment_memo.py
+
+# pytest tests/infrastructure/cache/test_segment_memo.py -v
+
+from infrastructure.cache.segment_memo import SegmentMemo
+
+class FakeRedis:
+    """Just enough of the redis client for string get/set."""
+
+    def __init__(self):
+        self.values = {}
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def execute(self):
+        return []
+
+def test_key_depends_on_fingerprint_and_text():
+    """Test that a changed cleaning fingerprint never reuses old results"""
+    assert SegmentMemo.make_key("plan-a", "[music]") == SegmentMemo.make_key("plan-a", "[music]")
+    assert SegmentMemo.make_key("plan-a", "[music]") != SegmentMemo.make_key("plan-b", "[music]")
+
+def test_lru_evicts_least_recently_used():
+    memo = SegmentMemo(max_entries=2)
+    memo.put("a", "A")
+    memo.put("b", "B")
+    memo.get("a")
+    memo.put("c", "C")
+    assert memo.get_many(["a", "b", "c"]) == {"a": "A", "c": "C"}
+
+def test_shared_tier_serves_other_workers():
+    """Test that results written by one worker are hits for another"""
+    redis_client = FakeRedis()
+    SegmentMemo(redis_client=redis_client).put("k", "Music resume")
+
+    memo = SegmentMemo(redis_client=redis_client)
+    assert memo.get("k") == "Music resume"
+    assert memo.get("k") == "Music resume"
+    assert memo.stats()["shared_hits"] == 1
+    assert memo.stats()["local_hits"] == 1
+
+def test_hit_rate_and_redis_errors(mocker):
+    """Test hit-rate accounting, and that Redis failures are misses"""
+    redis_client = FakeRedis()
+    mocker.patch.object(redis_client, "mget", side_effect=Exception("Redis error"))
+    memo = SegmentMemo(redis_client=redis_client)
+    assert memo.get("missing") is None
+    memo.put("k", "v")
+    memo.get("k")
+    assert memo.hit_rate == 0.5
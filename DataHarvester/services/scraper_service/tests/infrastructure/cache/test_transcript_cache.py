@@ -0,0 +1,108 @@
+# Software/DataHarvester/services/scraper_service/tests/infrastructure/cache/test_transcript_cache.py
+
+# pytest tests/infrastructure/cache/test_transcript_cache.py -v
+
+import pytest
+from infrastructure.cache.transcript_cache import TranscriptCache
+
+SEGMENTS = [
+    {"text": "[music resumes]", "start": 0.0, "duration": 2.1},
+    {"text": "[all] Mum!", "start": 2.1, "duration": 1.4}
+]
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TranscriptCache(path=tmp_path / "transcripts.sqlite3")
+    yield cache
+    cache.close()
+
+class TestTranscriptCache:
+    def test_segments_round_trip(self, cache):
+        """Test that stored segments are returned unchanged"""
+        cache.put_segments("abc123", "en", False, SEGMENTS)
+        assert cache.get_segments("abc123", "en", False) == SEGMENTS
+
+    def test_key_includes_language_and_translation(self, cache):
+        """Test that language and auto-translate variants are cached separately"""
+        cache.put_segments("abc123", "en", False, SEGMENTS)
+        assert cache.get_segments("abc123", "en", True) is None
+        assert cache.get_segments("abc123", "de", False) is None
+
+    def test_expired_entries_are_misses(self, cache, mocker):
+        """Test that entries older than the TTL are dropped on read"""
+        clock = mocker.patch("infrastructure.cache.transcript_cache.time.time", return_value=1000.0)
+        cache.put_segments("abc123", "en", False, SEGMENTS)
+
+        clock.return_value = 1000.0 + cache.ttl_seconds + 1
+        assert cache.get_segments("abc123", "en", False) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction_keeps_recently_read(self, tmp_path, mocker):
+        """Test that the least recently read entry is evicted first once over budget"""
+        clock = mocker.patch("infrastructure.cache.transcript_cache.time.time", return_value=1.0)
+        cache = TranscriptCache(path=tmp_path / "lru.sqlite3")
+        cache.put_segments("first", "en", False, SEGMENTS)
+        clock.return_value = 2.0
+        cache.put_segments("second", "en", False, SEGMENTS)
+        clock.return_value = 3.0
+        cache.get_segments("first", "en", False)
+
+        cache.max_bytes = cache.stats()["bytes"]
+        clock.return_value = 4.0
+        cache.put_segments("third", "en", False, SEGMENTS)
+
+        assert cache.get_segments("second", "en", False) is None
+        assert cache.get_segments("first", "en", False) == SEGMENTS
+        assert cache.get_segments("third", "en", False) == SEGMENTS
+        cache.close()
+
+    def test_size_total_tracks_writes(self, cache, mocker):
+        """Test that the running size matches the table through inserts, replacements and deletes"""
+        def summed():
+            return cache._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+
+        clock = mocker.patch("infrastructure.cache.transcript_cache.time.time", return_value=1000.0)
+        cache.put_segments("abc123", "en", False, SEGMENTS)
+        cache.put_segments("abc123", "de", False, SEGMENTS)
+        assert cache.stats()["bytes"] == summed() > 0
+
+        cache.put_segments("abc123", "en", False, SEGMENTS * 20)
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["bytes"] == summed()
+
+        clock.return_value = 1000.0 + cache.ttl_seconds + 1
+        cache.get_segments("abc123", "en", False)
+        assert cache.stats()["bytes"] == summed()
+
+        cache.max_bytes = 0
+        cache.put_segments("xyz789", "en", False, SEGMENTS)
+        assert cache.stats() == {"entries": 0, "bytes": 0, "listings": 0}
+
+    def test_put_does_not_sum_the_table(self, cache):
+        """Test that storing an entry reads the running size instead of scanning every row"""
+        cache.put_segments("abc123", "en", False, SEGMENTS)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        cache.put_segments("xyz789", "en", False, SEGMENTS)
+        cache._conn.set_trace_callback(None)
+        assert not any("SUM(" in statement for statement in statements)
+
+    def test_size_total_initialised_for_existing_store(self, tmp_path):
+        """Test that a store created before the running size gets it computed once on open"""
+        path = tmp_path / "existing.sqlite3"
+        cache = TranscriptCache(path=path)
+        cache.put_segments("abc123", "en", False, SEGMENTS)
+        stored = cache.stats()["bytes"]
+        cache._conn.executescript("DROP TABLE transcripts_size;")
+        cache.close()
+
+        reopened = TranscriptCache(path=path)
+        assert reopened.stats()["bytes"] == stored
+        reopened.close()
+
+    def test_listing_cached_separately(self, cache):
+        """Test that the available-language listing has its own entry"""
+        listing = [{"language_code": "en", "is_generated": False, "is_translatable": True}]
+        cache.put_listing("abc123", listing)
+        assert cache.get_listing("abc123") == listing
+        assert cache.get_segments("abc123", "en", False) is None
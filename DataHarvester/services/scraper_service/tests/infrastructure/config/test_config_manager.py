@@ -0,0 +1,31 @@
+# Software/DataHarvester/services/scraper_service/tests/infrastructure/config/test_config_manager.py
+
+# pytest tests/infrastructure/config/test_config_manager.py -v
+
+import pytest
+import yaml
+from infrastructure.config.config_manager import ConfigManager
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    manager = ConfigManager()
+    monkeypatch.setattr(ConfigManager, "_config_dir", tmp_path)
+    monkeypatch.setitem(manager.configs, "cleaning", manager.get_config("cleaning"))
+    return manager
+
+def test_read_config_does_not_publish(manager, tmp_path):
+    """Test that a re-read config reaches get_config only through update_config"""
+    cached = manager.get_config("cleaning")
+    (tmp_path / "cleaning.yaml").write_text(yaml.safe_dump({"text_cleaning": {"spacy_model": "missing_model"}}))
+
+    config = manager.read_config("cleaning")
+    assert config["text_cleaning"]["spacy_model"] == "missing_model"
+    assert manager.get_config("cleaning") is cached
+
+    manager.update_config("cleaning", config)
+    assert manager.get_config("cleaning") is config
+
+def test_unknown_config_type(manager):
+    """Test that reading an unknown config type is an error"""
+    with pytest.raises(ValueError):
+        manager.read_config("unknown")
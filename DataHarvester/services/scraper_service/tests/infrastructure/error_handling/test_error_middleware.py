@@ -0,0 +1,160 @@
+# Software/DataHarvester/services/scraper_service/tests/infrastructure/error_handling/test_error_middleware.py
+
+# pytest tests/infrastructure/error_handling/test_error_middleware.py -v
+
+import asyncio
+import pytest
+from celery import Celery
+from infrastructure.error_handling.exceptions.base import BaseError
+from infrastructure.error_handling.middleware import error_middleware
+from infrastructure.error_handling.middleware.error_middleware import ErrorMiddleware, RETRY_STATE_HEADER
+
+@pytest.fixture
+def backoff(monkeypatch):
+    """Replace full-jitter backoff with its upper bound and record each (attempt, base, cap)"""
+    calls = []
+
+    def upper_bound(attempt, base, max_delay):
+        calls.append((attempt, base, max_delay))
+        return min(max_delay, base * 2 ** attempt)
+
+    monkeypatch.setattr(error_middleware, "full_jitter_backoff", upper_bound)
+    return calls
+
+class Flaky:
+    """Raises the given errors in turn, then returns 'ok'"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+class TestRetryAsync:
+    @pytest.fixture
+    def slept(self, monkeypatch):
+        slept = []
+
+        async def sleep(seconds):
+            slept.append(seconds)
+
+        monkeypatch.setattr(error_middleware.asyncio, "sleep", sleep)
+        return slept
+
+    def run(self, flaky, **options):
+        @ErrorMiddleware.retry_async(**options)
+        async def call():
+            return flaky()
+        return asyncio.run(call())
+
+    def test_backoff_grows_and_is_capped(self, backoff, slept):
+        """Test that waits double per attempt up to max_delay"""
+        flaky = Flaky(*[ValueError("x")] * 4)
+        assert self.run(flaky, retries=5, delay=1.0, max_delay=5) == "ok"
+        assert slept == [1.0, 2.0, 4.0, 5]
+        assert [attempt for attempt, _, _ in backoff] == [0, 1, 2, 3]
+
+    def test_full_jitter_stays_within_bounds(self, slept):
+        """Test that real jittered waits never exceed the exponential bound"""
+        flaky = Flaky(*[ValueError("x")] * 3)
+        self.run(flaky, retries=4, delay=1.0, max_delay=300)
+        assert all(0 <= wait <= 2 ** attempt for attempt, wait in enumerate(slept))
+
+    def test_gives_up_after_retries(self, backoff, slept):
+        """Test that the last failure is raised as a BaseError without sleeping again"""
+        flaky = Flaky(*[ValueError("x")] * 3)
+        with pytest.raises(BaseError):
+            self.run(flaky, retries=3, delay=1.0)
+        assert flaky.calls == 3
+        assert len(slept) == 2
+
+    def test_other_exceptions_are_not_retried(self, backoff, slept):
+        """Test that an exception outside `exceptions` propagates on the first attempt"""
+        flaky = Flaky(KeyError("x"))
+        with pytest.raises(KeyError):
+            self.run(flaky, retries=3, delay=1.0, exceptions=(ValueError,))
+        assert flaky.calls == 1
+        assert slept == []
+
+@pytest.fixture
+def app():
+    app = Celery("test_error_middleware", set_as_current=False)
+    app.conf.task_always_eager = True
+    return app
+
+def make_task(app, flaky, **options):
+    calls = []
+
+    @app.task(bind=True)
+    @ErrorMiddleware.celery_retry(**options)
+    def task(self):
+        calls.append((self.request.retries, ErrorMiddleware.get_retry_state(self.request)))
+        return flaky()
+
+    return task, calls
+
+class TestCeleryRetry:
+    def test_retries_through_task_retry(self, app, backoff, monkeypatch):
+        """Test that failures go through task.retry with a growing countdown and carried state"""
+        countdowns = []
+        retry = app.Task.retry
+
+        def record(self, *args, **options):
+            countdowns.append(options['countdown'])
+            return retry(self, *args, **options)
+
+        monkeypatch.setattr(app.Task, "retry", record)
+        flaky = Flaky(ValueError("first"), ValueError("second"))
+        task, calls = make_task(app, flaky, retries=3, delay=1.0)
+
+        assert task.apply().get() == "ok"
+        assert countdowns == [1.0, 2.0]
+        assert [retries for retries, _ in calls] == [0, 1, 2]
+        first_failure = calls[1][1]['first_failure']
+        assert calls[2][1] == {'first_failure': first_failure, 'last_error': "second"}
+
+    def test_gives_up_after_retries(self, app, backoff):
+        """Test that the last attempt raises a BaseError instead of retrying"""
+        flaky = Flaky(*[ValueError("x")] * 3)
+        task, calls = make_task(app, flaky, retries=3, delay=1.0)
+        with pytest.raises(BaseError):
+            task.apply().get()
+        assert flaky.calls == 3
+
+    def test_other_exceptions_are_not_retried(self, app, backoff):
+        """Test that an exception outside `exceptions` fails the task on the first attempt"""
+        flaky = Flaky(KeyError("x"))
+        task, calls = make_task(app, flaky, retries=3, delay=1.0, exceptions=(ValueError,))
+        with pytest.raises(KeyError):
+            task.apply().get()
+        assert flaky.calls == 1
+        assert backoff == []
+
+class TestScheduleCeleryRetry:
+    def test_hand_off_counts_as_first_retry(self, backoff):
+        """Test that a hand-off is sent as retry one with a first-attempt countdown and state"""
+        sent = []
+
+        class FakeTask:
+            name = "fake"
+
+            def apply_async(self, **options):
+                sent.append(options)
+
+        countdown = ErrorMiddleware.schedule_celery_retry(FakeTask(), ["url"], {'force_refresh': True}, ValueError("boom"), delay=2.0)
+        assert countdown == 2.0
+        options = sent[0]
+        assert (options['args'], options['kwargs'], options['retries']) == (["url"], {'force_refresh': True}, 1)
+        assert options['headers'][RETRY_STATE_HEADER]['last_error'] == "boom"
+
+    def test_hand_off_shares_the_retry_limit(self, app, backoff):
+        """Test that a task handed one failed attempt runs only the remaining attempts"""
+        flaky = Flaky(*[ValueError("x")] * 3)
+        task, calls = make_task(app, flaky, retries=3, delay=1.0)
+        with pytest.raises(BaseError):
+            task.apply(retries=1).get()
+        assert flaky.calls == 2
@@ -0,0 +1,79 @@
+# Software/DataHarvester/services/scraper_service/tests/infrastructure/monitoring/test_health_checker.py
+
+# pytest tests/infrastructure/monitoring/test_health_checker.py -v
+
+import time
+import nltk
+import pytest
+from domain.exceptions.domain_exceptions import ProcessingError
+from infrastructure.monitoring.health_checker import HealthChecker
+
+class FakeNltkData:
+    """nltk.data.find stand-in that counts lookups and misses the resources in `missing`"""
+
+    def __init__(self):
+        self.missing = set()
+        self.lookups = 0
+
+    def __call__(self, resource):
+        self.lookups += 1
+        if resource.rsplit("/", 1)[-1] in self.missing:
+            raise LookupError(resource)
+        return resource
+
+@pytest.fixture
+def nltk_data(monkeypatch):
+    find = FakeNltkData()
+    monkeypatch.setattr(nltk.data, "find", find)
+    monkeypatch.setattr(HealthChecker, "_nltk_state", None)
+    monkeypatch.setattr(HealthChecker, "_monitor_thread", None)
+    monkeypatch.setattr(HealthChecker, "_monitor_stop", None)
+    yield find
+    HealthChecker.stop_monitoring()
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_require_raises_when_data_is_missing(nltk_data):
+    """Test that missing NLTK data raises HLT001 naming what is missing"""
+    nltk_data.missing = {"stopwords"}
+    with pytest.raises(ProcessingError) as excinfo:
+        HealthChecker.require_nltk_data()
+    assert excinfo.value.error_code == "HLT001"
+    assert "stopwords" in excinfo.value.message
+
+def test_require_reads_the_cached_state(nltk_data):
+    """Test that only the first check touches NLTK, so a stale state holds until refreshed"""
+    HealthChecker.require_nltk_data()
+    lookups = nltk_data.lookups
+
+    nltk_data.missing = {"punkt"}
+    for _ in range(3):
+        HealthChecker.require_nltk_data()
+    assert nltk_data.lookups == lookups
+
+    assert HealthChecker.refresh_nltk_state() == (False, ["punkt"])
+    with pytest.raises(ProcessingError):
+        HealthChecker.require_nltk_data()
+
+def test_monitoring_refreshes_the_cache(nltk_data):
+    """Test that the monitor thread picks up data going missing and coming back"""
+    checker = HealthChecker()
+    checker.start_monitoring(interval=0.01)
+    assert HealthChecker.nltk_state() == (True, [])
+    thread = HealthChecker._monitor_thread
+    checker.start_monitoring(interval=0.01)
+    assert HealthChecker._monitor_thread is thread
+
+    nltk_data.missing = {"words"}
+    assert wait_for(lambda: HealthChecker.nltk_state() == (False, ["words"]))
+    nltk_data.missing = set()
+    assert wait_for(lambda: HealthChecker.nltk_state() == (True, []))
+
+    HealthChecker.stop_monitoring()
+    assert HealthChecker._monitor_thread is None and not thread.is_alive()
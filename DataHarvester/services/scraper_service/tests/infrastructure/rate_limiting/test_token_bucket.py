@@ -0,0 +1,79 @@
+# Software/DataHarvester/services/scraper_service/tests/infrastructure/rate_limiting/test_token_bucket.py
+
+# pytest tests/infrastructure/rate_limiting/test_token_bucket.py -v
+
+import asyncio
+import pytest
+from infrastructure.rate_limiting.token_bucket import TokenBucket, RateLimiter, create_rate_limiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestTokenBucket:
+    def test_burst_then_wait(self):
+        """Test that a full bucket admits a burst and then reports the refill wait"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+
+    def test_refill_is_capped_at_capacity(self):
+        """Test that idle time never accumulates more than capacity tokens"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+        bucket.try_acquire()
+        bucket.try_acquire()
+
+        clock.now = 100.0
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() == pytest.approx(1.0)
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+
+class TestRateLimiter:
+    def test_buckets_are_shared_per_host(self):
+        """Test that callers on the same host draw from one bucket"""
+        limiter = RateLimiter(rate=1.0, capacity=1)
+        assert limiter._bucket("host", "a", 1.0) is limiter._bucket("host", "a", 1.0)
+        assert limiter._bucket("host", "a", 1.0) is not limiter._bucket("host", "b", 1.0)
+
+    def test_endpoint_limit_applies_on_top_of_host(self):
+        """Test that endpoints with their own limit get a second bucket"""
+        limiter = RateLimiter(rate=100.0, capacity=1, endpoint_limits={"list_transcripts": 5.0})
+        assert len(list(limiter._buckets_for("www.youtube.com", "list_transcripts"))) == 2
+        assert len(list(limiter._buckets_for("www.youtube.com", "fetch"))) == 1
+
+    def test_acquire_waits_for_refill(self, mocker):
+        """Test that the blocking API sleeps for the reported wait"""
+        sleep = mocker.patch("infrastructure.rate_limiting.token_bucket.time.sleep")
+        limiter = RateLimiter(rate=1.0, capacity=1)
+        bucket = limiter._bucket("host", "www.youtube.com", 1.0)
+        mocker.patch.object(bucket, "try_acquire", side_effect=[0.25, 0.0])
+
+        assert limiter.acquire("www.youtube.com") == pytest.approx(0.25)
+        sleep.assert_called_once_with(0.25)
+
+    def test_acquire_async(self):
+        """Test that the asyncio API admits calls without blocking"""
+        limiter = RateLimiter(rate=1000.0, capacity=2)
+        waited = asyncio.run(limiter.acquire_async("www.youtube.com"))
+        assert waited == 0.0
+
+class TestCreateRateLimiter:
+    def test_default_rate_from_delay(self):
+        limiter = create_rate_limiter(0.5)
+        assert limiter.rate == pytest.approx(2.0)
+        assert limiter.redis_client is None
+
+    def test_redis_backend_without_client_falls_back(self):
+        limiter = create_rate_limiter(1.0, {"backend": "redis", "burst": 4})
+        assert limiter.redis_client is None
+        assert limiter.capacity == 4
@@ -0,0 +1,72 @@
+# Software/DataHarvester/services/scraper_service/tests/infrastructure/redis/test_dedup_index.py
+
+# pytest tests/infrastructure/redis/test_dedup_index.py -v
+
+import pytest
+from infrastructure.redis.dedup_index import ProcessedVideoIndex, bloom_parameters
+
+class FakeRedis:
+    """Just enough of the redis client for sets and bitmaps."""
+
+    def __init__(self):
+        self.sets = {}
+        self.bits = {}
+
+    def sismember(self, key, value):
+        return value in self.sets.get(key, set())
+
+    def sadd(self, key, value):
+        self.sets.setdefault(key, set()).add(value)
+
+    def getbit(self, key, offset):
+        return 1 if offset in self.bits.get(key, set()) else 0
+
+    def setbit(self, key, offset, value):
+        self.bits.setdefault(key, set()).add(offset)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.calls]
+
+@pytest.mark.parametrize("mode", ["set", "bloom"])
+def test_add_then_contains(mode):
+    """Test that recorded videos are reported as processed in both modes"""
+    index = ProcessedVideoIndex(FakeRedis(), mode=mode, capacity=1000, error_rate=0.01)
+    assert index.contains("4HLrtsGfusw") is False
+    index.add("4HLrtsGfusw")
+    assert index.contains("4HLrtsGfusw") is True
+    assert index.contains("dQw4w9WgXcQ") is False
+
+def test_bloom_parameters_scale_with_capacity():
+    """Test that 50M IDs at 0.1% fit comfortably in one Redis string"""
+    num_bits, num_hashes = bloom_parameters(50_000_000, 0.001)
+    assert num_bits < 2 ** 32
+    assert num_bits / 8 / 1024 ** 2 < 100
+    assert num_hashes == 10
+
+def test_bloom_false_positive_rate_is_bounded():
+    """Test the observed false-positive rate against the configured target"""
+    index = ProcessedVideoIndex(FakeRedis(), mode="bloom", capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        index.add(f"seen-{i}")
+    false_positives = sum(index.contains(f"unseen-{i}") for i in range(5000))
+    assert false_positives / 5000 < 0.03
+
+def test_lookup_errors_are_treated_as_unseen(mocker):
+    client = FakeRedis()
+    mocker.patch.object(client, "sismember", side_effect=Exception("Redis error"))
+    assert ProcessedVideoIndex(client).contains("4HLrtsGfusw") is False
+
+def test_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        ProcessedVideoIndex(FakeRedis(), mode="cuckoo")
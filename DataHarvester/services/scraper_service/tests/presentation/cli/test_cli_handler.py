@@ -0,0 +1,54 @@
+# Software/DataHarvester/services/scraper_service/tests/presentation/cli/test_cli_handler.py
+
+# pytest tests/presentation/cli/test_cli_handler.py -v
+
+from presentation.cli.cli_handler import process_listing_delta
+
+LISTING = "https://www.youtube.com/@beach/videos"
+
+class FakeExtractor:
+    def __init__(self):
+        self.commits = []
+
+    def extract_video_id(self, url):
+        raise AssertionError("listing deltas already carry their video IDs")
+
+    def commit_listing(self, listing_url, video_ids, head_video_id=None, failed_video_ids=()):
+        self.commits.append((listing_url, video_ids, head_video_id, list(failed_video_ids)))
+
+class FakeProcessor:
+    """Succeeds for every video except those in `failing`"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.extractor = FakeExtractor()
+        self.requested = []
+
+    async def process_videos_concurrently(self, video_urls):
+        self.requested.append(video_urls)
+        return [
+            {'success': False, 'video_url': url, 'error': "fetch failed"} if url in self.failing
+            else {'success': True, 'video_id': url.rsplit("/", 1)[-1]}
+            for url in video_urls
+        ]
+
+def videos(*video_ids):
+    return [(f"https://youtu.be/{video_id}", video_id) for video_id in video_ids]
+
+def test_commit_advances_head_when_all_succeed():
+    """Test that a fully processed delta commits its IDs and the listing head"""
+    processor = FakeProcessor()
+    process_listing_delta(processor, LISTING, videos("v3", "v2", "v3"), "v3")
+    assert processor.requested == [[url for url, _ in videos("v3", "v2", "v3")]]
+    assert processor.extractor.commits == [(LISTING, ["v2", "v3"], "v3", [])]
+
+def test_failures_stay_pending():
+    """Test that failed videos are committed as pending, identified from the delta, and hold the head back"""
+    processor = FakeProcessor(failing={"https://youtu.be/v2"})
+    process_listing_delta(processor, LISTING, videos("v3", "v2"), "v3")
+    assert processor.extractor.commits == [(LISTING, ["v3"], None, ["v2"])]
+
+def test_empty_delta_commits_nothing():
+    processor = FakeProcessor()
+    process_listing_delta(processor, LISTING, [], "v3")
+    assert processor.requested == [] and processor.extractor.commits == []